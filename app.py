@@ -7,6 +7,8 @@ import json
 from flask import Flask, render_template, request, jsonify, redirect, url_for, flash, session
 from langchain_ollama import ChatOllama
 from literature_review import LiteratureReviewOrchestrator
+from literature_review.cache import SearchCache
+from literature_review.text_store import TextStore
 
 # Create Flask app
 app = Flask(__name__)
@@ -28,8 +30,22 @@ llm = ChatOllama(
     timeout=300  # 5 minute timeout for longer operations
 )
 
+# Reusing a similar topic's results is opt-in; by default only exact topics hit the cache
+search_cache_similarity = os.environ.get("SEARCH_CACHE_SIMILARITY", "").strip().lower()
+
+# Search results are cached on disk and shared by all workers
+search_cache = SearchCache(
+    path=os.environ.get("SEARCH_CACHE_PATH", ".cache/search.sqlite3"),
+    ttl_seconds=float(os.environ.get("SEARCH_CACHE_TTL", 24 * 3600)),
+    similarity_threshold=None if search_cache_similarity in ("", "off") else float(search_cache_similarity),
+)
+
+# Full texts are kept compressed on disk next to the saved papers
+text_store = TextStore(os.environ.get("TEXT_STORE_PATH", os.path.join(app.config["OUTPUT_DIR"], "texts")))
+
 # Create orchestrator with the local Ollama LLM
-orchestrator = LiteratureReviewOrchestrator(llm)
+orchestrator = LiteratureReviewOrchestrator(llm, search_cache=search_cache, text_store=text_store,
+                                            filter_batch_size=int(os.environ.get("FILTER_BATCH_SIZE", 1)))
 app.config["DEMO_MODE"] = False
 
 print(f"✅ Using local Ollama at {ollama_url} with model: {model_name}")
@@ -81,6 +97,7 @@ def review():
         max_papers = int(request.form.get('max_papers', 15))
         max_full_text_papers = int(request.form.get('max_full_text_papers', 10))
         relevance_threshold = float(request.form.get('relevance_threshold', 0.7))
+        max_concurrency = int(request.form.get('max_concurrency', 3))
         
         try:
             # Run literature review
@@ -90,7 +107,8 @@ def review():
                 max_full_text_papers=max_full_text_papers,
                 relevance_threshold=relevance_threshold,
                 save_results=True,
-                output_dir=app.config["OUTPUT_DIR"]
+                output_dir=app.config["OUTPUT_DIR"],
+                max_concurrency=max_concurrency
             ))
             
             # Store results in session
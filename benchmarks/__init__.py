@@ -0,0 +1,6 @@
+"""
+Benchmarks for the literature review pipeline.
+
+Each module can be run directly, e.g. ``python -m benchmarks.bench_concurrent_retrieval``.
+Benchmarks use fake agents with artificial latency so they run without Ollama.
+"""
@@ -0,0 +1,99 @@
+"""
+Benchmark for extracting browser agent answers instead of whole step traces.
+
+Compares the size of the text handed to parsing and downstream prompts when an
+AgentHistoryList is converted with ``str(history)`` against
+``extract_agent_result``. Synthetic histories imitate a search run: several
+steps that extract page content, followed by a done step with the answer
+(or, for an agent that ran out of steps, a navigation step).
+Recorded histories saved with ``AgentHistoryList.save_to_file`` can be
+measured instead.
+
+Usage:
+    python -m benchmarks.bench_agent_result_extraction [--steps N] [--histories DIR]
+"""
+
+import argparse
+import json
+import os
+import time
+
+from browser_use.agent.views import ActionResult, AgentBrain, AgentHistory, AgentHistoryList, AgentOutput
+from browser_use.browser.views import BrowserStateHistory
+
+from literature_review.utils_browser import extract_agent_result
+
+def make_history(steps: int, page_chars: int = 4000, papers: int = 15, done: bool = True) -> AgentHistoryList:
+    history = []
+    for step in range(steps):
+        brain = AgentBrain(
+            evaluation_previous_goal="Success - the results page loaded",
+            memory=f"Visited {step + 1} result pages so far. " * 5,
+            next_goal="Extract paper metadata from the next page",
+        )
+        page = f"Result page {step}: " + "Title, authors, abstract and venue of a listed paper. " * (page_chars // 55)
+        history.append(AgentHistory(
+            model_output=AgentOutput(current_state=brain, action=[]),
+            result=[ActionResult(extracted_content=page, include_in_memory=True)],
+            state=BrowserStateHistory(url=f"https://scholar.example.com/?page={step}", title="Search results",
+                                      tabs=[], interacted_element=[None]),
+        ))
+    
+    if not done:
+        # Out of steps: the last action only reports where the agent went
+        history.append(AgentHistory(
+            model_output=None,
+            result=[ActionResult(extracted_content="🔗  Navigated to https://scholar.example.com/?page=next",
+                                 include_in_memory=True)],
+            state=BrowserStateHistory(url="https://scholar.example.com/", title="Search results",
+                                      tabs=[], interacted_element=[None]),
+        ))
+        return AgentHistoryList(history=history)
+    
+    answer = json.dumps([
+        {"title": f"Paper {i}", "authors": ["Doe, J."], "abstract": "An abstract.",
+         "year": 2023, "venue": "Example Conference", "url": f"https://example.com/{i}"}
+        for i in range(papers)
+    ], indent=2)
+    history.append(AgentHistory(
+        model_output=None,
+        result=[ActionResult(is_done=True, extracted_content=f"```json\n{answer}\n```")],
+        state=BrowserStateHistory(url="https://scholar.example.com/", title="Search results",
+                                  tabs=[], interacted_element=[None]),
+    ))
+    return AgentHistoryList(history=history)
+
+def load_histories(directory: str):
+    for name in sorted(os.listdir(directory)):
+        if name.endswith(".json"):
+            yield name, AgentHistoryList.load_from_file(os.path.join(directory, name), AgentOutput)
+
+def measure(name: str, history: AgentHistoryList):
+    start = time.perf_counter()
+    before = len(str(history))
+    str_elapsed = (time.perf_counter() - start) * 1000
+    start = time.perf_counter()
+    result = extract_agent_result(history)
+    elapsed = (time.perf_counter() - start) * 1000
+    after = len(result.text)
+    print(f"{name:>24} {before:>12,} {result.trace_chars:>12,} {after:>10,} {before / max(1, after):>9.1f}x "
+          f"{result.source:>18} {str_elapsed:>8.2f} {elapsed:>8.2f}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--steps", type=int, default=15, help="steps per synthetic history")
+    parser.add_argument("--histories", help="directory of recorded AgentHistoryList JSON files")
+    args = parser.parse_args()
+    
+    print(f"{'history':>24} {'str() chars':>12} {'trace est.':>12} {'extracted':>10} {'reduction':>10} "
+          f"{'source':>18} {'str() ms':>8} {'ms':>8}")
+    if args.histories:
+        for name, history in load_histories(args.histories):
+            measure(name, history)
+    else:
+        for steps in sorted({1, args.steps // 3, args.steps}):
+            measure(f"synthetic {steps} steps", make_history(steps))
+        measure(f"unfinished {args.steps} steps", make_history(args.steps, done=False))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""
+Benchmark for the shared browser pool used by the browser_use agents.
+
+Runs a batch of simulated agent tasks a few at a time, once launching a fresh
+browser per task (what each Agent does on its own) and once checking browsers
+out of a BrowserPool. Browsers are stand-ins with a fixed launch delay, a
+per-task memory growth and an optional crash rate, so the run needs no
+browser or Ollama. Total time, browser launches and peak simulated browser
+memory are reported.
+
+Usage:
+    python -m benchmarks.bench_browser_pool [--tasks N] [--concurrency N] [--launch-latency SECONDS]
+"""
+
+import argparse
+import asyncio
+import random
+import time
+
+from literature_review.browser_pool import BrowserPool, browser_session
+
+class Memory:
+    """Tracks simulated memory held by live browsers"""
+    def __init__(self):
+        self.current = 0.0
+        self.peak = 0.0
+    
+    def add(self, megabytes):
+        self.current += megabytes
+        self.peak = max(self.peak, self.current)
+
+class StandInPlaywrightBrowser:
+    def __init__(self):
+        self.connected = True
+    
+    def is_connected(self):
+        return self.connected
+
+class StandInContext:
+    async def close(self):
+        pass
+
+class StandInBrowser:
+    """Browser with browser_use's interface: launched lazily, grows with every task"""
+    def __init__(self, memory, launch_latency, base_mb=150.0):
+        self.memory = memory
+        self.launch_latency = launch_latency
+        self.base_mb = base_mb
+        self.playwright_browser = None
+        self.size_mb = 0.0
+    
+    async def get_playwright_browser(self):
+        if self.playwright_browser is None:
+            await asyncio.sleep(self.launch_latency)
+            self.playwright_browser = StandInPlaywrightBrowser()
+            self.size_mb = self.base_mb
+            self.memory.add(self.size_mb)
+        return self.playwright_browser
+    
+    async def new_context(self):
+        await self.get_playwright_browser()
+        return StandInContext()
+    
+    async def close(self):
+        if self.playwright_browser is not None:
+            self.memory.add(-self.size_mb)
+            self.playwright_browser = None
+            self.size_mb = 0.0
+
+async def run_task(browser, task_seconds, growth_mb, crash_rate, rng):
+    """Simulate one agent task on a browser"""
+    await asyncio.sleep(task_seconds)
+    browser.size_mb += growth_mb
+    browser.memory.add(growth_mb)
+    if rng.random() < crash_rate:
+        browser.playwright_browser.connected = False
+
+async def run_unpooled(args, memory, rng):
+    launches = 0
+    semaphore = asyncio.Semaphore(args.concurrency)
+    
+    async def task():
+        nonlocal launches
+        async with semaphore:
+            browser = StandInBrowser(memory, args.launch_latency)
+            launches += 1
+            try:
+                await browser.new_context()
+                await run_task(browser, args.task_seconds, args.growth_mb, args.crash_rate, rng)
+            finally:
+                await browser.close()
+    
+    await asyncio.gather(*(task() for _ in range(args.tasks)))
+    return {"launched": launches}
+
+async def run_pooled(args, memory, rng):
+    pool = BrowserPool(size=args.concurrency, max_uses=args.max_uses,
+                       browser_factory=lambda: StandInBrowser(memory, args.launch_latency))
+    
+    async def task():
+        async with browser_session(pool) as browser_kwargs:
+            await run_task(browser_kwargs["browser"], args.task_seconds, args.growth_mb, args.crash_rate, rng)
+    
+    try:
+        await asyncio.gather(*(task() for _ in range(args.tasks)))
+    finally:
+        await pool.close()
+    return pool.stats
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, default=40, help="Number of agent tasks")
+    parser.add_argument("--concurrency", type=int, default=3, help="Tasks run at once, and pool size")
+    parser.add_argument("--launch-latency", type=float, default=0.8, help="Seconds to launch a browser")
+    parser.add_argument("--task-seconds", type=float, default=0.2, help="Seconds per simulated agent task")
+    parser.add_argument("--growth-mb", type=float, default=25.0, help="Browser memory growth per task")
+    parser.add_argument("--max-uses", type=int, default=10, help="Tasks after which a pooled browser is replaced")
+    parser.add_argument("--crash-rate", type=float, default=0.02, help="Probability a task disconnects its browser")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    
+    print(f"{args.tasks} tasks, {args.concurrency} at a time, {args.launch_latency}s browser launch")
+    print(f"{'mode':<10} {'seconds':>8} {'launched':>9} {'peak MB':>8}  details")
+    for mode, runner in (("unpooled", run_unpooled), ("pooled", run_pooled)):
+        memory = Memory()
+        start = time.perf_counter()
+        stats = asyncio.run(runner(args, memory, random.Random(args.seed)))
+        elapsed = time.perf_counter() - start
+        details = ", ".join(f"{key} {value}" for key, value in stats.items() if key != "launched")
+        print(f"{mode:<10} {elapsed:>8.2f} {stats['launched']:>9} {memory.peak:>8.0f}  {details}")
+        assert memory.current == 0, "browsers left open"
+
+if __name__ == "__main__":
+    main()
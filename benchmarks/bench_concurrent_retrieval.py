@@ -0,0 +1,67 @@
+"""
+Benchmark for concurrent full-text retrieval in LiteratureReviewOrchestrator.
+
+Uses a fake content agent that sleeps for a random latency per paper, so the
+speedup of ``retrieve_contents`` can be measured against the concurrency limit
+without a browser or Ollama.
+
+Usage:
+    python -m benchmarks.bench_concurrent_retrieval [--papers N] [--latency SECONDS]
+"""
+
+import argparse
+import asyncio
+import random
+import time
+
+from literature_review.models import Paper
+from literature_review.review_orchestrator import LiteratureReviewOrchestrator
+
+class FakeContentAgent:
+    """Content agent stand-in that simulates retrieval latency"""
+    def __init__(self, latency: float, jitter: float = 0.5, failure_rate: float = 0.1, seed: int = 0):
+        self.latency = latency
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self.rng = random.Random(seed)
+    
+    async def retrieve_content(self, paper: Paper) -> Paper:
+        delay = self.latency * (1 + self.rng.uniform(-self.jitter, self.jitter))
+        fails = self.rng.random() < self.failure_rate
+        await asyncio.sleep(delay)
+        if fails:
+            raise RuntimeError("simulated retrieval failure")
+        paper.full_text = f"Full text of {paper.title}"
+        return paper
+
+def make_papers(count: int):
+    return [Paper(title=f"Paper {i}", authors=["Doe, J."], abstract="", url=f"https://example.com/{i}")
+            for i in range(count)]
+
+async def run_once(count: int, latency: float, max_concurrency: int) -> float:
+    orchestrator = LiteratureReviewOrchestrator(llm=None)
+    orchestrator.content_agent = FakeContentAgent(latency)
+    papers = make_papers(count)
+    
+    start = time.perf_counter()
+    results = await orchestrator.retrieve_contents(papers, max_concurrency)
+    elapsed = time.perf_counter() - start
+    
+    assert [p.title for p in results] == [p.title for p in papers], "input order not preserved"
+    return elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--papers", type=int, default=10)
+    parser.add_argument("--latency", type=float, default=0.5, help="mean seconds per retrieval")
+    args = parser.parse_args()
+    
+    print(f"{'concurrency':>12} {'seconds':>10} {'speedup':>10}")
+    baseline = None
+    for max_concurrency in (1, 2, 3, 5, 10):
+        elapsed = asyncio.run(run_once(args.papers, args.latency, max_concurrency))
+        baseline = baseline or elapsed
+        print(f"{max_concurrency:>12} {elapsed:>10.2f} {baseline / elapsed:>9.2f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Benchmark for the HTTP/PDF fast path of ContentRetrievalAgent.
+
+Serves the stand-in paper pages of tests/stand_in.py from a local HTTP
+server: full-text HTML articles, arXiv-style abstract pages that link a PDF,
+pages too short to use, and missing pages. The browser agent fallback is
+replaced by a fixed delay, so the run needs no browser or Ollama. Retrieval with the fast path is compared
+against sending every paper to the (simulated) browser agent, and per-path
+hit rates and latencies are reported. PDF text is only extracted when the
+optional pypdf package is installed; otherwise those papers fall back.
+
+Usage:
+    python -m benchmarks.bench_content_fast_path [--papers N] [--browser-latency SECONDS]
+"""
+
+import argparse
+import asyncio
+import time
+
+from literature_review.content_agent import ContentRetrievalAgent
+from literature_review.host_scheduler import HostScheduler
+from literature_review.models import Paper
+from literature_review.review_orchestrator import LiteratureReviewOrchestrator
+from tests.stand_in import serve
+
+class SimulatedBrowserAgent(ContentRetrievalAgent):
+    """Content agent whose browser fallback is a fixed delay"""
+    def __init__(self, browser_latency: float, fast_path: bool = True):
+        # Every stand-in page is on one local host, so per-host limits are lifted
+        super().__init__(llm=None, fast_path=fast_path,
+                         scheduler=HostScheduler(max_per_host=1000, rate_per_host=None))
+        self.browser_latency = browser_latency
+    
+    async def _retrieve_with_browser(self, paper: Paper) -> Paper:
+        start = time.perf_counter()
+        await asyncio.sleep(self.browser_latency)
+        paper.full_text = f"Browser-extracted text of {paper.title}"
+        self._record("browser", True, start)
+        return paper
+
+def make_papers(base_url: str, count: int):
+    kinds = ["article", "abs", "short", "missing"]
+    return [Paper(title=f"Paper {i}", authors=[], abstract="", url=f"{base_url}/{kinds[i % len(kinds)]}/{i}")
+            for i in range(count)]
+
+async def run_once(base_url: str, count: int, browser_latency: float, fast_path: bool, concurrency: int):
+    orchestrator = LiteratureReviewOrchestrator(llm=None)
+    agent = SimulatedBrowserAgent(browser_latency, fast_path=fast_path)
+    orchestrator.content_agent = agent
+    start = time.perf_counter()
+    await orchestrator.retrieve_contents(make_papers(base_url, count), concurrency)
+    elapsed = time.perf_counter() - start
+    await agent.fetcher.aclose()
+    return elapsed, agent.path_stats()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--papers", type=int, default=20)
+    parser.add_argument("--browser-latency", type=float, default=2.0, help="simulated seconds per browser agent run")
+    parser.add_argument("--concurrency", type=int, default=4)
+    args = parser.parse_args()
+    
+    with serve() as base_url:
+        for fast_path in (False, True):
+            elapsed, stats = asyncio.run(run_once(base_url, args.papers, args.browser_latency,
+                                                  fast_path, args.concurrency))
+            print(f"fast path {'on ' if fast_path else 'off'}: {elapsed:6.2f}s for {args.papers} papers")
+            for path, path_stats in stats.items():
+                if path_stats["attempts"]:
+                    print(f"  {path:>8}: {path_stats['hits']:>3}/{path_stats['attempts']:<3} hits "
+                          f"({path_stats['hit_rate']:.0%}), {path_stats['mean_seconds'] * 1000:8.1f} ms average")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""
+Benchmark for per-host politeness scheduling of content retrieval.
+
+Half of the papers come from one busy host that answers 429 and blocks all
+requests for a while when it gets more than a few concurrent requests or too
+many requests per second, like arXiv or ResearchGate do. The rest are spread
+over several well-behaved hosts. Sites are simulated in process and the
+browser agent fallback loads the page and then takes a fixed time, so the run
+needs no network, browser or Ollama. Retrieval without limits (a 429 falls back
+to the browser agent, which is blocked as well) is compared against the
+default HostScheduler.
+
+Usage:
+    python -m benchmarks.bench_host_scheduler [--papers N] [--concurrency N] [--browser-latency SECONDS]
+"""
+
+import argparse
+import asyncio
+import time
+from collections import deque
+
+import httpx
+
+from literature_review.content_agent import ContentRetrievalAgent
+from literature_review.host_scheduler import HostScheduler, host_of
+from literature_review.models import Paper
+from literature_review.review_orchestrator import LiteratureReviewOrchestrator
+
+PAGE = ("<html><body><article>" + "<p>We study retrieval-augmented language models and evaluate them "
+        "on question answering benchmarks.</p>" * 20 + "</article></body></html>").encode("utf-8")
+
+class SimulatedHost:
+    """A site that blocks clients exceeding its concurrency or request rate"""
+    def __init__(self, latency, max_concurrent=None, max_per_second=None, block_seconds=3.0):
+        self.latency = latency
+        self.max_concurrent = max_concurrent
+        self.max_per_second = max_per_second
+        self.block_seconds = block_seconds
+        self.active = 0
+        self.recent = deque()
+        self.blocked_until = 0.0
+        self.throttled = 0
+    
+    async def get(self, url):
+        now = time.monotonic()
+        while self.recent and now - self.recent[0] > 1.0:
+            self.recent.popleft()
+        self.recent.append(now)
+        if ((self.max_concurrent and self.active >= self.max_concurrent)
+                or (self.max_per_second and len(self.recent) > self.max_per_second)):
+            self.blocked_until = max(self.blocked_until, now + self.block_seconds)
+        if now < self.blocked_until:
+            self.throttled += 1
+            request = httpx.Request("GET", url)
+            raise httpx.HTTPStatusError("Too Many Requests", request=request,
+                                        response=httpx.Response(429, request=request))
+        self.active += 1
+        try:
+            await asyncio.sleep(self.latency)
+        finally:
+            self.active -= 1
+        return "text/html; charset=utf-8", PAGE
+
+class SimulatedFetcher:
+    """Stands in for HTTPFetcher, routing requests to simulated hosts"""
+    def __init__(self, hosts):
+        self.hosts = hosts
+    
+    async def fetch(self, url):
+        return await self.hosts[host_of(url)].get(url)
+    
+    async def aclose(self):
+        pass
+
+class SimulatedBrowserAgent(ContentRetrievalAgent):
+    """Content agent whose browser fallback loads the page once more and then takes a fixed time"""
+    def __init__(self, browser_latency, hosts, **kwargs):
+        super().__init__(llm=None, fetcher=SimulatedFetcher(hosts), **kwargs)
+        self.browser_latency = browser_latency
+        self.hosts = hosts
+    
+    async def _retrieve_with_browser(self, paper):
+        start = time.perf_counter()
+        try:
+            await self.scheduler.call(paper.url, lambda: self.hosts[host_of(paper.url)].get(paper.url))
+        except httpx.HTTPStatusError:
+            # A blocked browser only sees the error page
+            self._record("browser", False, start)
+            return paper
+        await asyncio.sleep(self.browser_latency)
+        paper.full_text = "Text read by the browser agent."
+        self._record("browser", True, start)
+        return paper
+
+def make_hosts():
+    hosts = {"busy.example": SimulatedHost(0.3, max_concurrent=2, max_per_second=4)}
+    hosts.update({f"site{i}.example": SimulatedHost(0.3) for i in range(6)})
+    return hosts
+
+def make_papers(count):
+    papers = []
+    for i in range(count):
+        host = "busy.example" if i % 2 == 0 else f"site{i % 6}.example"
+        papers.append(Paper(title=f"Paper {i}", authors=[], abstract="", url=f"https://{host}/paper/{i}"))
+    return papers
+
+async def run_once(args, scheduler):
+    hosts = make_hosts()
+    orchestrator = LiteratureReviewOrchestrator(llm=None)
+    agent = SimulatedBrowserAgent(args.browser_latency, hosts, scheduler=scheduler)
+    orchestrator.content_agent = agent
+    start = time.perf_counter()
+    papers = await orchestrator.retrieve_contents(make_papers(args.papers), args.concurrency)
+    elapsed = time.perf_counter() - start
+    throttled = sum(host.throttled for host in hosts.values())
+    retrieved = sum(1 for paper in papers if paper.full_text)
+    return elapsed, agent.path_stats(), throttled, retrieved
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--papers", type=int, default=40)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--browser-latency", type=float, default=3.0, help="simulated seconds per browser agent run")
+    args = parser.parse_args()
+    
+    modes = {
+        "no limits": HostScheduler(max_per_host=args.concurrency, rate_per_host=None, max_retries=0),
+        "scheduled": HostScheduler(),
+    }
+    for mode, scheduler in modes.items():
+        elapsed, stats, throttled, retrieved = asyncio.run(run_once(args, scheduler))
+        retries = sum(host["retries"] for host in scheduler.stats.values())
+        print(f"{mode:>9}: {elapsed:6.2f}s, text for {retrieved}/{args.papers} papers, "
+              f"{throttled} requests throttled, {retries} retried, "
+              f"{stats['browser']['attempts']} browser fallbacks")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Benchmark for extracting paper JSON from long agent transcripts.
+
+Compares the previous regex-based ``SearchAgent._extract_paper_data`` with the
+single-pass scanner on synthetic transcripts of increasing size. Each
+transcript is mostly step noise (page text, brackets and quotes) with a JSON
+list of papers at the end, one of which is malformed. In the truncated
+variant the answer is cut off, leaving no closing bracket for the regex to
+find, which makes its backtracking quadratic in the transcript size.
+
+Usage:
+    python -m benchmarks.bench_json_extraction [--sizes 10000,100000,...] [--skip-legacy-above BYTES]
+"""
+
+import argparse
+import json
+import random
+import re
+import time
+
+from literature_review.search_agent import SearchAgent
+
+def legacy_extract(text: str):
+    """The regex extraction used before the single-pass scanner"""
+    json_match = re.search(r'```(?:json)?\s*([\s\S]*?)\s*```', text)
+    if json_match:
+        try:
+            papers_data = json.loads(json_match.group(1))
+            if isinstance(papers_data, list):
+                return papers_data
+        except json.JSONDecodeError:
+            pass
+    
+    papers_data_match = re.search(r'\[\s*\{[\s\S]*\}\s*\]', text)
+    if papers_data_match:
+        try:
+            papers_data = json.loads(papers_data_match.group(0))
+            if isinstance(papers_data, list):
+                return papers_data
+        except json.JSONDecodeError:
+            pass
+    return []
+
+def make_transcript(size: int, papers: int = 15, truncated: bool = False, seed: int = 0) -> str:
+    rng = random.Random(seed)
+    records = [json.dumps({"title": f"Paper {i}", "authors": ["Doe, J."], "abstract": "An abstract.",
+                           "year": 2023, "venue": "Example", "url": f"https://example.com/{i}"})
+               for i in range(papers)]
+    # One malformed record, as produced by a truncated or sloppy answer
+    records[papers // 2] = '{"title": "Broken", "authors": ["x"] "url": "missing comma"}'
+    answer = "```json\n[\n" + ",\n".join(records) + "\n]\n```"
+    if truncated:
+        # The agent ran out of steps part-way through its answer
+        answer = answer[:len(answer) * 2 // 3]
+    
+    fragments = [
+        "Step: clicked element [12] on the results page. ",
+        'Extracted: {"action": "scroll", "amount": 3} ',
+        "Page text: Deep learning [1], [2] and {related} work. ",
+        'Memory: "visited 3 pages" ',
+        'Interactive elements: [{"index": 4, "tag": "a"} ',
+    ]
+    noise = []
+    length = 0
+    while length < size - len(answer):
+        fragment = rng.choice(fragments)
+        noise.append(fragment)
+        length += len(fragment)
+    return "".join(noise) + answer
+
+def timed(function, text: str):
+    start = time.perf_counter()
+    result = function(text)
+    return time.perf_counter() - start, len(result)
+
+def run_size(agent: SearchAgent, size: int, truncated: bool, skip_legacy_above: int):
+    text = make_transcript(size, truncated=truncated)
+    if size <= skip_legacy_above:
+        legacy_seconds, legacy_papers = timed(legacy_extract, text)
+        legacy = f"{legacy_seconds:>10.3f} {legacy_papers:>7}"
+    else:
+        legacy = f"{'skipped':>10} {'-':>7}"
+    seconds, found = timed(agent._extract_paper_data, text)
+    answer = "truncated" if truncated else "complete"
+    print(f"{answer:>10} {len(text):>12,} {legacy} {seconds:>10.3f} {found:>7} {len(text) / seconds / 1e6:>8.1f}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", default="10000,100000,1000000,10000000",
+                        help="comma-separated transcript sizes in bytes")
+    parser.add_argument("--skip-legacy-above", type=int, default=100_000,
+                        help="skip the regex extraction for larger transcripts")
+    args = parser.parse_args()
+    
+    agent = SearchAgent(llm=None)
+    print(f"{'answer':>10} {'bytes':>12} {'legacy s':>10} {'papers':>7} {'scanner s':>10} {'papers':>7} {'MB/s':>8}")
+    for truncated in (False, True):
+        for size in (int(value) for value in args.sizes.split(",")):
+            run_size(agent, size, truncated, args.skip_legacy_above)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+Benchmark comparing the browser_use Agent and direct LLM backends.
+
+Scores and summarizes the papers from mock_data.MOCK_PAPERS with FilterAgent
+and SummaryAgent once per backend. Unlike the other benchmarks this one needs
+a running Ollama server (and a browser for the browser backend), since the
+overhead being measured lives in the agent loop around the model.
+
+Usage:
+    python -m benchmarks.bench_llm_backends [--backends direct browser]
+"""
+
+import argparse
+import asyncio
+import os
+import time
+
+from langchain_ollama import ChatOllama
+
+from literature_review.filter_agent import FilterAgent
+from literature_review.summary_agent import SummaryAgent
+from literature_review.mock_data import get_mock_papers
+
+TOPIC = "artificial intelligence ethics"
+
+async def run_backend(llm, backend: str):
+    papers = await get_mock_papers(TOPIC)
+    filter_agent = FilterAgent(llm, backend=backend)
+    summary_agent = SummaryAgent(llm, backend=backend)
+    
+    start = time.perf_counter()
+    for paper in papers:
+        await filter_agent.score_paper(paper, TOPIC)
+    filter_seconds = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    for paper in papers:
+        await summary_agent.summarize_paper(paper)
+    summary_seconds = time.perf_counter() - start
+    
+    return len(papers), filter_seconds, summary_seconds
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--backends", nargs="+", default=["direct", "browser"])
+    args = parser.parse_args()
+    
+    llm = ChatOllama(
+        model=os.environ.get("LLM_MODEL", "llama2"),
+        base_url=os.environ.get("OLLAMA_URL", "http://localhost:11434"),
+    )
+    
+    print(f"{'backend':>10} {'filter s/paper':>16} {'summary s/paper':>16}")
+    for backend in args.backends:
+        count, filter_seconds, summary_seconds = asyncio.run(run_backend(llm, backend))
+        print(f"{backend:>10} {filter_seconds / count:>16.2f} {summary_seconds / count:>16.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Benchmark for the offline local corpus search index.
+
+Generates a synthetic JSONL corpus with a Zipf-distributed vocabulary, builds
+a LocalCorpusIndex from it, and measures query latency for short topic
+queries. No network, browser or Ollama is needed.
+
+Usage:
+    python -m benchmarks.bench_local_index [--records N] [--queries N] [--index-dir DIR]
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from literature_review.local_index import LocalCorpusIndex, LocalCorpusSource
+
+def write_corpus(path: Path, records: int, vocabulary: int = 50_000, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    words = [f"term{i}" for i in range(vocabulary)]
+    with open(path, "w", encoding="utf-8") as f:
+        for i in range(records):
+            title = " ".join(words[j % vocabulary] for j in rng.zipf(1.3, size=8))
+            abstract = " ".join(words[j % vocabulary] for j in rng.zipf(1.3, size=120))
+            f.write(json.dumps({"id": f"{i:07d}", "title": title, "abstract": abstract,
+                                "authors": "Doe, J. and Roe, R.", "update_date": "2023-05-01"}) + "\n")
+    return words
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--records", type=int, default=200_000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--segment-size", type=int, default=100_000)
+    parser.add_argument("--index-dir", help="reuse or keep the index in this directory")
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        index_dir = args.index_dir or str(Path(tmp) / "index")
+        index = LocalCorpusIndex(index_dir, segment_size=args.segment_size, create=True)
+        
+        if index.num_docs < args.records:
+            corpus = Path(tmp) / "corpus.jsonl"
+            start = time.perf_counter()
+            write_corpus(corpus, args.records - index.num_docs)
+            print(f"generated {args.records - index.num_docs:,} records in {time.perf_counter() - start:.1f}s")
+            
+            start = time.perf_counter()
+            added = index.add_jsonl(str(corpus))
+            elapsed = time.perf_counter() - start
+            print(f"indexed in {elapsed:.1f}s ({added / elapsed:,.0f} records/s)")
+        print(f"index: {index.num_docs:,} documents in {len(index.segments)} segments")
+        
+        # Reopen to measure cold start (memory mapping the segments)
+        index.close()
+        start = time.perf_counter()
+        index = LocalCorpusIndex(index_dir)
+        print(f"opened in {(time.perf_counter() - start) * 1000:.0f} ms")
+        
+        rng = random.Random(1)
+        latencies = []
+        for _ in range(args.queries):
+            query = " ".join(f"term{rng.randint(1, 2000)}" for _ in range(rng.randint(2, 5)))
+            start = time.perf_counter()
+            index.search(query, 15)
+            latencies.append((time.perf_counter() - start) * 1000)
+        latencies.sort()
+        print(f"query latency: p50 {latencies[len(latencies) // 2]:.1f} ms, "
+              f"p95 {latencies[int(len(latencies) * 0.95)]:.1f} ms, max {latencies[-1]:.1f} ms")
+        
+        papers = asyncio.run(LocalCorpusSource(index).search("term3 term17", 5))
+        print(f"source returned {len(papers)} papers, top: {papers[0].title[:60] if papers else '-'}")
+        index.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""
+Benchmark for the memory use and serialization speed of Paper objects.
+
+Generates synthetic records shaped like mock_data.MOCK_PAPERS (authors,
+venues and keywords drawn from shared pools, unique titles and abstracts),
+loads them from JSON as a papers file or cache would, and compares the
+slotted, interning Paper with the previous plain dataclass: memory retained
+by the objects (tracemalloc), construction time, and to_dict/from_dict
+round trips. No network, browser or Ollama is needed.
+
+Usage:
+    python -m benchmarks.bench_paper_model [--papers N]
+"""
+
+import argparse
+import gc
+import json
+import random
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from literature_review.mock_data import MOCK_PAPERS
+from literature_review.models import Paper
+
+@dataclass
+class DataclassPaper:
+    """The Paper model before it was slotted, for comparison"""
+    title: str
+    authors: List[str]
+    abstract: str
+    url: str
+    year: Optional[int] = None
+    venue: Optional[str] = None
+    citations: Optional[int] = None
+    keywords: List[str] = field(default_factory=list)
+    full_text: Optional[str] = None
+    relevance_score: float = 0.0
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "title": self.title,
+            "authors": self.authors,
+            "abstract": self.abstract,
+            "url": self.url,
+            "year": self.year,
+            "venue": self.venue,
+            "citations": self.citations,
+            "keywords": self.keywords,
+            "full_text": self.full_text,
+            "relevance_score": self.relevance_score
+        }
+
+def make_records(count: int, seed: int = 0) -> str:
+    """JSON list of synthetic paper records in the shape of MOCK_PAPERS"""
+    rng = random.Random(seed)
+    surnames = [f"Author{i}" for i in range(5000)]
+    venues = [paper["venue"] for paper in MOCK_PAPERS] + [f"Proceedings of Workshop {i}" for i in range(300)]
+    keywords = sorted({kw for paper in MOCK_PAPERS for kw in paper["keywords"]}) + [f"topic {i}" for i in range(500)]
+    words = " ".join(paper["abstract"] for paper in MOCK_PAPERS).split()
+    records = []
+    for i in range(count):
+        template = MOCK_PAPERS[i % len(MOCK_PAPERS)]
+        records.append({
+            "title": f"{template['title']} ({i})",
+            "authors": [f"{rng.choice(surnames)}, {rng.choice('ABCDEFGHJKLMNPRST')}."
+                        for _ in range(rng.randint(1, 6))],
+            "abstract": " ".join(rng.choices(words, k=45)),
+            "url": f"https://doi.org/10.{1000 + i % 9000}/paper.{i}" if i % 3 == 0 else f"https://example.com/paper/{i}",
+            "year": rng.randint(2000, 2025),
+            "venue": rng.choice(venues),
+            "citations": rng.randint(0, 2000),
+            "keywords": rng.sample(keywords, rng.randint(2, 5)),
+            "relevance_score": round(rng.random(), 3),
+        })
+    return json.dumps(records)
+
+def measure_load(records_json: str, build):
+    """Time building objects from freshly parsed records, and memory they retain afterwards"""
+    records = json.loads(records_json)
+    start = time.perf_counter()
+    papers = [build(record) for record in records]
+    elapsed = time.perf_counter() - start
+    del records, papers
+    
+    # Measured separately, as tracing allocations would distort the timing
+    gc.collect()
+    tracemalloc.start()
+    records = json.loads(records_json)
+    papers = [build(record) for record in records]
+    del records
+    gc.collect()
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return papers, elapsed, retained
+
+def timed(function):
+    start = time.perf_counter()
+    result = function()
+    return result, time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--papers", type=int, default=100_000)
+    args = parser.parse_args()
+    
+    records_json = make_records(args.papers)
+    print(f"{args.papers} papers, {len(records_json) / 2**20:.1f} MB of JSON")
+    print(f"{'model':<10} {'memory MB':>10} {'build s':>8} {'to_dict s':>10} {'dumps s':>8} {'load s':>8}")
+    
+    legacy, legacy_build, legacy_memory = measure_load(records_json, lambda record: DataclassPaper(**record))
+    dicts, legacy_to_dict = timed(lambda: [paper.to_dict() for paper in legacy])
+    text, legacy_dumps = timed(lambda: json.dumps(dicts))
+    _, legacy_load = timed(lambda: [DataclassPaper(**record) for record in json.loads(text)])
+    print(f"{'dataclass':<10} {legacy_memory / 2**20:>10.1f} {legacy_build:>8.2f} {legacy_to_dict:>10.2f} "
+          f"{legacy_dumps:>8.2f} {legacy_load:>8.2f}")
+    del legacy, dicts, text
+    
+    papers, build, memory = measure_load(records_json, Paper.from_dict)
+    dicts, to_dict = timed(lambda: [paper.to_dict(include_full_text=False) for paper in papers])
+    text, dumps = timed(lambda: json.dumps(dicts))
+    loaded, load = timed(lambda: [Paper.from_dict(record) for record in json.loads(text)])
+    print(f"{'slotted':<10} {memory / 2**20:>10.1f} {build:>8.2f} {to_dict:>10.2f} {dumps:>8.2f} {load:>8.2f}")
+    
+    assert all(a.paper_id == b.paper_id for a, b in zip(papers, loaded)), "paper IDs changed in a round trip"
+    _, keyword_build = timed(lambda: [Paper(**record) for record in json.loads(records_json)])
+    print(f"Paper(**record) for comparison: {keyword_build:.2f}s including JSON parsing; "
+          f"{len({paper.paper_id for paper in papers})} distinct paper IDs")
+
+if __name__ == "__main__":
+    main()
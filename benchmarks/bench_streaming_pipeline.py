@@ -0,0 +1,126 @@
+"""
+Benchmark for the streaming retrieve/filter/summarize pipeline.
+
+Compares the old barrier pipeline (all retrieval, then all filtering, then all
+summaries) against LiteratureReviewOrchestrator.process_papers, using fake
+agents with random per-paper latencies. The critical path is the slowest
+single paper through all three stages plus the final synthesis.
+
+Usage:
+    python -m benchmarks.bench_streaming_pipeline [--papers N] [--concurrency N]
+"""
+
+import argparse
+import asyncio
+import random
+import time
+from typing import Dict, List
+
+from literature_review.models import Paper
+from literature_review.review_orchestrator import LiteratureReviewOrchestrator
+
+class Latencies:
+    """Per-paper stage latencies drawn once so both pipelines see the same work"""
+    def __init__(self, count: int, scale: float, seed: int = 0):
+        rng = random.Random(seed)
+        # Retrieval is the slow, highly variable stage
+        self.retrieve = [scale * rng.uniform(0.5, 3.0) for _ in range(count)]
+        self.filter = [scale * rng.uniform(0.1, 0.3) for _ in range(count)]
+        self.summary = [scale * rng.uniform(0.3, 0.8) for _ in range(count)]
+        self.scores = [rng.uniform(0.4, 1.0) for _ in range(count)]
+        self.synthesis = scale * 1.0
+
+class FakeContentAgent:
+    def __init__(self, latencies: Latencies):
+        self.latencies = latencies
+    
+    async def retrieve_content(self, paper: Paper) -> Paper:
+        await asyncio.sleep(self.latencies.retrieve[int(paper.url)])
+        paper.full_text = f"Full text of {paper.title}"
+        return paper
+
+class FakeFilterAgent:
+    batch_size = 1
+    
+    def __init__(self, latencies: Latencies):
+        self.latencies = latencies
+    
+    async def score_papers(self, papers: List[Paper], topic: str) -> List[float]:
+        return [await self.score_paper(p, topic) for p in papers]
+    
+    async def score_paper(self, paper: Paper, topic: str) -> float:
+        i = int(paper.url)
+        await asyncio.sleep(self.latencies.filter[i])
+        paper.relevance_score = self.latencies.scores[i]
+        return paper.relevance_score
+    
+    async def filter_papers(self, papers: List[Paper], topic: str, relevance_threshold: float = 0.7) -> List[Paper]:
+        kept = [p for p in papers if await self.score_paper(p, topic) >= relevance_threshold]
+        return sorted(kept, key=lambda p: p.relevance_score, reverse=True)
+
+class FakeSummaryAgent:
+    def __init__(self, latencies: Latencies):
+        self.latencies = latencies
+    
+    async def summarize_paper(self, paper: Paper) -> Dict:
+        await asyncio.sleep(self.latencies.summary[int(paper.url)])
+        return {"title": paper.title, "summary": "..."}
+    
+    async def write_review(self, paper_summaries: List[Dict], topic: str) -> str:
+        await asyncio.sleep(self.latencies.synthesis)
+        return "review"
+    
+    async def generate_literature_review(self, papers: List[Paper], topic: str) -> str:
+        summaries = [await self.summarize_paper(p) for p in papers]
+        return await self.write_review(summaries, topic)
+
+def make_orchestrator(latencies: Latencies) -> LiteratureReviewOrchestrator:
+    orchestrator = LiteratureReviewOrchestrator(llm=None)
+    orchestrator.content_agent = FakeContentAgent(latencies)
+    orchestrator.filter_agent = FakeFilterAgent(latencies)
+    orchestrator.summary_agent = FakeSummaryAgent(latencies)
+    return orchestrator
+
+def make_papers(count: int) -> List[Paper]:
+    return [Paper(title=f"Paper {i}", authors=[], abstract="", url=str(i)) for i in range(count)]
+
+async def run_barrier(latencies: Latencies, count: int, concurrency: int, threshold: float) -> float:
+    orchestrator = make_orchestrator(latencies)
+    start = time.perf_counter()
+    papers = await orchestrator.retrieve_contents(make_papers(count), concurrency)
+    filtered = await orchestrator.filter_agent.filter_papers(papers, "topic", threshold)
+    await orchestrator.summary_agent.generate_literature_review(filtered, "topic")
+    return time.perf_counter() - start
+
+async def run_streaming(latencies: Latencies, count: int, concurrency: int, threshold: float) -> float:
+    orchestrator = make_orchestrator(latencies)
+    start = time.perf_counter()
+    _, summaries = await orchestrator.process_papers(make_papers(count), "topic", threshold, concurrency)
+    await orchestrator.summary_agent.write_review(summaries, "topic")
+    return time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--papers", type=int, default=15)
+    parser.add_argument("--concurrency", type=int, default=15)
+    parser.add_argument("--scale", type=float, default=0.2, help="seconds per latency unit")
+    parser.add_argument("--threshold", type=float, default=0.7)
+    args = parser.parse_args()
+    
+    latencies = Latencies(args.papers, args.scale)
+    critical_path = max(
+        latencies.retrieve[i] + latencies.filter[i]
+        + (latencies.summary[i] if latencies.scores[i] >= args.threshold else 0.0)
+        for i in range(args.papers)
+    ) + latencies.synthesis
+    
+    barrier = asyncio.run(run_barrier(latencies, args.papers, args.concurrency, args.threshold))
+    streaming = asyncio.run(run_streaming(latencies, args.papers, args.concurrency, args.threshold))
+    
+    print(f"papers={args.papers} concurrency={args.concurrency}")
+    print(f"  critical path: {critical_path:6.2f}s")
+    print(f"  barrier:       {barrier:6.2f}s")
+    print(f"  streaming:     {streaming:6.2f}s ({barrier / streaming:.2f}x faster)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Benchmark for keeping paper full texts in a compressed TextStore.
+
+Simulates the pipeline's use of full texts: every paper's text is retrieved
+first, then each is read once for a relevance excerpt and once for its
+summary, and the papers are saved with save_review_data. Texts are synthetic
+(Zipf-distributed words, some papers sharing the same text as preprint and
+journal versions do). Peak Python memory (tracemalloc), time and the size of
+the saved papers JSON are compared with texts held in memory. No network,
+browser or Ollama is needed.
+
+Usage:
+    python -m benchmarks.bench_text_store [--papers N] [--text-kb KB] [--duplicates FRACTION]
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+
+from literature_review import extractive
+from literature_review.extractive import build_excerpt
+from literature_review.models import Paper
+from literature_review.text_store import TextStore
+from literature_review.utils import save_review_data
+
+def make_texts(papers, text_kb, duplicates, seed=0):
+    rng = random.Random(seed)
+    words = [f"term{i}" for i in range(20_000)]
+    weights = [1 / (rank + 1) for rank in range(len(words))]
+    texts = []
+    for i in range(papers):
+        if texts and rng.random() < duplicates:
+            texts.append(rng.choice(texts))
+            continue
+        paragraphs = []
+        size = 0
+        while size < text_kb * 1024:
+            paragraph = " ".join(rng.choices(words, weights, k=120)) + "."
+            paragraphs.append(paragraph)
+            size += len(paragraph) + 2
+        texts.append("Introduction\n" + "\n\n".join(paragraphs))
+    return texts
+
+def run(texts, text_store, output_dir):
+    papers = [Paper(title=f"Paper {i}", authors=["Doe, J."], abstract="An abstract.", url=f"https://example.com/{i}")
+              for i in range(len(texts))]
+    extractive._excerpt_cache.clear()
+    tracemalloc.start()
+    start = time.perf_counter()
+    # Retrieval: every paper gets its text (a fresh string, as from a download)
+    for paper, text in zip(papers, texts):
+        paper.full_text = text.encode("utf-8").decode("utf-8")
+        if text_store is not None:
+            paper.store_full_text(text_store)
+    # Filtering and summarizing each read the text again
+    for _ in range(2):
+        for paper in papers:
+            build_excerpt(paper.full_text, 2000)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    saved = save_review_data(papers, "Review", "benchmark", output_dir)
+    return elapsed, peak, os.path.getsize(saved["papers_file"])
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--papers", type=int, default=200)
+    parser.add_argument("--text-kb", type=int, default=120, help="approximate size of each full text")
+    parser.add_argument("--duplicates", type=float, default=0.2, help="fraction of papers repeating an earlier text")
+    args = parser.parse_args()
+    
+    texts = make_texts(args.papers, args.text_kb, args.duplicates)
+    print(f"{args.papers} papers, {sum(map(len, texts)) / 2**20:.1f} MB of full text")
+    with tempfile.TemporaryDirectory() as tmp:
+        for mode in ("in memory", "text store"):
+            text_store = TextStore(os.path.join(tmp, "texts")) if mode == "text store" else None
+            elapsed, peak, json_size = run(texts, text_store, os.path.join(tmp, mode.replace(" ", "_")))
+            print(f"{mode:>10}: {elapsed:6.2f}s, peak {peak / 2**20:7.1f} MB, papers JSON {json_size / 1024:8.1f} KB")
+            if text_store is not None:
+                stats = text_store.stats
+                print(f"            stored {stats['stored']} texts ({stats['deduplicated']} duplicates), "
+                      f"{stats['raw_bytes'] / 2**20:.1f} MB compressed to {stats['stored_bytes'] / 2**20:.1f} MB")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,222 @@
+"""
+Pool of warm browser_use browsers shared by the agents of a review.
+"""
+
+import asyncio
+import contextlib
+import time
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
+
+from browser_use import Browser, BrowserConfig
+
+class PooledBrowser:
+    """A browser owned by a BrowserPool, with its usage counters"""
+    def __init__(self, browser: Browser, generation: int):
+        self.browser = browser
+        self.generation = generation
+        self.uses = 0
+        self.last_used = time.monotonic()
+
+class BrowserPool:
+    """
+    Pool of browser_use browsers that agents check out and return.
+    
+    Launching a browser is the expensive part of starting a browser agent,
+    so at most ``size`` browsers are kept running and reused; each task still
+    gets a fresh browser context, so cookies and tabs do not leak between
+    tasks. A browser is checked for a live connection when it is checked out
+    and returned, replaced after ``max_uses`` tasks to bound memory growth,
+    and closed after ``idle_timeout`` seconds without use. Idle browsers are
+    closed by a background task that runs while any are waiting, so they do
+    not keep their memory until the next checkout.
+    
+    Like any Playwright object, the pool is bound to the event loop it is
+    used on; call ``close()`` before that loop ends.
+    """
+    def __init__(self,
+                 size: int = 3,
+                 idle_timeout: float = 300.0,
+                 max_uses: int = 20,
+                 browser_config: Optional[BrowserConfig] = None,
+                 browser_factory: Optional[Callable[[], Browser]] = None):
+        """
+        Initialize the pool.
+        
+        Args:
+            size: Maximum number of browsers, and so of concurrent browser tasks
+            idle_timeout: Seconds after which an unused browser is closed
+            max_uses: Number of tasks after which a browser is replaced
+            browser_config: Configuration for new browsers
+            browser_factory: Callable creating a new browser, instead of Browser(browser_config)
+        """
+        self.size = max(1, size)
+        self.idle_timeout = idle_timeout
+        self.max_uses = max(1, max_uses)
+        self.browser_factory = browser_factory or (lambda: Browser(config=browser_config))
+        self.stats = {"launched": 0, "reused": 0, "recycled": 0, "unhealthy": 0, "idle_closed": 0}
+        self._idle: List[PooledBrowser] = []
+        self._in_use = 0
+        self._generation = 0
+        self._condition: Optional[asyncio.Condition] = None
+        self._reaper: Optional[asyncio.Task] = None
+    
+    def _get_condition(self) -> asyncio.Condition:
+        if self._condition is None:
+            self._condition = asyncio.Condition()
+        return self._condition
+    
+    @staticmethod
+    def is_healthy(entry: PooledBrowser) -> bool:
+        """Whether a browser is still usable (not yet launched, or still connected)"""
+        playwright_browser = getattr(entry.browser, "playwright_browser", None)
+        return playwright_browser is None or playwright_browser.is_connected()
+    
+    async def start(self, count: Optional[int] = None):
+        """
+        Launch browsers ahead of time so the first tasks do not wait for them.
+        
+        Args:
+            count: Number of browsers to launch (default: the pool size)
+        """
+        entries = [await self.acquire() for _ in range(min(count or self.size, self.size))]
+        await asyncio.gather(*(entry.browser.get_playwright_browser() for entry in entries))
+        for entry in entries:
+            await self.release(entry, used=False)
+    
+    async def acquire(self) -> PooledBrowser:
+        """
+        Check out a browser, waiting while all ``size`` browsers are in use.
+        
+        Returns:
+            A healthy pooled browser; return it with ``release``
+        """
+        condition = self._get_condition()
+        async with condition:
+            await condition.wait_for(lambda: self._in_use < self.size)
+            self._in_use += 1
+        
+        try:
+            await self._close_expired()
+            while self._idle:
+                entry = self._idle.pop()
+                if self.is_healthy(entry):
+                    self.stats["reused"] += 1
+                    return entry
+                self.stats["unhealthy"] += 1
+                await self._close_entry(entry)
+            
+            self.stats["launched"] += 1
+            return PooledBrowser(self.browser_factory(), self._generation)
+        except BaseException:
+            await self._free_slot()
+            raise
+    
+    async def release(self, entry: PooledBrowser, used: bool = True):
+        """
+        Return a checked-out browser to the pool.
+        
+        Args:
+            entry: Browser returned by ``acquire``
+            used: Whether a task ran on it (counted towards ``max_uses``)
+        """
+        try:
+            entry.uses += int(used)
+            entry.last_used = time.monotonic()
+            if entry.generation != self._generation:
+                await self._close_entry(entry)
+            elif entry.uses >= self.max_uses:
+                self.stats["recycled"] += 1
+                await self._close_entry(entry)
+            elif not self.is_healthy(entry):
+                self.stats["unhealthy"] += 1
+                await self._close_entry(entry)
+            else:
+                self._idle.append(entry)
+                self._start_reaper()
+        finally:
+            await self._free_slot()
+    
+    @contextlib.asynccontextmanager
+    async def session(self) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Check out a browser with a fresh context for one agent task.
+        
+        Yields:
+            Keyword arguments for browser_use's Agent (``browser`` and ``browser_context``)
+        """
+        entry = await self.acquire()
+        try:
+            context = await entry.browser.new_context()
+            try:
+                yield {"browser": entry.browser, "browser_context": context}
+            finally:
+                await context.close()
+        finally:
+            await self.release(entry)
+    
+    async def close(self):
+        """Close the idle browsers; browsers in use are closed when they are returned"""
+        self._generation += 1
+        if self._reaper is not None:
+            self._reaper.cancel()
+            self._reaper = None
+        idle, self._idle = self._idle, []
+        for entry in idle:
+            await self._close_entry(entry)
+    
+    async def _free_slot(self):
+        condition = self._get_condition()
+        async with condition:
+            self._in_use -= 1
+            condition.notify()
+    
+    async def _close_expired(self):
+        """Close browsers that have been idle for longer than idle_timeout"""
+        now = time.monotonic()
+        expired = [entry for entry in self._idle if now - entry.last_used > self.idle_timeout]
+        if not expired:
+            return
+        self._idle = [entry for entry in self._idle if entry not in expired]
+        self.stats["idle_closed"] += len(expired)
+        for entry in expired:
+            await self._close_entry(entry)
+    
+    def _start_reaper(self):
+        """Start the task closing expired idle browsers, unless it is already running"""
+        if self._reaper is None or self._reaper.done():
+            self._reaper = asyncio.get_running_loop().create_task(self._reap_idle())
+    
+    async def _reap_idle(self):
+        """Close idle browsers as they expire, until none are left idle"""
+        while self._idle:
+            oldest = min(entry.last_used for entry in self._idle)
+            await asyncio.sleep(max(oldest + self.idle_timeout - time.monotonic(), 0.0) + 0.01)
+            await self._close_expired()
+        self._reaper = None
+    
+    @staticmethod
+    async def _close_entry(entry: PooledBrowser):
+        try:
+            await entry.browser.close()
+        except Exception as e:
+            print(f"  ⚠️ Failed to close pooled browser: {e}")
+
+@contextlib.asynccontextmanager
+async def browser_session(pool: Optional[BrowserPool]) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Browser keyword arguments for a browser_use Agent, from a pool if one is given.
+    
+    Without a pool this yields no arguments, so the Agent launches and closes
+    its own browser as before.
+    
+    Args:
+        pool: Optional browser pool
+    
+    Yields:
+        Keyword arguments to pass to Agent
+    """
+    if pool is None:
+        yield {}
+        return
+    async with pool.session() as browser_kwargs:
+        yield browser_kwargs
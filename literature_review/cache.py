@@ -0,0 +1,304 @@
+"""
+Persistent caches backed by SQLite with an in-memory LRU in front.
+"""
+
+import copy
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from literature_review.models import Paper
+from literature_review.lexical import tokenize
+
+class SQLiteCache:
+    """
+    Key-value cache with an in-memory LRU in front of an on-disk SQLite table.
+    
+    Values are stored as JSON. Entries expire after ``ttl_seconds`` and the
+    least recently used entries are evicted once the table holds more than
+    ``max_entries`` or its values take more than ``max_bytes``. The database
+    runs in WAL mode so several processes (for example gunicorn workers) can
+    share one cache file.
+    """
+    def __init__(self, 
+                 path: str, 
+                 ttl_seconds: Optional[float] = None, 
+                 max_entries: int = 100_000,
+                 memory_entries: int = 1024,
+                 max_bytes: Optional[int] = None):
+        """
+        Initialize the cache.
+        
+        Args:
+            path: Path of the SQLite database file
+            ttl_seconds: Time after which entries expire (None keeps them forever)
+            max_entries: Maximum number of entries kept on disk
+            memory_entries: Maximum number of entries kept in the in-memory LRU
+            max_bytes: Maximum total size of the stored values (None for no limit)
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.memory_entries = memory_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._memory: "OrderedDict[str, Tuple[Any, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        
+        self._conn = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS cache (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL,
+                size INTEGER NOT NULL DEFAULT 0
+            )
+        """)
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(cache)")}
+        if "size" not in columns:
+            self._conn.execute("ALTER TABLE cache ADD COLUMN size INTEGER NOT NULL DEFAULT 0")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS cache_accessed_at ON cache (accessed_at)")
+        self._conn.commit()
+    
+    def _expired(self, created_at: float, now: float) -> bool:
+        return self.ttl_seconds is not None and now - created_at > self.ttl_seconds
+    
+    def _remember(self, key: str, value: Any, created_at: float):
+        self._memory[key] = (value, created_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+    
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value for a key, or None if it is missing or expired"""
+        now = time.time()
+        with self._lock:
+            if key in self._memory:
+                value, created_at = self._memory[key]
+                if not self._expired(created_at, now):
+                    self._memory.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._memory[key]
+            
+            row = self._conn.execute(
+                "SELECT value, created_at FROM cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or self._expired(row[1], now):
+                self.misses += 1
+                return None
+            
+            self._conn.execute("UPDATE cache SET accessed_at = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            value = json.loads(row[0])
+            self._remember(key, value, row[1])
+            self.hits += 1
+            return value
+    
+    def set(self, key: str, value: Any):
+        """Store a JSON-serializable value under a key"""
+        now = time.time()
+        data = json.dumps(value)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value, created_at, accessed_at, size) VALUES (?, ?, ?, ?, ?)",
+                (key, data, now, now, len(data.encode("utf-8"))),
+            )
+            self._evict(now)
+            self._conn.commit()
+            self._remember(key, value, now)
+    
+    def _evict(self, now: float):
+        """Drop expired entries and trim the table to max_entries and max_bytes"""
+        if self.ttl_seconds is not None:
+            self._conn.execute("DELETE FROM cache WHERE created_at < ?", (now - self.ttl_seconds,))
+        
+        count = self._conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+        if count > self.max_entries:
+            self._conn.execute(
+                "DELETE FROM cache WHERE key IN "
+                "(SELECT key FROM cache ORDER BY accessed_at LIMIT ?)",
+                (count - self.max_entries,),
+            )
+        
+        if self.max_bytes is not None:
+            excess = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM cache").fetchone()[0] - self.max_bytes
+            if excess > 0:
+                evicted = []
+                for key, size in self._conn.execute("SELECT key, size FROM cache ORDER BY accessed_at"):
+                    if excess <= 0:
+                        break
+                    evicted.append((key,))
+                    excess -= size
+                self._conn.executemany("DELETE FROM cache WHERE key = ?", evicted)
+                for (key,) in evicted:
+                    self._memory.pop(key, None)
+    
+    def keys(self) -> List[str]:
+        """Keys of every unexpired entry on disk"""
+        now = time.time()
+        oldest = now - self.ttl_seconds if self.ttl_seconds is not None else 0
+        with self._lock:
+            return [row[0] for row in self._conn.execute(
+                "SELECT key FROM cache WHERE created_at >= ?", (oldest,)
+            )]
+    
+    def stats(self) -> Dict[str, Any]:
+        """Hit and miss counters for this process"""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+    
+    def clear(self):
+        """Remove every entry"""
+        with self._lock:
+            self._memory.clear()
+            self._conn.execute("DELETE FROM cache")
+            self._conn.commit()
+    
+    def close(self):
+        """Close the database connection"""
+        self._conn.close()
+
+def normalize_topic(topic: str) -> str:
+    """Lowercase a topic and reduce it to space-separated alphanumeric words"""
+    return " ".join(re.findall(r"[a-z0-9]+", topic.lower()))
+
+class RelevanceCache(SQLiteCache):
+    """Cache of relevance scores keyed by (normalized topic, paper ID, model name, prompt version)"""
+    def __init__(self, 
+                 path: str = ".cache/relevance.sqlite3", 
+                 ttl_seconds: Optional[float] = 30 * 24 * 3600,
+                 max_entries: int = 100_000,
+                 memory_entries: int = 1024):
+        super().__init__(path, ttl_seconds, max_entries, memory_entries)
+    
+    @staticmethod
+    def relevance_key(topic: str, paper: Paper, model_name: str, prompt_version: str = "") -> str:
+        return json.dumps([normalize_topic(topic), paper.paper_id, model_name, prompt_version])
+    
+    def get_relevance(self, 
+                      topic: str, 
+                      paper: Paper, 
+                      model_name: str, 
+                      prompt_version: str = "") -> Optional[Dict[str, Any]]:
+        """Return the cached {"score", "rationale"} entry for a paper, or None"""
+        return self.get(self.relevance_key(topic, paper, model_name, prompt_version))
+    
+    def set_relevance(self, 
+                      topic: str, 
+                      paper: Paper, 
+                      model_name: str, 
+                      score: float, 
+                      rationale: str = "", 
+                      prompt_version: str = ""):
+        """Store a paper's relevance score and rationale"""
+        self.set(self.relevance_key(topic, paper, model_name, prompt_version),
+                 {"score": score, "rationale": rationale})
+
+class SearchCache(SQLiteCache):
+    """
+    Cache of search results keyed by (normalized topic, max_papers, sources).
+    
+    ``sources`` is a fingerprint of the search configuration (see
+    ``SearchAgent.source_fingerprint``), so results found with other
+    databases, backends or models are not reused. With
+    ``similarity_threshold`` set, a topic without an exact entry can reuse
+    the results of a cached topic whose stemmed terms have at least that
+    Jaccard similarity, e.g. "evaluating LLM safety" for "LLM safety
+    evaluation". Only entries searched with the same sources and for at
+    least as many papers are reused.
+    """
+    def __init__(self, 
+                 path: str = ".cache/search.sqlite3", 
+                 ttl_seconds: Optional[float] = 24 * 3600,
+                 similarity_threshold: Optional[float] = None,
+                 max_entries: int = 10_000,
+                 memory_entries: int = 64):
+        super().__init__(path, ttl_seconds, max_entries, memory_entries)
+        self.similarity_threshold = similarity_threshold
+    
+    @staticmethod
+    def search_key(topic: str, max_papers: int, sources: str = "") -> str:
+        return json.dumps([normalize_topic(topic), max_papers, sources])
+    
+    def get_results(self, topic: str, max_papers: int, sources: str = "") -> Optional[List[Paper]]:
+        """
+        Return cached search results for a topic, or None.
+        
+        Args:
+            topic: Research topic
+            max_papers: Maximum number of papers requested
+            sources: Fingerprint of the sources searched
+        
+        Returns:
+            Up to ``max_papers`` Paper objects, or None on a miss
+        """
+        value = self.get(self.search_key(topic, max_papers, sources))
+        if value is None and self.similarity_threshold is not None:
+            similar_key = self._similar_key(topic, max_papers, sources)
+            if similar_key is not None:
+                value = self.get(similar_key)
+        if value is None:
+            return None
+        return [Paper.from_dict(copy.deepcopy(paper)) for paper in value["papers"][:max_papers]]
+    
+    def set_results(self, topic: str, max_papers: int, papers: List[Paper], sources: str = ""):
+        """Store the search results for a topic found with the given sources"""
+        self.set(self.search_key(topic, max_papers, sources), {
+            "topic": topic,
+            "papers": copy.deepcopy([paper.to_dict() for paper in papers]),
+        })
+    
+    def _similar_key(self, topic: str, max_papers: int, sources: str) -> Optional[str]:
+        """Key of the most similar cached topic searched with ``sources`` for at least ``max_papers`` papers"""
+        terms = set(tokenize(topic))
+        if not terms:
+            return None
+        
+        best_key, best_similarity = None, self.similarity_threshold
+        for key in self.keys():
+            cached = json.loads(key)
+            # Entries from before sources were part of the key have only two fields
+            if len(cached) != 3 or cached[2] != sources or cached[1] < max_papers:
+                continue
+            cached_topic = cached[0]
+            cached_terms = set(tokenize(cached_topic))
+            similarity = len(terms & cached_terms) / len(terms | cached_terms)
+            if similarity >= best_similarity:
+                best_key, best_similarity = key, similarity
+        return best_key
+
+class SummaryCache(SQLiteCache):
+    """
+    Content-addressed cache of paper summaries.
+    
+    Entries are keyed by a hash of the prompt template version, the model name
+    and the rendered prompt, so a paper is only summarized again when its
+    content, the model or the prompt changes. The cache is bounded by total
+    size rather than age.
+    """
+    def __init__(self, 
+                 path: str = ".cache/summaries.sqlite3", 
+                 max_bytes: int = 256 * 1024 * 1024,
+                 memory_entries: int = 256):
+        super().__init__(path, ttl_seconds=None, max_entries=1_000_000,
+                         memory_entries=memory_entries, max_bytes=max_bytes)
+    
+    @staticmethod
+    def summary_key(template_version: str, model_name: str, prompt: str) -> str:
+        """Hash identifying a summary prompt"""
+        return hashlib.sha256(f"{template_version}\0{model_name}\0{prompt}".encode("utf-8")).hexdigest()
@@ -2,24 +2,177 @@
 Content retrieval agent module for getting full text and additional details of papers.
 """
 
+import asyncio
 import re
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
 from browser_use import Agent
 
+from literature_review.browser_pool import BrowserPool, browser_session
+from literature_review.host_scheduler import HostScheduler
 from literature_review.models import Paper
-from literature_review.utils_browser import convert_agent_result_to_string
+from literature_review.text_store import TextStore
+from literature_review.text_extraction import html_to_text, html_keywords, pdf_to_text
+from literature_review.utils_browser import extract_agent_result, record_agent_result
+
+RETRIEVAL_PATHS = ("html", "pdf", "browser")
+
+class HTTPFetcher:
+    """
+    Fetches pages and PDFs with a pooled async HTTP client.
+    
+    The client keeps connections alive across papers. An httpx client is
+    bound to the event loop it was first used on, so a new one is created
+    when called from a different loop (the web app runs each review in a
+    fresh loop). The previous client is closed then, but its connections
+    can only be shut down cleanly by ``aclose`` on the loop that used them.
+    """
+    def __init__(self,
+                 timeout: float = 15.0,
+                 max_connections: int = 20,
+                 max_bytes: int = 20 * 1024 * 1024,
+                 user_agent: str = "Mozilla/5.0 (compatible; literature-review-bot/0.1)"):
+        """
+        Initialize the fetcher.
+        
+        Args:
+            timeout: Seconds allowed per request
+            max_connections: Maximum number of pooled connections
+            max_bytes: Maximum response size to read
+            user_agent: User-Agent header sent with requests
+        """
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self.max_bytes = max_bytes
+        self.user_agent = user_agent
+        self._client: Optional[httpx.AsyncClient] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+    
+    async def _get_client(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        if self._client is not None and self._loop is not loop:
+            await self._close_stale_client()
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                follow_redirects=True,
+                headers={"User-Agent": self.user_agent},
+                limits=httpx.Limits(max_connections=self.max_connections,
+                                    max_keepalive_connections=self.max_connections),
+            )
+            self._loop = loop
+        return self._client
+    
+    async def _close_stale_client(self):
+        """Close a client left open on another event loop"""
+        client, self._client = self._client, None
+        try:
+            await client.aclose()
+        except RuntimeError:
+            # Connections still bound to a closed loop cannot be shut down from this one
+            pass
+    
+    async def fetch(self, url: str) -> Tuple[str, bytes]:
+        """
+        Fetch a URL.
+        
+        Args:
+            url: URL to fetch
+        
+        Returns:
+            Tuple of the response content type and up to ``max_bytes`` of its body
+        
+        Raises:
+            httpx.HTTPError: If the request fails or returns an error status
+        """
+        client = await self._get_client()
+        async with client.stream("GET", url) as response:
+            response.raise_for_status()
+            body = bytearray()
+            async for chunk in response.aiter_bytes():
+                body.extend(chunk)
+                if len(body) >= self.max_bytes:
+                    break
+            return response.headers.get("content-type", "").lower(), bytes(body[:self.max_bytes])
+    
+    async def aclose(self):
+        """Close the pooled client; call it before the event loop it was used on closes"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
 
 class ContentRetrievalAgent:
     """Agent responsible for retrieving full text or additional information for papers"""
-    def __init__(self, llm):
-        self.llm = llm
+    def __init__(self,
+                 llm,
+                 fast_path: bool = True,
+                 min_text_chars: int = 1000,
+                 fetcher: Optional[HTTPFetcher] = None,
+                 browser_pool: Optional[BrowserPool] = None,
+                 scheduler: Optional[HostScheduler] = None,
+                 text_store: Optional[TextStore] = None):
+        """
+        Initialize the content retrieval agent.
         
+        Args:
+            llm: Language model instance to use for the browser agent
+            fast_path: Whether to try fetching the URL over HTTP and extracting
+                HTML or PDF text locally before starting a browser agent
+            min_text_chars: Minimum amount of text the fast path must produce;
+                otherwise the browser agent is used
+            fetcher: HTTP fetcher for the fast path
+            browser_pool: Optional pool of browsers for the browser agent
+            scheduler: Per-host concurrency, rate limits and backoff for retrievals
+            text_store: Optional store that retrieved full texts are moved to,
+                so papers only keep a reference to their text in memory
+        """
+        self.llm = llm
+        self.fast_path = fast_path
+        self.min_text_chars = min_text_chars
+        self.fetcher = fetcher or HTTPFetcher()
+        self.browser_pool = browser_pool
+        self.scheduler = scheduler or HostScheduler()
+        self.text_store = text_store
+        self.reset_stats()
+    
+    async def aclose(self):
+        """Close the HTTP fetcher's pooled connections"""
+        await self.fetcher.aclose()
+    
+    def reset_stats(self):
+        """Reset the per-path attempt, hit and latency counters, the browser agent trace sizes and the per-host counters"""
+        self.stats: Dict[str, Dict[str, Any]] = {
+            path: {"attempts": 0, "hits": 0, "seconds": 0.0} for path in RETRIEVAL_PATHS
+        }
+        # Size of the browser agents' step traces against the text kept from them
+        self.agent_stats: Dict[str, int] = {"agent_runs": 0, "trace_chars": 0, "result_chars": 0}
+        self.scheduler.stats.clear()
+    
+    def path_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-path counters with hit rate and mean latency"""
+        return {
+            path: {
+                **counters,
+                "hit_rate": counters["hits"] / counters["attempts"] if counters["attempts"] else 0.0,
+                "mean_seconds": counters["seconds"] / counters["attempts"] if counters["attempts"] else 0.0,
+            }
+            for path, counters in self.stats.items()
+        }
+    
+    def _record(self, path: str, hit: bool, start: float):
+        self.stats[path]["attempts"] += 1
+        self.stats[path]["hits"] += int(hit)
+        self.stats[path]["seconds"] += time.perf_counter() - start
+    
     async def retrieve_content(self, paper: Paper) -> Paper:
         """
         Retrieve full content and additional details for a paper.
         
         Args:
             paper: Paper object to retrieve content for
-            
+        
         Returns:
             Updated Paper object with full text and additional metadata
         """
@@ -27,9 +180,79 @@ class ContentRetrievalAgent:
             print(f"No URL available for '{paper.title}', skipping content retrieval")
             return paper
         
+        # At most a few papers per host are retrieved at once
+        async with self.scheduler.slot(paper.url):
+            if not (self.fast_path and await self._retrieve_over_http(paper)):
+                paper = await self._retrieve_with_browser(paper)
+        
+        if self.text_store is not None:
+            await asyncio.to_thread(paper.store_full_text, self.text_store)
+        return paper
+    
+    async def _retrieve_over_http(self, paper: Paper) -> bool:
+        """
+        Fetch the paper's URL directly and extract its text locally.
+        
+        An HTML page that is too short but links a PDF (``citation_pdf_url``,
+        as on arXiv and most publisher landing pages) is followed to the PDF.
+        
+        Returns:
+            Whether enough text was found; the paper is only updated if so
+        """
+        text, keywords, pdf_url = await self._fetch_text(paper.url)
+        if len(text) < self.min_text_chars and pdf_url:
+            pdf_text, _, _ = await self._fetch_text(pdf_url)
+            if len(pdf_text) > len(text):
+                text = pdf_text
+        
+        if len(text) < self.min_text_chars:
+            return False
+        
+        paper.full_text = text
+        if keywords and not paper.keywords:
+            paper.keywords = keywords
+        elif not paper.keywords:
+            self._extract_keywords(paper, text)
+        return True
+    
+    async def _fetch_text(self, url: str) -> Tuple[str, List[str], Optional[str]]:
+        """Fetch a URL and extract its text, keywords and linked PDF URL"""
+        start = time.perf_counter()
+        path = "pdf" if url.lower().split("?")[0].endswith(".pdf") else "html"
+        try:
+            content_type, body = await self.scheduler.call(url, lambda: self.fetcher.fetch(url))
+        except (httpx.HTTPError, ValueError) as e:
+            reason = f"HTTP {e.response.status_code}" if isinstance(e, httpx.HTTPStatusError) else str(e) or type(e).__name__
+            print(f"  ⚠️ HTTP fetch failed for {url}: {reason}")
+            self._record(path, False, start)
+            return "", [], None
+        
+        keywords, pdf_url = [], None
+        if "pdf" in content_type or body.startswith(b"%PDF"):
+            path = "pdf"
+            text = await asyncio.to_thread(pdf_to_text, body) or ""
+        else:
+            path = "html"
+            html = body.decode(self._charset(content_type), errors="replace")
+            text, meta = await asyncio.to_thread(html_to_text, html)
+            keywords = html_keywords(meta)
+            if meta.get("citation_pdf_url"):
+                pdf_url = str(httpx.URL(url).join(meta["citation_pdf_url"][0]))
+        
+        self._record(path, len(text) >= self.min_text_chars, start)
+        return text, keywords, pdf_url
+    
+    @staticmethod
+    def _charset(content_type: str) -> str:
+        match = re.search(r'charset=([\w\-]+)', content_type)
+        return match.group(1) if match else "utf-8"
+    
+    async def _retrieve_with_browser(self, paper: Paper) -> Paper:
+        """Retrieve the paper's content with a browser agent"""
+        start = time.perf_counter()
+        
         # Create a browser agent to retrieve the full text and additional information
-        agent = Agent(
-            task=f"""
+        task = f"""
             Visit {paper.url} and extract the following information for the paper titled '{paper.title}':
             
             1. Full text of the paper if available (or as much as possible)
@@ -38,24 +261,32 @@ class ContentRetrievalAgent:
             
             If the full text is not accessible, extract as much information as possible including extended abstract, 
             introduction, methodology, results, and conclusion sections.
-            """,
-            llm=self.llm,
-            max_actions_per_step=5,
-        )
+            """
         
-        result = await agent.run(max_steps=12)
+        try:
+            async with browser_session(self.browser_pool) as browser_kwargs:
+                agent = Agent(
+                    task=task,
+                    llm=self.llm,
+                    max_actions_per_step=5,
+                    **browser_kwargs,
+                )
+                result = await self.scheduler.call(paper.url, lambda: agent.run(max_steps=12))
+        except Exception:
+            self._record("browser", False, start)
+            raise
+        
+        # Keep the agent's answer or extracted content rather than its whole step trace
+        agent_result = extract_agent_result(result)
+        record_agent_result(self.agent_stats, agent_result)
+        result_text = agent_result.text
         
-        # Convert result to string using our utility function
-        result_text = convert_agent_result_to_string(result)
-            
         # Update the paper with additional information
         paper.full_text = result_text.strip()
+        self._record("browser", bool(paper.full_text), start)
         
         # Try to extract keywords from the result
-        keywords_match = re.search(r'Keywords:\s*(.*?)(?:\n|$)', result_text, re.IGNORECASE)
-        if keywords_match:
-            keywords_text = keywords_match.group(1)
-            paper.keywords = [kw.strip() for kw in re.split(r',|;', keywords_text) if kw.strip()]
+        self._extract_keywords(paper, result_text)
         
         # Try to extract citation count
         citations_match = re.search(r'Citations:\s*(\d+)', result_text, re.IGNORECASE)
@@ -64,5 +295,13 @@ class ContentRetrievalAgent:
                 paper.citations = int(citations_match.group(1))
             except ValueError:
                 pass
-            
+        
         return paper
+    
+    @staticmethod
+    def _extract_keywords(paper: Paper, text: str):
+        """Set the paper's keywords from a 'Keywords:' line in the text, if there is one"""
+        keywords_match = re.search(r'Keywords:\s*(.*?)(?:\n|$)', text, re.IGNORECASE)
+        if keywords_match:
+            keywords_text = keywords_match.group(1)
+            paper.keywords = [kw.strip() for kw in re.split(r',|;', keywords_text) if kw.strip()]
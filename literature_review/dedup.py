@@ -0,0 +1,199 @@
+"""
+Near-duplicate detection for search results with MinHash and locality-sensitive hashing.
+"""
+
+import hashlib
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from literature_review.models import Paper, normalize_title
+from literature_review.lexical import tokenize
+from literature_review.utils import paper_identity, merge_paper_metadata
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+# Normalized titles shared by unrelated papers (front matter, defaults of
+# parsers), which identify nothing on their own
+PLACEHOLDER_TITLES = frozenset({
+    "unknown title", "unknown", "untitled", "no title", "title", "introduction", "editorial",
+    "preface", "foreword", "conclusion", "conclusions", "abstract", "contents", "table of contents",
+    "index", "front matter", "back matter", "erratum", "errata", "corrigendum", "book review",
+    "book reviews", "letter to the editor", "reply", "in this issue", "announcements",
+})
+
+def is_placeholder_title(title: str) -> bool:
+    """Whether a title, like "Editorial" or "Unknown Title", is a placeholder shared by unrelated papers"""
+    return normalize_title(title) in PLACEHOLDER_TITLES
+
+def shingles(text: str, size: int = 3) -> List[str]:
+    """
+    Word shingles of a text after tokenizing and stemming.
+    
+    Args:
+        text: Text to shingle
+        size: Number of words per shingle
+    
+    Returns:
+        List of distinct shingles; texts shorter than ``size`` words give one shingle
+    """
+    tokens = tokenize(text)
+    if len(tokens) <= size:
+        return [" ".join(tokens)] if tokens else []
+    return list({" ".join(tokens[i:i + size]) for i in range(len(tokens) - size + 1)})
+
+class MinHasher:
+    """Computes MinHash signatures with ``num_perm`` universal hash functions"""
+    def __init__(self, num_perm: int = 128, seed: int = 1):
+        rng = np.random.default_rng(seed)
+        self.num_perm = num_perm
+        # Coefficients below 2**32 keep a * x + b within 64 bits for 32-bit x
+        self.a = rng.integers(1, _MAX_HASH, size=num_perm, dtype=np.uint64)
+        self.b = rng.integers(0, _MAX_HASH, size=num_perm, dtype=np.uint64)
+    
+    def signature(self, features: List[str]) -> np.ndarray:
+        """
+        MinHash signature of a set of features.
+        
+        Args:
+            features: Features (e.g. shingles) of one document
+        
+        Returns:
+            Array of ``num_perm`` 32-bit minimum hash values
+        """
+        if not features:
+            return np.full(self.num_perm, _MAX_HASH, dtype=np.uint64)
+        hashes = np.fromiter(
+            (int.from_bytes(hashlib.blake2b(f.encode("utf-8"), digest_size=4).digest(), "little")
+             for f in features),
+            dtype=np.uint64, count=len(features),
+        )
+        # (a * x + b) mod p for every feature and permutation
+        permuted = (np.outer(hashes, self.a) + self.b) % np.uint64(_MERSENNE_PRIME)
+        return (permuted & np.uint64(_MAX_HASH)).min(axis=0)
+
+class PaperDeduplicator:
+    """
+    Clusters duplicate and near-duplicate papers and merges their metadata.
+    
+    A paper is a duplicate when it has the same DOI, arXiv ID or URL as an
+    earlier paper, or, if neither has any of these, the same normalized
+    title; or when the MinHash estimate of the Jaccard similarity of their
+    title+abstract shingles reaches ``threshold``. Placeholder titles such
+    as "Unknown Title" or "Editorial" are never matched on, nor shingled.
+    Candidates for the MinHash comparison come from an LSH index of
+    ``bands`` signature bands, so each insert only compares against papers
+    sharing a band instead of the whole pool. Papers without any word
+    shingles (e.g. a title in a non-Latin script and no abstract) would all
+    share the same empty signature, so they are matched on their exact
+    identity keys only.
+    """
+    def __init__(self,
+                 threshold: float = 0.6,
+                 num_perm: int = 128,
+                 bands: int = 32,
+                 shingle_size: int = 3):
+        """
+        Initialize the deduplicator.
+        
+        Args:
+            threshold: Estimated Jaccard similarity at which two papers are duplicates
+            num_perm: Number of MinHash permutations
+            bands: Number of LSH bands; must divide ``num_perm``
+            shingle_size: Number of words per shingle
+        """
+        if num_perm % bands:
+            raise ValueError(f"bands ({bands}) must divide num_perm ({num_perm})")
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        self.hasher = MinHasher(num_perm)
+        self.papers: List[Paper] = []
+        self.duplicates = 0
+        self._keys: Dict[str, int] = {}
+        self._signatures: List[Optional[np.ndarray]] = []
+        self._buckets: List[Dict[bytes, List[int]]] = [{} for _ in range(bands)]
+    
+    def add(self, paper: Paper) -> int:
+        """
+        Add a paper, merging it into an earlier duplicate if there is one.
+        
+        Args:
+            paper: Paper to add
+        
+        Returns:
+            Index in ``self.papers`` of the paper it was merged into, or of the new entry
+        """
+        keys = self._identity_keys(paper)
+        title = "" if is_placeholder_title(paper.title) else paper.title or ""
+        features = shingles(f"{title} {paper.abstract or ''}", self.shingle_size)
+        signature = self.hasher.signature(features) if features else None
+        band_keys = ([signature[i * self.rows:(i + 1) * self.rows].tobytes() for i in range(self.bands)]
+                     if signature is not None else [])
+        
+        cluster = next((self._keys[key] for key in keys if key in self._keys), None)
+        if cluster is None and band_keys:
+            cluster = self._find_similar(signature, band_keys)
+        
+        if cluster is None:
+            cluster = len(self.papers)
+            self.papers.append(paper)
+            self._signatures.append(signature)
+        else:
+            self.duplicates += 1
+            merge_paper_metadata(self.papers[cluster], paper)
+            if self._signatures[cluster] is None:
+                self._signatures[cluster] = signature
+        
+        for key in keys:
+            self._keys.setdefault(key, cluster)
+        for band, band_key in zip(self._buckets, band_keys):
+            members = band.setdefault(band_key, [])
+            if cluster not in members:
+                members.append(cluster)
+        return cluster
+    
+    def deduplicate(self, papers: List[Paper]) -> List[Paper]:
+        """
+        Add papers and return the deduplicated list.
+        
+        Args:
+            papers: Papers to deduplicate, in ranked order
+        
+        Returns:
+            One merged Paper per cluster, in order of first appearance
+        """
+        for paper in papers:
+            self.add(paper)
+        return list(self.papers)
+    
+    def _find_similar(self, signature: np.ndarray, band_keys: List[bytes]) -> Optional[int]:
+        """Return the most similar LSH candidate at or above the threshold, if any"""
+        candidates = set()
+        for band, band_key in zip(self._buckets, band_keys):
+            candidates.update(band.get(band_key, ()))
+        
+        best, best_similarity = None, self.threshold
+        for candidate in sorted(candidates):
+            similarity = float(np.mean(self._signatures[candidate] == signature))
+            if similarity >= best_similarity:
+                best, best_similarity = candidate, similarity
+        return best
+    
+    @staticmethod
+    def _identity_keys(paper: Paper) -> List[str]:
+        """
+        Exact identity keys of a paper: its paper ID.
+        
+        That is its DOI, arXiv ID or URL, or for papers without a URL its
+        normalized title. A title therefore only matches papers that have no
+        URL either, so papers with different identifiers never merge on a
+        shared title.
+        """
+        identity = paper_identity(paper)
+        # A paper with neither a URL nor a meaningful title has no identity to match on
+        if identity == "title:" or (identity.startswith("title:") and is_placeholder_title(paper.title)):
+            return []
+        return [identity]
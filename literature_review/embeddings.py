@@ -0,0 +1,188 @@
+"""
+Embedding-based relevance scoring with an on-disk embedding cache.
+"""
+
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from literature_review.models import Paper
+from literature_review.lexical import tokenize
+
+class HashingEmbedder:
+    """
+    Deterministic local embedder based on feature hashing.
+    
+    Each token and token bigram is hashed into one of ``dim`` buckets with a
+    signed weight. It needs no model server, which makes it suitable for tests
+    and offline runs, but it only captures lexical overlap.
+    """
+    # Cosine similarities of unrelated and of clearly relevant topic/paper pairs
+    similarity_range = (0.1, 0.3)
+    
+    def __init__(self, dim: int = 512):
+        self.dim = dim
+        self.model_name = f"hashing-{dim}"
+    
+    async def embed(self, texts: List[str]) -> np.ndarray:
+        """Embed texts into a (len(texts), dim) array"""
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for i, text in enumerate(texts):
+            tokens = tokenize(text)
+            features = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+            for feature in features:
+                digest = hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest()
+                bucket = int.from_bytes(digest[:4], "little") % self.dim
+                sign = 1.0 if digest[4] & 1 else -1.0
+                vectors[i, bucket] += sign
+        return vectors
+
+class OllamaEmbedder:
+    """Embedder backed by an Ollama embedding model"""
+    # Cosine similarities of unrelated and of clearly relevant topic/paper pairs
+    # for general-purpose text embedding models such as nomic-embed-text
+    similarity_range = (0.4, 0.75)
+    
+    def __init__(self, model: str = "nomic-embed-text", base_url: Optional[str] = None):
+        from langchain_ollama import OllamaEmbeddings
+        
+        self.model_name = model
+        if base_url:
+            self.client = OllamaEmbeddings(model=model, base_url=base_url)
+        else:
+            self.client = OllamaEmbeddings(model=model)
+    
+    async def embed(self, texts: List[str]) -> np.ndarray:
+        """Embed texts into a (len(texts), dim) array"""
+        vectors = await self.client.aembed_documents(texts)
+        return np.asarray(vectors, dtype=np.float32)
+
+class EmbeddingCache:
+    """
+    On-disk cache of embedding vectors keyed by model name and content hash.
+    
+    Each vector is stored as a ``.npy`` file under a two-character shard
+    directory. Files are written to a temporary name and renamed into place,
+    so several processes can share one cache directory.
+    """
+    def __init__(self, cache_dir: str = ".cache/embeddings"):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.hits = 0
+        self.misses = 0
+    
+    @staticmethod
+    def key(model_name: str, text: str) -> str:
+        """Cache key for a text embedded with a given model"""
+        return hashlib.sha256(f"{model_name}\0{text}".encode("utf-8")).hexdigest()
+    
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.npy"
+    
+    def get(self, key: str) -> Optional[np.ndarray]:
+        """Return the cached vector for a key, or None"""
+        try:
+            vector = np.load(self._path(key))
+        except (FileNotFoundError, ValueError, OSError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return vector
+    
+    def put(self, key: str, vector: np.ndarray):
+        """Store a vector under a key"""
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.save(f, vector)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+class EmbeddingScorer:
+    """
+    Scores paper relevance by cosine similarity between topic and paper embeddings.
+    
+    Raw cosine similarities depend on the embedding model and are much lower
+    than LLM relevance scores for the same papers, so they are rescaled
+    linearly from the embedder's ``similarity_range`` (unrelated to clearly
+    relevant) to 0-1, which makes the usual relevance thresholds apply.
+    """
+    def __init__(self,
+                 embedder=None,
+                 cache: Optional[EmbeddingCache] = None,
+                 similarity_range: Optional[Tuple[float, float]] = None):
+        """
+        Initialize the scorer.
+        
+        Args:
+            embedder: Object with a ``model_name`` and an async ``embed(texts)`` method
+                (defaults to HashingEmbedder)
+            cache: Optional on-disk cache for embedding vectors
+            similarity_range: Cosine similarities mapped to relevance 0 and 1
+                (defaults to the embedder's ``similarity_range``, else (0, 1))
+        """
+        self.embedder = embedder or HashingEmbedder()
+        self.cache = cache
+        low, high = similarity_range or getattr(self.embedder, "similarity_range", (0.0, 1.0))
+        if high <= low:
+            raise ValueError(f"similarity_range must be increasing, got ({low}, {high})")
+        self.similarity_range = (low, high)
+    
+    async def embed(self, texts: Sequence[str]) -> np.ndarray:
+        """Embed texts, reading from and filling the cache when one is configured"""
+        if not self.cache:
+            return await self.embedder.embed(list(texts))
+        
+        keys = [EmbeddingCache.key(self.embedder.model_name, text) for text in texts]
+        vectors: List[Optional[np.ndarray]] = [self.cache.get(key) for key in keys]
+        missing = [i for i, vector in enumerate(vectors) if vector is None]
+        if missing:
+            new_vectors = await self.embedder.embed([texts[i] for i in missing])
+            for i, vector in zip(missing, new_vectors):
+                self.cache.put(keys[i], vector)
+                vectors[i] = vector
+        return np.vstack(vectors)
+    
+    async def similarities(self, papers: Sequence[Paper], topic: str) -> np.ndarray:
+        """
+        Cosine similarities between a topic and papers.
+        
+        Args:
+            papers: Papers to compare, embedded from their title and abstract
+            topic: The research topic to compare against
+        
+        Returns:
+            Raw cosine similarities, one per paper
+        """
+        if not papers:
+            return np.zeros(0)
+        
+        texts = [topic] + [f"{paper.title}\n{paper.abstract or ''}" for paper in papers]
+        vectors = await self.embed(texts)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        vectors = vectors / np.where(norms == 0, 1.0, norms)
+        
+        return vectors[1:] @ vectors[0]
+    
+    async def score(self, papers: Sequence[Paper], topic: str) -> np.ndarray:
+        """
+        Score papers against a topic.
+        
+        Args:
+            papers: Papers to score, embedded from their title and abstract
+            topic: The research topic to assess relevance against
+        
+        Returns:
+            Relevance scores in [0.0, 1.0], one per paper
+        """
+        low, high = self.similarity_range
+        similarities = await self.similarities(papers, topic)
+        return np.clip((similarities - low) / (high - low), 0.0, 1.0)
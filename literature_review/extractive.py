@@ -0,0 +1,208 @@
+"""
+Section-aware extractive excerpts of paper full texts.
+
+Long full texts are reduced to a fixed-size excerpt before they are sent to an
+LLM. The text is split into sections, sentences are ranked by TextRank
+centrality over TF-IDF vectors, and the best sentences of every section are
+kept in their original order.
+"""
+
+import hashlib
+import re
+from collections import Counter, OrderedDict
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from literature_review.lexical import tokenize
+
+# Canonical section names and the heading words that introduce them
+SECTION_PATTERNS = [
+    ("abstract", r"abstract|summary"),
+    ("introduction", r"introduction|background|motivation|related work|literature review"),
+    ("method", r"methods?|methodology|approach|materials and methods|model|experimental setup|data(?:set)?s?"),
+    ("results", r"results?|experiments?|evaluation|findings|analysis"),
+    ("conclusion", r"conclusions?|discussion|concluding remarks|future work|limitations"),
+    ("references", r"references|bibliography|acknowledge?ments?|appendix"),
+]
+
+# Share of the excerpt budget given to each section when it is present
+SECTION_WEIGHTS = {
+    "abstract": 0.15,
+    "introduction": 0.15,
+    "method": 0.2,
+    "results": 0.3,
+    "conclusion": 0.2,
+    "body": 1.0,
+}
+
+_HEADING_PATTERN = re.compile(
+    r"^\s*(?:\d+(?:\.\d+)*\.?|[IVX]+\.)?\s*(" + "|".join(pattern for _, pattern in SECTION_PATTERNS) + r")\s*:?\s*$",
+    re.IGNORECASE | re.MULTILINE,
+)
+_SENTENCE_PATTERN = re.compile(r"(?<=[.!?])\s+(?=[A-Z0-9(\[])")
+
+def _section_name(heading: str) -> str:
+    for name, pattern in SECTION_PATTERNS:
+        if re.fullmatch(pattern, heading.strip(), re.IGNORECASE):
+            return name
+    return "body"
+
+def split_sections(text: str) -> List[Tuple[str, str]]:
+    """
+    Split a full text into (section name, section text) pairs.
+    
+    Headings are recognized as short lines such as "2. Methods" or
+    "RESULTS". Text before the first heading is treated as the abstract when
+    there are headings, and as a single "body" section when there are none.
+    Reference and acknowledgement sections are dropped.
+    
+    Args:
+        text: Full text of a paper
+        
+    Returns:
+        List of (section name, text) pairs in document order
+    """
+    headings = list(_HEADING_PATTERN.finditer(text))
+    if not headings:
+        return [("body", text.strip())] if text.strip() else []
+    
+    sections = []
+    preamble = text[:headings[0].start()].strip()
+    if preamble:
+        sections.append(("abstract", preamble))
+    for heading, next_heading in zip(headings, headings[1:] + [None]):
+        end = next_heading.start() if next_heading else len(text)
+        body = text[heading.end():end].strip()
+        name = _section_name(heading.group(1))
+        if body and name != "references":
+            sections.append((name, body))
+    return sections
+
+def split_sentences(text: str) -> List[str]:
+    """Split text into sentences on terminal punctuation"""
+    text = re.sub(r"\s+", " ", text).strip()
+    return [sentence for sentence in _SENTENCE_PATTERN.split(text) if sentence]
+
+def textrank(sentences: List[str], damping: float = 0.85, iterations: int = 30) -> np.ndarray:
+    """
+    Rank sentences by TextRank centrality over TF-IDF cosine similarity.
+    
+    Args:
+        sentences: Sentences to rank
+        damping: PageRank damping factor
+        iterations: Number of power iterations
+        
+    Returns:
+        Array of centrality scores, one per sentence
+    """
+    if len(sentences) < 2:
+        return np.ones(len(sentences))
+    
+    tokenized = [tokenize(sentence) for sentence in sentences]
+    vocabulary: Dict[str, int] = {}
+    for tokens in tokenized:
+        for token in tokens:
+            vocabulary.setdefault(token, len(vocabulary))
+    if not vocabulary:
+        return np.ones(len(sentences))
+    
+    tf = np.zeros((len(sentences), len(vocabulary)))
+    for i, tokens in enumerate(tokenized):
+        for token, count in Counter(tokens).items():
+            tf[i, vocabulary[token]] = count
+    idf = np.log((1 + len(sentences)) / (1 + np.count_nonzero(tf, axis=0))) + 1.0
+    vectors = tf * idf
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    vectors = vectors / np.where(norms == 0, 1.0, norms)
+    
+    similarity = vectors @ vectors.T
+    np.fill_diagonal(similarity, 0.0)
+    row_sums = similarity.sum(axis=1, keepdims=True)
+    transition = np.divide(similarity, row_sums, out=np.full_like(similarity, 1.0 / len(sentences)),
+                           where=row_sums > 0)
+    
+    scores = np.full(len(sentences), 1.0 / len(sentences))
+    for _ in range(iterations):
+        scores = (1 - damping) / len(sentences) + damping * (transition.T @ scores)
+    return scores
+
+def _allocate(sections: List[Tuple[str, str]], max_chars: int) -> List[int]:
+    """Split the character budget across sections by weight, capped at each section's length"""
+    weights = np.array([SECTION_WEIGHTS.get(name, 0.1) for name, _ in sections])
+    lengths = np.array([len(body) for _, body in sections])
+    budgets = np.zeros(len(sections))
+    remaining = float(max_chars)
+    open_sections = lengths > 0
+    
+    # Hand out the budget by weight; whatever short sections cannot use goes to the rest
+    while remaining > 1 and open_sections.any():
+        share = remaining * weights * open_sections / (weights * open_sections).sum()
+        grant = np.minimum(share, lengths - budgets)
+        budgets += grant
+        remaining -= grant.sum()
+        open_sections &= budgets < lengths
+    return [int(budget) for budget in budgets]
+
+# Recent excerpts by text digest, so the cache does not keep full texts alive
+_EXCERPT_CACHE_SIZE = 256
+_excerpt_cache: "OrderedDict[Tuple[bytes, int, int], str]" = OrderedDict()
+
+def build_excerpt(text: str, max_chars: int = 3000, max_sentences_per_section: int = 200) -> str:
+    """
+    Build a fixed-size extractive excerpt that covers every section of a text.
+    
+    Texts that already fit ``max_chars`` are returned unchanged. Otherwise each
+    section gets a share of the budget, and its most central sentences are kept
+    in their original order under a "[Section]" label. Recent excerpts are
+    cached by a digest of the text, as the filter and summary stages excerpt
+    the same texts.
+    
+    Args:
+        text: Full text of a paper
+        max_chars: Maximum excerpt length in characters
+        max_sentences_per_section: Sentences ranked per section (bounds the
+            quadratic similarity matrix on very long sections)
+        
+    Returns:
+        Excerpt of at most roughly ``max_chars`` characters
+    """
+    if len(text) <= max_chars:
+        return text
+    
+    key = (hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest(), max_chars, max_sentences_per_section)
+    excerpt = _excerpt_cache.get(key)
+    if excerpt is None:
+        excerpt = _build_excerpt(text, max_chars, max_sentences_per_section)
+        _excerpt_cache[key] = excerpt
+        if len(_excerpt_cache) > _EXCERPT_CACHE_SIZE:
+            _excerpt_cache.popitem(last=False)
+    else:
+        _excerpt_cache.move_to_end(key)
+    return excerpt
+
+def _build_excerpt(text: str, max_chars: int, max_sentences_per_section: int) -> str:
+    sections = split_sections(text)
+    if not sections:
+        return text[:max_chars]
+    
+    parts = []
+    for (name, body), budget in zip(sections, _allocate(sections, max_chars)):
+        sentences = split_sentences(body)[:max_sentences_per_section]
+        if not sentences or budget <= 0:
+            continue
+        
+        chosen, used = [], 0
+        for i in np.argsort(-textrank(sentences), kind="stable"):
+            if used + len(sentences[i]) + 1 > budget:
+                continue
+            chosen.append(i)
+            used += len(sentences[i]) + 1
+        if not chosen:
+            # The section's best sentence alone exceeds its budget, so cut it
+            chosen_text = sentences[int(np.argmax(textrank(sentences)))][:budget]
+        else:
+            chosen_text = " ".join(sentences[i] for i in sorted(chosen))
+        parts.append(f"[{name.capitalize()}] {chosen_text}")
+    
+    return "\n".join(parts)
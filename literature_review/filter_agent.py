@@ -2,82 +2,497 @@
 Filter agent module for assessing and filtering papers based on relevance.
 """
 
+import heapq
+import json
+import math
 import re
-from typing import List
-from browser_use import Agent
+import time
+from typing import List, Dict, Any, Optional, Tuple
+
+import numpy as np
 
 from literature_review.models import Paper
-from literature_review.utils_browser import convert_agent_result_to_string
+from literature_review.llm_backend import create_backend
+from literature_review.lexical import LexicalPrefilter, bm25_scores, paper_text
+from literature_review.embeddings import EmbeddingScorer
+from literature_review.cache import RelevanceCache
+from literature_review.extractive import build_excerpt
+from literature_review.paper_batch import PaperBatch, RankingWeights
+
+# Bump when the relevance prompts change so cached scores are not reused
+RELEVANCE_PROMPT_VERSION = "1"
+
+# Score given to a paper when no score can be parsed from the LLM response; never cached
+FALLBACK_RELEVANCE_SCORE = 0.5
+
+class TopKStopper:
+    """
+    Tracks the best ranking scores seen so far to decide when scoring can stop.
+    
+    Papers are kept when their relevance clears the threshold and are ranked
+    by their ranking score, which is the relevance score unless the ranking
+    weights mix in other signals. A remaining candidate can be skipped once
+    ``target_count`` papers have cleared the threshold and the candidate's
+    optimistic ranking score bound cannot beat the current k-th best score.
+    A bound of None means nothing is known about the candidate, so it is
+    skipped as soon as enough papers have been found.
+    """
+    def __init__(self, target_count: int, relevance_threshold: float):
+        self.target_count = max(1, target_count)
+        self.relevance_threshold = relevance_threshold
+        self._top: List[float] = []
+    
+    def add(self, score: float, rank_score: Optional[float] = None):
+        """Record a scored paper by its relevance score and ranking score (defaults to the relevance score)"""
+        if score < self.relevance_threshold:
+            return
+        rank_score = score if rank_score is None else rank_score
+        if len(self._top) < self.target_count:
+            heapq.heappush(self._top, rank_score)
+        else:
+            heapq.heappushpop(self._top, rank_score)
+    
+    @property
+    def kth_score(self) -> Optional[float]:
+        """The k-th best ranking score of the relevant papers, or None while fewer than k are relevant"""
+        return self._top[0] if len(self._top) >= self.target_count else None
+    
+    def can_skip(self, bound: Optional[float]) -> bool:
+        """Whether a candidate with the given optimistic ranking score bound can be left unscored"""
+        kth_score = self.kth_score
+        return kth_score is not None and (bound is None or bound <= kth_score)
+    
+    def excludes(self, rank_score: float) -> bool:
+        """Whether a scored paper has fallen below the k-th best ranking score and cannot make the top k"""
+        kth_score = self.kth_score
+        return kth_score is not None and rank_score < kth_score
 
 class FilterAgent:
     """Agent responsible for filtering papers based on relevance to the topic"""
-    def __init__(self, llm):
-        self.llm = llm
+    def __init__(self, 
+                 llm, 
+                 batch_size: int = 1, 
+                 backend: str = "direct",
+                 prefilter: Optional[LexicalPrefilter] = None,
+                 embedding_scorer: Optional[EmbeddingScorer] = None,
+                 cache: Optional[RelevanceCache] = None,
+                 excerpt_chars: int = 0,
+                 ranking: Optional[RankingWeights] = None):
+        """
+        Initialize the filter agent.
         
-    async def filter_papers(self, papers: List[Paper], topic: str, relevance_threshold: float = 0.7) -> List[Paper]:
+        Args:
+            llm: Language model instance to use for relevance assessment
+            batch_size: Number of papers to score per LLM call (1 scores each paper separately)
+            backend: Execution backend, "direct" for plain LLM calls or "browser" for a browser_use Agent
+            prefilter: Optional lexical stage that decides clear-cut papers without the LLM
+            embedding_scorer: Optional embedding similarity scorer used instead of LLM calls
+            cache: Optional persistent cache of LLM relevance scores
+            excerpt_chars: Length of a full-text excerpt to add to relevance prompts (0 to leave it out)
+            ranking: Weights of relevance, citations, recency and venue used to order
+                relevant papers (defaults to relevance alone)
+        """
+        self.llm = llm
+        self.batch_size = max(1, batch_size)
+        self.backend = create_backend(llm, backend)
+        self.prefilter = prefilter
+        self.embedding_scorer = embedding_scorer
+        self.cache = cache
+        self.excerpt_chars = excerpt_chars
+        # The excerpt is part of the prompt, so scores with different excerpts are cached apart
+        self.prompt_version = f"{RELEVANCE_PROMPT_VERSION}:excerpt={excerpt_chars}"
+        self.ranking = ranking or RankingWeights()
+        self.model_name = getattr(llm, "model", None) or type(llm).__name__
+        self.stats: Dict[str, Any] = {}
+        self.reset_stats()
+    
+    def reset_stats(self):
+        """Reset the per-run scoring counters"""
+        self.stats = {
+            "papers_scored": 0,
+            "llm_calls": 0,
+            "llm_calls_saved": 0,
+            "prefilter_accepted": 0,
+            "prefilter_rejected": 0,
+            "cache_hits": 0,
+            "cache_misses": 0,
+            "early_stop_skipped": 0,
+            # Skipped by the approximate lexical bound, so possibly true top-k papers
+            "early_stop_approximate": 0,
+            "llm_seconds": 0.0,
+        }
+    
+    async def filter_papers(self, 
+                            papers: List[Paper], 
+                            topic: str, 
+                            relevance_threshold: float = 0.7,
+                            batch_size: Optional[int] = None,
+                            target_count: Optional[int] = None,
+                            priority: str = "lexical") -> List[Paper]:
         """
         Filter papers based on relevance and assign relevance scores.
         
+        With ``target_count`` set, candidates are scored in priority order and
+        scoring stops once ``target_count`` papers clear the threshold and no
+        remaining candidate can beat the current k-th ranking score (see prioritize).
+        Only the best ``target_count`` papers are returned. Relevant papers are
+        ranked by the agent's ranking weights.
+        
         Args:
             papers: List of Paper objects to filter
             topic: The research topic to assess relevance against
             relevance_threshold: Minimum relevance score (0.0-1.0) to keep a paper
-            
+            batch_size: Papers to score per LLM call (defaults to the agent's batch_size)
+            target_count: Number of papers the caller needs, enabling early termination
+            priority: Scoring order for early termination, "lexical", "approximate" or "rank"
+        
         Returns:
             Filtered and sorted list of Paper objects
         """
-        filtered_papers = []
-        
-        for paper in papers:
-            # Prepare content for assessment
-            content = f"""
-            Title: {paper.title}
-            Authors: {', '.join(paper.authors)}
-            Abstract: {paper.abstract}
-            """
-            if paper.keywords:
-                content += f"Keywords: {', '.join(paper.keywords)}\n"
-            
-            # Create an agent to assess relevance
-            agent = Agent(
-                task=f"""
-                Assess how relevant the following paper is to the topic '{topic}' on a scale from 0.0 to 1.0.
-                
-                {content}
-                
-                Explain your assessment briefly, then on the last line provide just the numerical score in the format: RELEVANCE_SCORE: X.X
-                """,
-                llm=self.llm,
-                max_actions_per_step=2,
+        if target_count:
+            papers, scores = await self._score_top_k(
+                papers, topic, relevance_threshold, batch_size, target_count, priority
             )
+        else:
+            scores = await self.score_papers(papers, topic, batch_size)
+        
+        for paper, relevance_score in zip(papers, scores):
+            if relevance_score >= relevance_threshold:
+                print(f"Paper '{paper.title}' is relevant (score: {relevance_score:.2f})")
+            else:
+                print(f"Paper '{paper.title}' is not relevant enough (score: {relevance_score:.2f})")
+        
+        # Keep papers above the threshold, best ranked first
+        batch = PaperBatch.from_papers(papers)
+        batch.relevance_score[:] = scores
+        return batch.select(relevance_threshold, k=target_count, weights=self.ranking).to_papers()
+    
+    def prioritize(self, 
+                   papers: List[Paper], 
+                   topic: str, 
+                   priority: str = "lexical",
+                   margin: float = 0.5) -> List[Tuple[Paper, Optional[float]]]:
+        """
+        Order candidates for early termination and give each an optimistic score bound.
+        
+        "lexical" orders papers by their BM25 score against the topic. Their
+        relevance is bounded by 1.0, since word overlap says nothing certain
+        about the LLM's score; their ranking score bound mixes that with the
+        paper's citation, recency and venue signals under the agent's ranking
+        weights. Papers are ordered by that bound, best first (ties in lexical
+        order), so scoring only stops early once the known signals rule the
+        remaining papers out, and never drops a true top-k paper.
+        
+        "approximate" also bounds relevance by the lexical score plus
+        ``margin``. It stops much sooner, but a relevant paper that shares few
+        words with the topic can be skipped; such skips are counted in the
+        ``early_stop_approximate`` stat.
+        
+        "rank" keeps the search order and gives no bound, so scoring stops as
+        soon as enough papers are relevant.
+        
+        Args:
+            papers: Candidate papers
+            topic: The research topic to assess relevance against
+            priority: "lexical", "approximate" or "rank"
+            margin: How far above its lexical score a paper's relevance may be
+                in "approximate" mode
+        
+        Returns:
+            List of (paper, ranking score bound) pairs in scoring order
+        """
+        if priority == "rank":
+            return [(paper, None) for paper in papers]
+        if priority not in ("lexical", "approximate"):
+            raise ValueError(f"Unknown priority '{priority}', expected 'lexical', 'approximate' or 'rank'")
+        
+        lexical = bm25_scores(topic, [paper_text(paper) for paper in papers])
+        relevance_bounds = np.minimum(lexical + margin, 1.0) if priority == "approximate" else np.ones(len(papers))
+        bounds = self.ranking_scores(papers, relevance_bounds)
+        # Best bound first; ties keep the lexical order
+        lexical_order = np.argsort(-lexical, kind="stable")
+        order = lexical_order[np.argsort(-bounds[lexical_order], kind="stable")]
+        return [(papers[i], float(bounds[i])) for i in order]
+    
+    def ranking_scores(self, papers: List[Paper], relevance_scores) -> np.ndarray:
+        """
+        Ranking scores of papers under the agent's ranking weights.
+        
+        Args:
+            papers: Papers to score
+            relevance_scores: Relevance score (or bound) of each paper
+        
+        Returns:
+            Array of ranking scores between 0 and 1, one per paper
+        """
+        batch = PaperBatch.from_papers(papers)
+        batch.relevance_score[:] = relevance_scores
+        return batch.scores(self.ranking)
+    
+    def record_skipped(self, skipped: int, batch_size: Optional[int] = None, priority: str = "lexical"):
+        """Count candidates that early termination left unscored"""
+        batch_size = max(1, batch_size or self.batch_size)
+        self.stats["early_stop_skipped"] += skipped
+        if priority == "approximate":
+            self.stats["early_stop_approximate"] += skipped
+        self.stats["llm_calls_saved"] += math.ceil(skipped / batch_size)
+    
+    async def _score_top_k(self, 
+                           papers: List[Paper], 
+                           topic: str, 
+                           relevance_threshold: float,
+                           batch_size: Optional[int],
+                           target_count: int,
+                           priority: str) -> Tuple[List[Paper], List[float]]:
+        """Score candidates in priority order until the top ``target_count`` are settled"""
+        batch_size = max(1, batch_size or self.batch_size)
+        ranked = self.prioritize(papers, topic, priority)
+        stopper = TopKStopper(target_count, relevance_threshold)
+        scored_papers: List[Paper] = []
+        scores: List[float] = []
+        
+        position = 0
+        while position < len(ranked) and not stopper.can_skip(ranked[position][1]):
+            chunk = [paper for paper, _ in ranked[position:position + batch_size]]
+            position += len(chunk)
+            chunk_scores = await self.score_papers(chunk, topic, batch_size)
+            for paper, score, rank_score in zip(chunk, chunk_scores, self.ranking_scores(chunk, chunk_scores)):
+                stopper.add(score, float(rank_score))
+                scored_papers.append(paper)
+                scores.append(score)
+        
+        skipped = len(ranked) - position
+        if skipped:
+            print(f"Stopped early with {target_count} relevant papers, skipping {skipped} candidates")
+        self.record_skipped(skipped, batch_size, priority)
+        return scored_papers, scores
+    
+    async def score_papers(self, papers: List[Paper], topic: str, batch_size: Optional[int] = None) -> List[float]:
+        """
+        Assess the relevance of several papers, batching them into shared LLM calls.
+        
+        If a lexical prefilter is configured, it first decides the clear-cut
+        papers and only the rest are sent on. With an embedding scorer the
+        remaining papers are scored by embedding similarity. Otherwise they are
+        looked up in the relevance cache, if one is configured, and the misses
+        are scored by the LLM. Each LLM batch is scored with a single prompt
+        that asks for a score per paper ID. Papers whose score cannot be parsed
+        from the batch response are scored individually.
+        
+        Args:
+            papers: Paper objects to assess
+            topic: The research topic to assess relevance against
+            batch_size: Papers per LLM call (defaults to the agent's batch_size)
+        
+        Returns:
+            Relevance scores in the same order as ``papers``
+        """
+        batch_size = max(1, batch_size or self.batch_size)
+        self.stats["papers_scored"] += len(papers)
+        
+        decisions: List[Optional[float]] = [None] * len(papers)
+        if self.prefilter and papers:
+            decisions = self.prefilter.decide(papers, topic)
+            for paper, decision in zip(papers, decisions):
+                if decision is not None:
+                    paper.relevance_score = decision
+                    key = "prefilter_accepted" if decision >= self.prefilter.accept_score else "prefilter_rejected"
+                    self.stats[key] += 1
+        
+        pending = [paper for paper, decision in zip(papers, decisions) if decision is None]
+        if self.embedding_scorer:
+            pending_scores = await self._score_with_embeddings(pending, topic)
+            llm_papers = 0
+        else:
+            pending_scores, llm_papers = await self._score_with_cache(pending, topic, batch_size)
+        self.stats["llm_calls_saved"] += (
+            math.ceil(len(papers) / batch_size) - math.ceil(llm_papers / batch_size)
+        )
+        
+        scores = iter(pending_scores)
+        return [decision if decision is not None else next(scores) for decision in decisions]
+    
+    async def _score_with_embeddings(self, papers: List[Paper], topic: str) -> List[float]:
+        """Score papers by embedding similarity to the topic, calibrated to the relevance scale"""
+        scores = await self.embedding_scorer.score(papers, topic)
+        for paper, score in zip(papers, scores):
+            paper.relevance_score = float(score)
+        return [paper.relevance_score for paper in papers]
+    
+    async def _score_with_cache(self, papers: List[Paper], topic: str, batch_size: int) -> Tuple[List[float], int]:
+        """
+        Score papers from the relevance cache, sending only the misses to the LLM.
+        
+        Returns:
+            Tuple of the scores in input order and the number of papers scored by the LLM
+        """
+        scores: List[Optional[float]] = [None] * len(papers)
+        if self.cache:
+            for i, paper in enumerate(papers):
+                entry = self.cache.get_relevance(topic, paper, self.model_name, self.prompt_version)
+                if entry is not None:
+                    paper.relevance_score = scores[i] = entry["score"]
+                    self.stats["cache_hits"] += 1
+        
+        misses = [i for i, score in enumerate(scores) if score is None]
+        self.stats["cache_misses"] += len(misses) if self.cache else 0
+        
+        assessments = await self._score_with_llm([papers[i] for i in misses], topic, batch_size)
+        for i, (score, rationale) in zip(misses, assessments):
+            if score is None:
+                # Unparsable response: use the fallback score for this run only
+                scores[i] = FALLBACK_RELEVANCE_SCORE
+                continue
+            scores[i] = score
+            if self.cache:
+                self.cache.set_relevance(topic, papers[i], self.model_name, score, rationale, self.prompt_version)
+        
+        return scores, len(misses)
+    
+    async def _score_with_llm(self, 
+                              papers: List[Paper], 
+                              topic: str, 
+                              batch_size: int) -> List[Tuple[Optional[float], str]]:
+        """
+        Score papers with the LLM in batches of ``batch_size``, falling back to per-paper scoring.
+        
+        Returns:
+            (score, rationale) per paper, with a score of None where no score could be parsed
+        """
+        if batch_size == 1:
+            return [await self._assess_paper(paper, topic) for paper in papers]
+        
+        assessments = []
+        for start in range(0, len(papers), batch_size):
+            batch = papers[start:start + batch_size]
+            if len(batch) == 1:
+                assessments.append(await self._assess_paper(batch[0], topic))
+                continue
             
-            result = await agent.run(max_steps=3)
+            batch_scores = await self._score_batch(batch, topic)
+            for paper_id, paper in enumerate(batch, start=1):
+                if paper_id in batch_scores:
+                    paper.relevance_score = batch_scores[paper_id][0]
+                    assessments.append(batch_scores[paper_id])
+                else:
+                    print(f"No batch score for '{paper.title}', scoring it individually")
+                    assessments.append(await self._assess_paper(paper, topic))
+        
+        return assessments
+    
+    async def _score_batch(self, papers: List[Paper], topic: str) -> Dict[int, Tuple[float, str]]:
+        """Score a batch of papers with one backend call, returning (score, rationale) keyed by 1-based paper ID"""
+        content = "\n".join(
+            f"Paper ID {paper_id}:{self._describe_paper(paper)}"
+            for paper_id, paper in enumerate(papers, start=1)
+        )
+        
+        result_text = await self._run_llm(
+            f"""
+            Assess how relevant each of the following {len(papers)} papers is to the topic '{topic}' on a scale from 0.0 to 1.0.
             
-            # Convert result to string using our utility function
-            result_text = convert_agent_result_to_string(result)
+            {content}
             
-            # Extract the relevance score
-            score_match = re.search(r'RELEVANCE_SCORE:\s*(\d+\.\d+)', result_text)
-            if score_match:
-                relevance_score = float(score_match.group(1))
-            else:
-                # Fallback pattern
-                score_match = re.search(r'(\d+\.\d+)', result_text)
-                if score_match:
-                    relevance_score = float(score_match.group(1))
-                else:
-                    relevance_score = 0.5  # Default moderate relevance
+            Respond with only a JSON list containing one object per paper, using the paper IDs given above, 
+            with the score and a one-sentence reason, in the format:
+            [{{"id": 1, "score": 0.8, "reason": "..."}}, {{"id": 2, "score": 0.3, "reason": "..."}}]
+            """,
+            max_steps=3,
+            max_actions_per_step=2,
+        )
+        return self._parse_batch_scores(result_text, len(papers))
+    
+    async def _run_llm(self, task: str, max_steps: int, max_actions_per_step: int) -> str:
+        """Run a prompt on the backend, counting the call and its duration"""
+        self.stats["llm_calls"] += 1
+        start = time.perf_counter()
+        try:
+            return await self.backend.run(task, max_steps=max_steps, max_actions_per_step=max_actions_per_step)
+        finally:
+            self.stats["llm_seconds"] += time.perf_counter() - start
+    
+    def _parse_batch_scores(self, text: str, batch_length: int) -> Dict[int, Tuple[float, str]]:
+        """Extract {"id": N, "score": X, "reason": "..."} objects from a batch response"""
+        scores: Dict[int, Tuple[float, str]] = {}
+        
+        for object_match in re.finditer(r'\{[^{}]*\}', text):
+            try:
+                data = json.loads(object_match.group(0))
+                paper_id = int(data["id"])
+                score = float(data["score"])
+            except (json.JSONDecodeError, KeyError, TypeError, ValueError):
+                continue
+            
+            # Ignore IDs outside the batch and keep the first score for each ID
+            if 1 <= paper_id <= batch_length and paper_id not in scores:
+                scores[paper_id] = (min(max(score, 0.0), 1.0), str(data.get("reason", "")))
+        
+        return scores
+    
+    def _describe_paper(self, paper: Paper) -> str:
+        """Format a paper's metadata for a relevance prompt"""
+        content = f"""
+        Title: {paper.title}
+        Authors: {', '.join(paper.authors)}
+        Abstract: {paper.abstract}
+        """
+        if paper.keywords:
+            content += f"Keywords: {', '.join(paper.keywords)}\n"
+        if self.excerpt_chars and paper.full_text:
+            content += f"Excerpt: {build_excerpt(paper.full_text, self.excerpt_chars)}\n"
+        return content
+    
+    async def score_paper(self, paper: Paper, topic: str) -> float:
+        """
+        Assess the relevance of a single paper and store it on the paper.
+        
+        Args:
+            paper: Paper object to assess
+            topic: The research topic to assess relevance against
+        
+        Returns:
+            Relevance score between 0.0 and 1.0
+        """
+        relevance_score, _ = await self._assess_paper(paper, topic)
+        return FALLBACK_RELEVANCE_SCORE if relevance_score is None else relevance_score
+    
+    async def _assess_paper(self, paper: Paper, topic: str) -> Tuple[Optional[float], str]:
+        """
+        Score a single paper with the LLM.
+        
+        The paper's relevance_score is set to the score, or to
+        FALLBACK_RELEVANCE_SCORE if the response holds no parsable score.
+        
+        Returns:
+            Tuple of the score (None if no score could be parsed) and the model's rationale
+        """
+        # Prepare content for assessment
+        content = self._describe_paper(paper)
+        
+        # Assess relevance with the configured backend
+        result_text = await self._run_llm(
+            f"""
+            Assess how relevant the following paper is to the topic '{topic}' on a scale from 0.0 to 1.0.
             
-            # Update the paper's relevance score
-            paper.relevance_score = relevance_score
+            {content}
             
-            # Keep if above threshold
-            if relevance_score >= relevance_threshold:
-                filtered_papers.append(paper)
-                print(f"Paper '{paper.title}' is relevant (score: {relevance_score:.2f})")
-            else:
-                print(f"Paper '{paper.title}' is not relevant enough (score: {relevance_score:.2f})")
+            Explain your assessment briefly, then on the last line provide just the numerical score in the format: RELEVANCE_SCORE: X.X
+            """,
+            max_steps=3,
+            max_actions_per_step=2,
+        )
+        
+        # Extract the relevance score
+        score_match = re.search(r'RELEVANCE_SCORE:\s*(\d+\.\d+)', result_text)
+        if score_match:
+            relevance_score = float(score_match.group(1))
+            rationale = result_text[:score_match.start()].strip()
+        else:
+            rationale = result_text.strip()
+            # Fallback pattern
+            score_match = re.search(r'(\d+\.\d+)', result_text)
+            relevance_score = float(score_match.group(1)) if score_match else None
         
-        # Sort by relevance
-        filtered_papers.sort(key=lambda p: p.relevance_score, reverse=True)
-        return filtered_papers
+        # Update the paper's relevance score
+        paper.relevance_score = FALLBACK_RELEVANCE_SCORE if relevance_score is None else relevance_score
+        return relevance_score, rationale
@@ -0,0 +1,232 @@
+"""
+Per-host politeness scheduling for requests to paper sites.
+
+Papers from the same site (arXiv, ResearchGate, a publisher) are retrieved
+concurrently, so requests are limited per host: a cap on concurrent
+retrievals, a token-bucket request rate, and a shared backoff after the host
+answers 429 or 5xx, so one throttled host does not slow down the others.
+"""
+
+import asyncio
+import contextlib
+import random
+import time
+import weakref
+from email.utils import parsedate_to_datetime
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+# Status codes that mean "try again later" rather than "this request is wrong"
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+class TokenBucket:
+    """Token-bucket rate limiter; tokens can be reserved ahead, so waiters are served in order"""
+    def __init__(self, rate: Optional[float], burst: int = 1):
+        """
+        Initialize the bucket.
+        
+        Args:
+            rate: Tokens added per second, or None for no limit
+            burst: Maximum number of tokens that can accumulate
+        """
+        self.rate = rate
+        self.capacity = max(1, burst)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+    
+    def _refill(self):
+        now = time.monotonic()
+        if now > self.updated:
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+    
+    def wait_time(self) -> float:
+        """Seconds until a token is available, without taking it"""
+        if not self.rate:
+            return 0.0
+        self._refill()
+        return max(0.0, (1 - self.tokens) / self.rate)
+    
+    def drain(self, until: float):
+        """Empty the bucket and add no tokens before ``until`` (a time.monotonic() value)"""
+        self.tokens = min(self.tokens, 0.0)
+        self.updated = max(self.updated, until)
+    
+    def reserve(self) -> float:
+        """
+        Take a token.
+        
+        Returns:
+            Seconds to wait before using it
+        """
+        if not self.rate:
+            return 0.0
+        self._refill()
+        self.tokens -= 1
+        return max(0.0, -self.tokens / self.rate)
+
+class _HostState:
+    """Limits and counters for one host on one event loop"""
+    def __init__(self, max_concurrency: int, rate: Optional[float], burst: int):
+        self.max_concurrency = max(1, max_concurrency)
+        self.bucket = TokenBucket(rate, burst)
+        self.condition = asyncio.Condition()
+        self.active = 0
+        self.backoff_until = 0.0
+
+def host_of(url: str) -> str:
+    """Lowercased host name of a URL ("" if it has none)"""
+    return (urlsplit(url).hostname or "").lower()
+
+class HostScheduler:
+    """
+    Per-host concurrency caps, request rate limits and retry with backoff.
+    
+    ``slot(url)`` holds one of the host's concurrent retrieval slots, and
+    ``call(url, operation)`` runs one request at the host's rate, retrying
+    on 429 and 5xx responses with jittered exponential backoff (or the
+    server's Retry-After). While a host is backed off every request to it
+    waits, and ``ready``/``wait_ready`` let callers work on other hosts in
+    the meantime.
+    
+    asyncio primitives are bound to an event loop, so hosts are tracked per
+    loop (the web app runs each review in a fresh loop).
+    """
+    def __init__(self,
+                 max_per_host: int = 2,
+                 rate_per_host: Optional[float] = 2.0,
+                 burst: int = 4,
+                 max_retries: int = 3,
+                 backoff_base: float = 1.0,
+                 backoff_max: float = 60.0,
+                 host_limits: Optional[Dict[str, Dict[str, Any]]] = None):
+        """
+        Initialize the scheduler.
+        
+        Args:
+            max_per_host: Maximum number of concurrent retrievals per host
+            rate_per_host: Maximum requests per second per host, or None for no limit
+            burst: Number of requests a host may receive at once before the rate applies
+            max_retries: Number of retries after a 429 or 5xx response
+            backoff_base: Base delay in seconds for exponential backoff
+            backoff_max: Maximum backoff delay in seconds
+            host_limits: Overrides per host or parent domain, e.g.
+                ``{"arxiv.org": {"max_per_host": 1, "rate_per_host": 0.5}}``
+        """
+        self.max_per_host = max_per_host
+        self.rate_per_host = rate_per_host
+        self.burst = burst
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.host_limits = {host.lower(): limits for host, limits in (host_limits or {}).items()}
+        self.stats: Dict[str, Dict[str, float]] = {}
+        self._hosts: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, _HostState]]" = \
+            weakref.WeakKeyDictionary()
+    
+    def _limits(self, host: str) -> Dict[str, Any]:
+        """Limits for a host, from the most specific matching override"""
+        limits = {"max_per_host": self.max_per_host, "rate_per_host": self.rate_per_host, "burst": self.burst}
+        parts = host.split(".")
+        for i in range(len(parts) - 1, -1, -1):
+            limits.update(self.host_limits.get(".".join(parts[i:]), {}))
+        return limits
+    
+    def _state(self, url: str) -> _HostState:
+        host = host_of(url)
+        hosts = self._hosts.setdefault(asyncio.get_running_loop(), {})
+        if host not in hosts:
+            limits = self._limits(host)
+            hosts[host] = _HostState(limits["max_per_host"], limits["rate_per_host"], limits["burst"])
+        return hosts[host]
+    
+    @staticmethod
+    def _delay(state: _HostState) -> float:
+        """Seconds until the host is out of backoff and has a request token"""
+        return max(state.backoff_until - time.monotonic(), state.bucket.wait_time(), 0.0)
+    
+    def ready(self, url: str) -> bool:
+        """Whether a retrieval from the URL's host could start now"""
+        state = self._state(url)
+        return state.active < state.max_concurrency and self._delay(state) == 0
+    
+    async def wait_ready(self, url: str):
+        """Wait until a retrieval from the URL's host could start"""
+        state = self._state(url)
+        while True:
+            delay = self._delay(state)
+            if delay > 0:
+                await asyncio.sleep(delay)
+            elif state.active < state.max_concurrency:
+                return
+            else:
+                async with state.condition:
+                    await state.condition.wait_for(lambda: state.active < state.max_concurrency)
+    
+    @contextlib.asynccontextmanager
+    async def slot(self, url: str) -> AsyncIterator[None]:
+        """Hold one of the host's concurrent retrieval slots"""
+        state = self._state(url)
+        async with state.condition:
+            await state.condition.wait_for(lambda: state.active < state.max_concurrency)
+            state.active += 1
+        try:
+            yield
+        finally:
+            async with state.condition:
+                state.active -= 1
+                state.condition.notify_all()
+    
+    async def call(self, url: str, operation: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run a request to a URL's host at the host's rate, retrying on 429 and 5xx.
+        
+        Args:
+            url: URL the request goes to
+            operation: Callable returning a new awaitable for each attempt
+        
+        Returns:
+            The operation's result
+        
+        Raises:
+            httpx.HTTPStatusError: If the host still fails after ``max_retries`` retries
+        """
+        host = host_of(url)
+        state = self._state(url)
+        stats = self.stats.setdefault(host, {"requests": 0, "retries": 0, "wait_seconds": 0.0})
+        for attempt in range(self.max_retries + 1):
+            delay = max(state.backoff_until - time.monotonic(), state.bucket.reserve(), 0.0)
+            if delay > 0:
+                stats["wait_seconds"] += delay
+                await asyncio.sleep(delay)
+            stats["requests"] += 1
+            try:
+                return await operation()
+            except httpx.HTTPStatusError as e:
+                status = e.response.status_code
+                if status not in RETRY_STATUSES or attempt == self.max_retries:
+                    raise
+                backoff = self._backoff(attempt, e.response)
+                state.backoff_until = max(state.backoff_until, time.monotonic() + backoff)
+                # Resume at the steady rate rather than with a burst
+                state.bucket.drain(state.backoff_until)
+                stats["retries"] += 1
+                print(f"  ⏳ {host} answered HTTP {status}, backing off for {backoff:.1f}s")
+    
+    def _backoff(self, attempt: int, response: httpx.Response) -> float:
+        """Jittered exponential backoff, or the server's Retry-After if that is longer"""
+        cap = min(self.backoff_max, self.backoff_base * 2 ** attempt)
+        delay = random.uniform(cap / 2, cap)
+        retry_after = response.headers.get("retry-after")
+        if retry_after:
+            try:
+                seconds = float(retry_after)
+            except ValueError:
+                try:
+                    seconds = parsedate_to_datetime(retry_after).timestamp() - time.time()
+                except (TypeError, ValueError):
+                    seconds = 0.0
+            delay = max(delay, min(seconds, self.backoff_max))
+        return delay
@@ -0,0 +1,130 @@
+"""
+Lexical relevance scoring used to pre-filter papers before LLM assessment.
+"""
+
+import re
+from collections import Counter
+from functools import lru_cache
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+from literature_review.models import Paper
+
+STOPWORDS = frozenset("""
+a an and are as at be but by for from has have in into is it its of on or our
+that the their this to was we were which with using based via towards toward
+""".split())
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+_SUFFIXES = ("ations", "ation", "ating", "ated", "ings", "ing", "ness", "ities", "ity", "ies",
+             "ed", "al", "es", "s")
+
+@lru_cache(maxsize=65536)
+def stem(token: str) -> str:
+    """Strip a common English suffix so that e.g. 'ethics' and 'ethical' match"""
+    for suffix in _SUFFIXES:
+        if token.endswith(suffix) and len(token) - len(suffix) >= 3:
+            return token[:-len(suffix)]
+    return token
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase, split into words, drop stopwords and stem"""
+    return [stem(token) for token in _TOKEN_PATTERN.findall(text.lower()) if token not in STOPWORDS]
+
+def paper_text(paper: Paper) -> str:
+    """Text used for lexical matching: title, abstract and keywords"""
+    return " ".join([paper.title or "", paper.abstract or "", " ".join(paper.keywords or [])])
+
+def bm25_scores(query: str, documents: Sequence[str], k1: float = 1.5, b: float = 0.75) -> np.ndarray:
+    """
+    Score documents against a query with BM25, normalized to the range [0, 1].
+    
+    The candidate pool is usually small and already about the topic, so the
+    IDF is smoothed (``1 + ln((N + 1) / (df + 0.5))``) to keep terms shared by
+    every candidate from dropping to zero weight. Scores are divided by the
+    score of a document that contains every query term once at average length,
+    then clipped to 1.0, so a fixed cutoff roughly means "fraction of the
+    topic's terms matched" regardless of how long the topic is.
+    
+    Args:
+        query: Query text
+        documents: Document texts to score
+        k1: Term frequency saturation parameter
+        b: Document length normalization parameter
+        
+    Returns:
+        Array of normalized scores, one per document
+    """
+    query_terms = sorted(set(tokenize(query)))
+    if not documents or not query_terms:
+        return np.zeros(len(documents))
+    
+    term_index = {term: j for j, term in enumerate(query_terms)}
+    tf = np.zeros((len(documents), len(query_terms)))
+    doc_lengths = np.zeros(len(documents))
+    for i, document in enumerate(documents):
+        tokens = tokenize(document)
+        doc_lengths[i] = len(tokens)
+        for term, count in Counter(token for token in tokens if token in term_index).items():
+            tf[i, term_index[term]] = count
+    
+    n_docs = len(documents)
+    doc_freq = np.count_nonzero(tf, axis=0)
+    idf = 1.0 + np.log((n_docs + 1) / (doc_freq + 0.5))
+    
+    avg_length = doc_lengths.mean() or 1.0
+    length_norm = k1 * (1 - b + b * doc_lengths / avg_length)
+    weights = tf * (k1 + 1) / (tf + length_norm[:, None])
+    
+    return np.minimum((weights @ idf) / idf.sum(), 1.0)
+
+class LexicalPrefilter:
+    """
+    Cheap lexical stage that decides clear-cut papers before LLM scoring.
+    
+    Papers scoring below ``low_cutoff`` are rejected and papers scoring at or
+    above ``high_cutoff`` are accepted without an LLM call. Only papers in the
+    band between the two cutoffs are left for the LLM.
+    """
+    def __init__(self, low_cutoff: float = 0.1, high_cutoff: float = 0.9, accept_score: float = 0.9):
+        """
+        Initialize the prefilter.
+        
+        Args:
+            low_cutoff: Normalized BM25 score below which papers are rejected
+            high_cutoff: Normalized BM25 score at or above which papers are accepted
+            accept_score: Lowest relevance score given to accepted papers
+        """
+        if not 0.0 <= low_cutoff <= high_cutoff <= 1.0:
+            raise ValueError("Cutoffs must satisfy 0.0 <= low_cutoff <= high_cutoff <= 1.0")
+        self.low_cutoff = low_cutoff
+        self.high_cutoff = high_cutoff
+        self.accept_score = accept_score
+    
+    def score(self, papers: Sequence[Paper], topic: str) -> np.ndarray:
+        """Normalized BM25 scores of the papers against the topic"""
+        return bm25_scores(topic, [paper_text(paper) for paper in papers])
+    
+    def decide(self, papers: Sequence[Paper], topic: str) -> List[Optional[float]]:
+        """
+        Assign relevance scores to the papers the lexical stage can decide.
+        
+        Rejected papers keep their (low) lexical score, and accepted papers get a
+        score between ``accept_score`` and 1.0 that preserves their lexical order.
+        
+        Args:
+            papers: Papers to assess
+            topic: The research topic to assess relevance against
+            
+        Returns:
+            Relevance score per paper, or None where the LLM has to decide
+        """
+        lexical = self.score(papers, topic)
+        relevance = np.where(
+            lexical >= self.high_cutoff,
+            self.accept_score + (1.0 - self.accept_score) * lexical,
+            lexical,
+        )
+        decided = (lexical < self.low_cutoff) | (lexical >= self.high_cutoff)
+        return [float(score) if is_decided else None for score, is_decided in zip(relevance, decided)]
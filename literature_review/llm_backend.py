@@ -0,0 +1,100 @@
+"""
+Execution backends for agents that turn a text prompt into a text response.
+
+The browser backend runs the prompt as a browser_use Agent task, which is only
+needed when the task has to visit web pages. The direct backend sends the prompt
+straight to the language model with a single ``ainvoke`` call.
+"""
+
+from typing import Optional
+
+from browser_use import Agent
+
+from literature_review.browser_pool import BrowserPool, browser_session
+from literature_review.utils_browser import convert_agent_result_to_string
+
+class BrowserAgentBackend:
+    """Runs prompts as browser_use Agent tasks"""
+    name = "browser"
+    
+    def __init__(self, llm, browser_pool: Optional[BrowserPool] = None):
+        self.llm = llm
+        self.browser_pool = browser_pool
+    
+    async def run(self, task: str, max_steps: int = 3, max_actions_per_step: int = 2) -> str:
+        """
+        Run a task through a browser_use Agent loop.
+        
+        Args:
+            task: Prompt describing the task
+            max_steps: Maximum number of agent steps
+            max_actions_per_step: Maximum number of actions per agent step
+            
+        Returns:
+            The agent's result as a string
+        """
+        async with browser_session(self.browser_pool) as browser_kwargs:
+            agent = Agent(
+                task=task,
+                llm=self.llm,
+                max_actions_per_step=max_actions_per_step,
+                **browser_kwargs,
+            )
+            
+            result = await agent.run(max_steps=max_steps)
+        
+        # Convert result to string using our utility function
+        return convert_agent_result_to_string(result)
+
+class DirectLLMBackend:
+    """Sends prompts straight to the language model without an agent loop"""
+    name = "direct"
+    
+    def __init__(self, llm):
+        self.llm = llm
+    
+    async def run(self, task: str, max_steps: int = 3, max_actions_per_step: int = 2) -> str:
+        """
+        Run a task as a single LLM call.
+        
+        Args:
+            task: Prompt describing the task
+            max_steps: Ignored, kept for compatibility with BrowserAgentBackend
+            max_actions_per_step: Ignored, kept for compatibility with BrowserAgentBackend
+            
+        Returns:
+            The model's response text
+        """
+        response = await self.llm.ainvoke(task)
+        
+        content = getattr(response, "content", response)
+        if isinstance(content, list):
+            # Chat models may return a list of content blocks
+            return "\n".join(
+                block.get("text", "") if isinstance(block, dict) else str(block)
+                for block in content
+            )
+        return str(content)
+
+BACKENDS = {
+    BrowserAgentBackend.name: BrowserAgentBackend,
+    DirectLLMBackend.name: DirectLLMBackend,
+}
+
+def create_backend(llm, backend: str = "direct", browser_pool: Optional[BrowserPool] = None):
+    """
+    Create an execution backend by name.
+    
+    Args:
+        llm: Language model instance used by the backend
+        backend: Backend name, either "direct" or "browser"
+        browser_pool: Optional pool of browsers for the browser backend
+        
+    Returns:
+        Backend instance with an async ``run(task, max_steps, max_actions_per_step)`` method
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend '{backend}', expected one of: {', '.join(BACKENDS)}")
+    if backend == BrowserAgentBackend.name:
+        return BrowserAgentBackend(llm, browser_pool=browser_pool)
+    return BACKENDS[backend](llm)
@@ -0,0 +1,464 @@
+"""
+Offline paper search over a local metadata corpus with an on-disk BM25 inverted index.
+
+The index is built from JSONL dumps such as the arXiv metadata snapshot or
+Semantic Scholar bulk exports. It is stored as a directory of immutable
+segments; adding records writes new segments, so an index can grow without
+being rebuilt. Each segment's sorted term table and postings are saved as
+flat files and memory-mapped when the index is opened, so opening an index
+reads almost nothing and a query only touches the pages of its own terms.
+
+Usage:
+    python -m literature_review.local_index build INDEX_DIR corpus.jsonl [more.jsonl ...]
+    python -m literature_review.local_index query INDEX_DIR "topic" [--k 15]
+"""
+
+import argparse
+import json
+import math
+import mmap
+import os
+import re
+import shutil
+import tempfile
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from literature_review.models import Paper
+from literature_review.lexical import tokenize
+
+MANIFEST = "index.json"
+INDEX_VERSION = 2
+
+_YEAR_PATTERN = re.compile(r"\s*(\d{4})")
+
+def parse_year(value: Any) -> Optional[int]:
+    """Year from a value such as 2021, "2021", "2021a" or "2021-05-04", or None"""
+    match = _YEAR_PATTERN.match(str(value or ""))
+    return int(match.group(1)) if match else None
+
+def record_to_paper_data(record: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Normalize a corpus record into Paper fields.
+    
+    Understands the arXiv metadata snapshot (``id``, ``authors_parsed``,
+    ``journal-ref``, ``doi``) and Semantic Scholar records (``authors`` as
+    objects, ``externalIds``, ``paperAbstract``) as well as plain records
+    with Paper's own field names.
+    
+    Args:
+        record: One parsed JSONL record
+    
+    Returns:
+        Dictionary of Paper fields, or None if the record has no title
+    """
+    title = " ".join(str(record.get("title") or "").split())
+    if not title:
+        return None
+    
+    authors = record.get("authors") or []
+    if record.get("authors_parsed"):
+        authors = [" ".join(part for part in (name[1], name[0]) if part).strip()
+                   for name in record["authors_parsed"]]
+    elif isinstance(authors, str):
+        authors = [name.strip() for name in re.split(r',|\band\b', authors) if name.strip()]
+    else:
+        authors = [author.get("name", "") if isinstance(author, dict) else str(author) for author in authors]
+    
+    external_ids = record.get("externalIds") or {}
+    doi = record.get("doi") or external_ids.get("DOI")
+    arxiv_id = external_ids.get("ArXiv") or (record.get("id") if "authors_parsed" in record else None)
+    url = record.get("url") or ""
+    if not url and doi:
+        url = f"https://doi.org/{doi}"
+    elif not url and arxiv_id:
+        url = f"https://arxiv.org/abs/{arxiv_id}"
+    
+    year = parse_year(record.get("year")) or parse_year(record.get("update_date") or record.get("publicationDate"))
+    
+    return {
+        "title": title,
+        "authors": [author for author in authors if author],
+        "abstract": " ".join(str(record.get("abstract") or record.get("paperAbstract") or "").split()),
+        "url": url,
+        "year": year,
+        "venue": record.get("venue") or record.get("journal-ref") or record.get("journal") or None,
+    }
+
+def read_jsonl(path: str) -> Iterator[Dict[str, Any]]:
+    """Yield the records of a JSONL file, skipping blank and malformed lines"""
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                continue
+
+def _mmap_file(path: Path):
+    """Open a file and memory-map it read-only (None for an empty file), returning both"""
+    file = open(path, "rb")
+    size = os.fstat(file.fileno()).st_size
+    return file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) if size else None
+
+class IndexSegment:
+    """
+    One immutable, memory-mapped segment of a LocalCorpusIndex.
+    
+    The lexicon is a sorted term table: ``terms.bin`` holds the UTF-8 terms
+    back to back, ``term_offsets.npy`` their byte offsets and
+    ``term_starts.npy`` the offset of each term's postings (a term's document
+    frequency is the gap to the next term's start). Terms are found by binary
+    search over the memory-mapped table, so the lexicon is never loaded.
+    """
+    def __init__(self, path: Path):
+        self.path = path
+        self._terms_file, self._terms = _mmap_file(path / "terms.bin")
+        self.term_offsets = np.load(path / "term_offsets.npy", mmap_mode="r")
+        self.term_starts = np.load(path / "term_starts.npy", mmap_mode="r")
+        self.num_terms = len(self.term_offsets) - 1
+        self.postings_docs = np.load(path / "postings_docs.npy", mmap_mode="r")
+        self.postings_tfs = np.load(path / "postings_tfs.npy", mmap_mode="r")
+        self.doc_lengths = np.load(path / "doc_lengths.npy", mmap_mode="r")
+        self.doc_offsets = np.load(path / "doc_offsets.npy", mmap_mode="r")
+        self.num_docs = len(self.doc_lengths)
+        self._docs_file, self._docs = _mmap_file(path / "docs.jsonl")
+    
+    def _term_index(self, term: str) -> Optional[int]:
+        """Position of a term in the sorted term table, or None if absent"""
+        key = term.encode("utf-8")
+        low, high = 0, self.num_terms
+        while low < high:
+            middle = (low + high) // 2
+            current = self._terms[int(self.term_offsets[middle]):int(self.term_offsets[middle + 1])]
+            if current < key:
+                low = middle + 1
+            elif current > key:
+                high = middle
+            else:
+                return middle
+        return None
+    
+    def postings_range(self, term: str) -> Tuple[int, int]:
+        """Start of a term's postings and its document frequency ((0, 0) if absent)"""
+        index = self._term_index(term)
+        if index is None:
+            return 0, 0
+        start, end = int(self.term_starts[index]), int(self.term_starts[index + 1])
+        return start, end - start
+    
+    def postings(self, term: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Document ids and term frequencies of a term (empty arrays if absent)"""
+        start, df = self.postings_range(term)
+        return self.postings_docs[start:start + df], self.postings_tfs[start:start + df]
+    
+    def document(self, doc_id: int) -> Dict[str, Any]:
+        """Stored Paper fields of a document"""
+        start, end = int(self.doc_offsets[doc_id]), int(self.doc_offsets[doc_id + 1])
+        return json.loads(self._docs[start:end])
+    
+    def close(self):
+        for mapped, file in ((self._terms, self._terms_file), (self._docs, self._docs_file)):
+            if mapped is not None:
+                mapped.close()
+            file.close()
+    
+    @staticmethod
+    def write(path: Path, documents: List[Dict[str, Any]]):
+        """
+        Build a segment directory from normalized documents.
+        
+        Args:
+            path: Directory to write the segment files to
+            documents: Paper field dictionaries, as returned by record_to_paper_data
+        """
+        path.mkdir(parents=True, exist_ok=True)
+        term_docs: Dict[str, List[int]] = {}
+        term_tfs: Dict[str, List[int]] = {}
+        doc_lengths = np.zeros(len(documents), dtype=np.uint32)
+        doc_offsets = np.zeros(len(documents) + 1, dtype=np.uint64)
+        
+        with open(path / "docs.jsonl", "wb") as docs_file:
+            for doc_id, document in enumerate(documents):
+                counts = Counter(tokenize(f"{document['title']} {document['abstract']}"))
+                doc_lengths[doc_id] = sum(counts.values())
+                for term, tf in counts.items():
+                    term_docs.setdefault(term, []).append(doc_id)
+                    term_tfs.setdefault(term, []).append(min(tf, 65535))
+                
+                line = json.dumps(document, ensure_ascii=False).encode("utf-8") + b"\n"
+                docs_file.write(line)
+                doc_offsets[doc_id + 1] = doc_offsets[doc_id] + len(line)
+        
+        # Python's string order is the UTF-8 byte order used by the binary search
+        terms = sorted(term_docs)
+        term_offsets = np.zeros(len(terms) + 1, dtype=np.uint64)
+        term_starts = np.zeros(len(terms) + 1, dtype=np.uint64)
+        postings_docs = np.zeros(sum(len(docs) for docs in term_docs.values()), dtype=np.uint32)
+        postings_tfs = np.zeros(len(postings_docs), dtype=np.uint16)
+        offset = 0
+        with open(path / "terms.bin", "wb") as terms_file:
+            for i, term in enumerate(terms):
+                encoded = term.encode("utf-8")
+                terms_file.write(encoded)
+                term_offsets[i + 1] = term_offsets[i] + len(encoded)
+                df = len(term_docs[term])
+                postings_docs[offset:offset + df] = term_docs[term]
+                postings_tfs[offset:offset + df] = term_tfs[term]
+                offset += df
+                term_starts[i + 1] = offset
+        
+        np.save(path / "term_offsets.npy", term_offsets)
+        np.save(path / "term_starts.npy", term_starts)
+        np.save(path / "postings_docs.npy", postings_docs)
+        np.save(path / "postings_tfs.npy", postings_tfs)
+        np.save(path / "doc_lengths.npy", doc_lengths)
+        np.save(path / "doc_offsets.npy", doc_offsets)
+
+class LocalCorpusIndex:
+    """
+    Persistent BM25 inverted index over a local corpus of paper metadata.
+    
+    Titles and abstracts are tokenized with the same stemming tokenizer as
+    the lexical prefilter. Each segment holds up to ``segment_size``
+    documents; queries score every segment with a dense NumPy accumulator
+    over the query terms' postings and merge the per-segment top k.
+    """
+    def __init__(self,
+                 index_dir: str,
+                 segment_size: int = 100_000,
+                 k1: float = 1.2,
+                 b: float = 0.75,
+                 create: bool = False):
+        """
+        Open an index directory.
+        
+        Args:
+            index_dir: Directory holding the index
+            segment_size: Maximum number of documents per new segment
+            k1: BM25 term frequency saturation parameter
+            b: BM25 document length normalization parameter
+            create: Whether a missing directory starts an empty index, to be
+                created when records are first added
+        
+        Raises:
+            FileNotFoundError: If ``index_dir`` does not exist and ``create`` is False
+        """
+        self.index_dir = Path(index_dir)
+        if not create and not self.index_dir.is_dir():
+            raise FileNotFoundError(f"No local corpus index at {self.index_dir}; build one with "
+                                    f"'python -m literature_review.local_index build {self.index_dir} CORPUS.jsonl'")
+        self.segment_size = segment_size
+        self.k1 = k1
+        self.b = b
+        self.segments: List[IndexSegment] = []
+        self.total_length = 0
+        self._load()
+    
+    @property
+    def num_docs(self) -> int:
+        return sum(segment.num_docs for segment in self.segments)
+    
+    def _load(self):
+        """(Re)open the segments listed in the manifest"""
+        self.close()
+        manifest_path = self.index_dir / MANIFEST
+        if not manifest_path.exists():
+            return
+        with open(manifest_path, encoding="utf-8") as f:
+            manifest = json.load(f)
+        if manifest.get("version") != INDEX_VERSION:
+            raise ValueError(f"Unsupported index version {manifest.get('version')} in {self.index_dir}; "
+                             f"rebuild the index")
+        self.segments = [IndexSegment(self.index_dir / entry["name"]) for entry in manifest["segments"]]
+        self.total_length = sum(entry["total_length"] for entry in manifest["segments"])
+    
+    def _write_manifest(self, entries: List[Dict[str, Any]]):
+        tmp_path = self.index_dir / f"{MANIFEST}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": INDEX_VERSION, "segments": entries}, f, indent=2)
+        os.replace(tmp_path, self.index_dir / MANIFEST)
+    
+    def add_records(self, records: Iterable[Dict[str, Any]]) -> int:
+        """
+        Index corpus records into new segments.
+        
+        Args:
+            records: Raw corpus records; records without a title are skipped
+        
+        Returns:
+            Number of documents added
+        """
+        self.index_dir.mkdir(parents=True, exist_ok=True)
+        manifest_path = self.index_dir / MANIFEST
+        entries = []
+        if manifest_path.exists():
+            with open(manifest_path, encoding="utf-8") as f:
+                entries = json.load(f)["segments"]
+        
+        added = 0
+        batch: List[Dict[str, Any]] = []
+        
+        def flush():
+            # Build the segment under a temporary name and rename it into place, so an
+            # interrupted build leaves no half-written segment under a real name
+            name = self._new_segment_name(len(entries))
+            tmp_path = Path(tempfile.mkdtemp(dir=self.index_dir, prefix=".segment-", suffix=".tmp"))
+            try:
+                IndexSegment.write(tmp_path, batch)
+                os.rename(tmp_path, self.index_dir / name)
+            except BaseException:
+                shutil.rmtree(tmp_path, ignore_errors=True)
+                raise
+            lengths = np.load(self.index_dir / name / "doc_lengths.npy")
+            entries.append({"name": name, "docs": len(batch), "total_length": int(lengths.sum())})
+            # Publish each segment as soon as it is complete
+            self._write_manifest(entries)
+            batch.clear()
+        
+        for record in records:
+            document = record_to_paper_data(record)
+            if document is None:
+                continue
+            batch.append(document)
+            added += 1
+            if len(batch) >= self.segment_size:
+                flush()
+        if batch:
+            flush()
+        
+        self._load()
+        return added
+    
+    def _new_segment_name(self, number: int) -> str:
+        """First unused segment name from ``number`` on (a crash may leave an unlisted segment)"""
+        while (self.index_dir / f"segment-{number:05d}").exists():
+            number += 1
+        return f"segment-{number:05d}"
+    
+    def add_jsonl(self, path: str) -> int:
+        """Index every record of a JSONL file; returns the number of documents added"""
+        return self.add_records(read_jsonl(path))
+    
+    def search(self, query: str, k: int = 15) -> List[Tuple[float, Dict[str, Any]]]:
+        """
+        Rank documents against a query with BM25.
+        
+        Args:
+            query: Query text, e.g. a research topic
+            k: Number of results to return
+        
+        Returns:
+            Up to ``k`` (score, Paper fields) pairs, best first
+        """
+        terms = sorted(set(tokenize(query)))
+        num_docs = self.num_docs
+        if not terms or not num_docs or k <= 0:
+            return []
+        avg_length = self.total_length / num_docs
+        
+        idf = {}
+        for term in terms:
+            df = sum(segment.postings_range(term)[1] for segment in self.segments)
+            if df:
+                idf[term] = math.log(1 + (num_docs - df + 0.5) / (df + 0.5))
+        
+        candidates = []
+        for segment in self.segments:
+            scores = None
+            for term, term_idf in idf.items():
+                doc_ids, tfs = segment.postings(term)
+                if not len(doc_ids):
+                    continue
+                if scores is None:
+                    scores = np.zeros(segment.num_docs, dtype=np.float32)
+                tfs = tfs.astype(np.float32)
+                norm = self.k1 * (1 - self.b + self.b * segment.doc_lengths[doc_ids] / avg_length)
+                scores[doc_ids] += term_idf * tfs * (self.k1 + 1) / (tfs + norm)
+            if scores is None:
+                continue
+            
+            top = min(k, segment.num_docs)
+            best = np.argpartition(-scores, top - 1)[:top]
+            candidates.extend((float(scores[doc_id]), segment, int(doc_id))
+                              for doc_id in best if scores[doc_id] > 0)
+        
+        candidates.sort(key=lambda candidate: -candidate[0])
+        return [(score, segment.document(doc_id)) for score, segment, doc_id in candidates[:k]]
+    
+    def close(self):
+        """Close the memory-mapped segments"""
+        for segment in self.segments:
+            segment.close()
+        self.segments = []
+
+class LocalCorpusSource:
+    """SearchAgent source that searches a LocalCorpusIndex instead of the web"""
+    def __init__(self, index: LocalCorpusIndex, name: str = "Local corpus", timeout: Optional[float] = None):
+        """
+        Initialize the source.
+        
+        Args:
+            index: Index to search
+            name: Display name of the source
+            timeout: Seconds allowed for one search, or None to use the SearchAgent's default
+        """
+        self.index = index
+        self.name = name
+        self.timeout = timeout
+    
+    @property
+    def fingerprint(self) -> str:
+        """Description of the index searched, for cache keys; changes when documents are added"""
+        return f"{self.name} ({self.index.index_dir.resolve()}, {self.index.num_docs} documents)"
+    
+    async def search(self, topic: str, max_papers: int = 15) -> List[Paper]:
+        """
+        Search the index for papers on a topic.
+        
+        Args:
+            topic: The research topic to search for
+            max_papers: Maximum number of papers to return
+        
+        Returns:
+            List of Paper objects, best match first
+        """
+        return [Paper(**document) for _, document in self.index.search(topic, max_papers)]
+
+def main():
+    parser = argparse.ArgumentParser(description="Build or query a local corpus search index")
+    commands = parser.add_subparsers(dest="command", required=True)
+    build = commands.add_parser("build", help="add JSONL corpus files to an index")
+    build.add_argument("index_dir")
+    build.add_argument("corpus", nargs="+", help="JSONL files with one paper record per line")
+    build.add_argument("--segment-size", type=int, default=100_000)
+    query = commands.add_parser("query", help="search an index")
+    query.add_argument("index_dir")
+    query.add_argument("topic")
+    query.add_argument("--k", type=int, default=15)
+    args = parser.parse_args()
+    
+    if args.command == "build":
+        index = LocalCorpusIndex(args.index_dir, segment_size=args.segment_size, create=True)
+        for path in args.corpus:
+            start = time.perf_counter()
+            added = index.add_jsonl(path)
+            print(f"📚 Indexed {added} records from {path} in {time.perf_counter() - start:.1f}s")
+        print(f"✅ Index holds {index.num_docs} documents in {len(index.segments)} segments")
+    else:
+        index = LocalCorpusIndex(args.index_dir)
+        start = time.perf_counter()
+        results = index.search(args.topic, args.k)
+        print(f"🔍 {len(results)} results in {(time.perf_counter() - start) * 1000:.1f} ms")
+        for score, document in results:
+            print(f"  {score:6.2f}  {document['title']} ({document.get('year') or 'n.d.'})")
+    index.close()
+
+if __name__ == "__main__":
+    main()
@@ -21,7 +21,8 @@ class MockLiteratureReviewOrchestrator:
                        max_full_text_papers: int = 10,
                        relevance_threshold: float = 0.7,
                        save_results: bool = True,
-                       output_dir: str = 'output') -> Dict[str, Any]:
+                       output_dir: str = 'output',
+                       max_concurrency: int = 3) -> Dict[str, Any]:
         """
         Run a mock literature review process with predefined results.
         
@@ -32,6 +33,7 @@ class MockLiteratureReviewOrchestrator:
             relevance_threshold: Minimum relevance score (0.0-1.0) to keep a paper (ignored in mock)
             save_results: Whether to save results to files
             output_dir: Directory to save output files
+            max_concurrency: Maximum number of papers in flight per pipeline stage (ignored in mock)
             
         Returns:
             Dictionary with papers and literature review
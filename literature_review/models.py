@@ -2,34 +2,255 @@
 Data models for the literature review system.
 """
 
+import hashlib
+import re
+import sys
 from typing import List, Dict, Any, Optional
-from dataclasses import dataclass, field
 
-@dataclass
+DOI_PATTERN = re.compile(r'\b(10\.\d{4,9}/[^\s?#"<>]+)', re.IGNORECASE)
+ARXIV_PATTERN = re.compile(r'arxiv\.org/(?:abs|pdf)/([a-z\-]+/\d{7}|\d{4}\.\d{4,5})', re.IGNORECASE)
+ARXIV_DOI_PREFIX = "10.48550/arxiv."
+ARXIV_VERSION_PATTERN = re.compile(r'v\d+$')
+
+def normalize_title(title: str) -> str:
+    """Lowercase a title and reduce it to space-separated alphanumeric words"""
+    return " ".join(re.findall(r"[a-z0-9]+", (title or "").lower()))
+
+def scholarly_id(url: str) -> Optional[str]:
+    """
+    DOI or arXiv identifier found in a URL.
+    
+    arXiv DOIs (10.48550/arXiv.*) and version suffixes are normalized so that
+    every link to the same preprint gives the same identifier.
+    
+    Args:
+        url: URL of a paper
+    
+    Returns:
+        Identifier such as "doi:10.1000/xyz" or "arxiv:2101.00001", or None
+    """
+    doi_match = DOI_PATTERN.search(url or "")
+    if doi_match:
+        doi = doi_match.group(1).rstrip('.').lower()
+        if doi.startswith(ARXIV_DOI_PREFIX):
+            return f"arxiv:{ARXIV_VERSION_PATTERN.sub('', doi[len(ARXIV_DOI_PREFIX):])}"
+        return f"doi:{doi}"
+    
+    arxiv_match = ARXIV_PATTERN.search(url or "")
+    if arxiv_match:
+        return f"arxiv:{arxiv_match.group(1).lower()}"
+    return None
+
+def url_id(url: str) -> Optional[str]:
+    """Identifier of a URL without its scheme, "www." and trailing slash, or None if it is empty"""
+    normalized = re.sub(r'^https?://(www\.)?', '', (url or "").strip().lower()).rstrip('/')
+    return f"url:{normalized}" if normalized else None
+
+def title_id(title: str) -> Optional[str]:
+    """Identifier hashed from a normalized title, or None if the title has no words"""
+    normalized = normalize_title(title)
+    if not normalized:
+        return None
+    return f"title:{hashlib.blake2b(normalized.encode('utf-8'), digest_size=8).hexdigest()}"
+
+def make_paper_id(url: str, title: str) -> str:
+    """
+    Stable identifier of a paper.
+    
+    Uses, in order of preference, a DOI or arXiv ID found in the URL, the
+    normalized URL, or a hash of the normalized title. Deduplication and the
+    relevance cache both key on it.
+    
+    Args:
+        url: URL of the paper
+        title: Title of the paper
+    
+    Returns:
+        Identifier such as "doi:10.1000/xyz", "arxiv:2101.00001", "url:example.com/paper"
+        or "title:3f2a..." ("title:" alone if the paper has neither URL nor title)
+    """
+    return scholarly_id(url) or url_id(url) or title_id(title) or "title:"
+
+def _intern_all(values, in_place: bool = False) -> List[str]:
+    if not values:
+        return []
+    if isinstance(values, str):
+        # A single name, e.g. an LLM answer giving "authors" as one string
+        return [sys.intern(values)]
+    try:
+        if in_place and type(values) is list:
+            # Reusing the list saves an allocation per field, which adds up to
+            # garbage collection passes when loading many papers
+            values[:] = map(sys.intern, values)
+            return values
+        return list(map(sys.intern, values))
+    except TypeError:
+        return [sys.intern(value) if type(value) is str else value for value in values]
+
 class Paper:
-    """Data class representing an academic paper with all its metadata."""
-    title: str
-    authors: List[str]
-    abstract: str
-    url: str
-    year: Optional[int] = None
-    venue: Optional[str] = None
-    citations: Optional[int] = None
-    keywords: List[str] = field(default_factory=list)
-    full_text: Optional[str] = None
-    relevance_score: float = 0.0
-    
-    def to_dict(self) -> Dict[str, Any]:
-        """Convert paper object to dictionary for serialization."""
-        return {
+    """
+    An academic paper with all its metadata.
+    
+    Instances use ``__slots__`` instead of a per-instance dict, and author,
+    venue and keyword strings are interned, so large candidate pools share
+    one copy of each name. ``paper_id`` is derived from the DOI, arXiv ID,
+    URL or normalized title (see ``make_paper_id``) on first access rather
+    than on construction, and is cached from then on, so it stays the same
+    when metadata is merged in later and caches and deduplication can key on
+    it.
+    
+    ``full_text`` is either held in memory or, once moved to a text store with
+    ``store_full_text``, kept on disk as ``full_text_ref`` and loaded on each
+    access.
+    """
+    __slots__ = ("title", "authors", "abstract", "url", "year", "_venue", "citations", "keywords",
+                 "relevance_score", "full_text_ref", "_paper_id", "_full_text", "_text_store")
+    
+    # Serialized fields, in to_dict order
+    FIELDS = ("paper_id", "title", "authors", "abstract", "url", "year", "venue", "citations", "keywords",
+              "full_text_ref", "relevance_score", "full_text")
+    
+    def __init__(self,
+                 title: str,
+                 authors: List[str],
+                 abstract: str,
+                 url: str,
+                 year: Optional[int] = None,
+                 venue: Optional[str] = None,
+                 citations: Optional[int] = None,
+                 keywords: Optional[List[str]] = None,
+                 full_text: Optional[str] = None,
+                 relevance_score: float = 0.0,
+                 full_text_ref: Optional[str] = None,
+                 paper_id: Optional[str] = None):
+        self.title = title
+        self.authors = _intern_all(authors)
+        self.abstract = abstract
+        self.url = url
+        self.year = year
+        self.venue = venue
+        self.citations = citations
+        self.keywords = _intern_all(keywords)
+        self._full_text = full_text
+        self._text_store = None
+        self.relevance_score = relevance_score
+        self.full_text_ref = full_text_ref
+        self._paper_id = paper_id or None
+    
+    @property
+    def paper_id(self) -> str:
+        if self._paper_id is None:
+            self._paper_id = make_paper_id(self.url, self.title)
+        return self._paper_id
+    
+    @paper_id.setter
+    def paper_id(self, paper_id: Optional[str]):
+        self._paper_id = paper_id or None
+    
+    @property
+    def venue(self) -> Optional[str]:
+        return self._venue
+    
+    @venue.setter
+    def venue(self, venue: Optional[str]):
+        self._venue = sys.intern(venue) if type(venue) is str else venue
+    
+    @property
+    def full_text(self) -> Optional[str]:
+        if self._full_text is not None or self.full_text_ref is None or self._text_store is None:
+            return self._full_text
+        return self._text_store.get(self.full_text_ref)
+    
+    @full_text.setter
+    def full_text(self, text: Optional[str]):
+        self._full_text = text
+        self.full_text_ref = None
+    
+    def store_full_text(self, text_store):
+        """
+        Move the full text to a text store, keeping only its reference in memory.
+        
+        Args:
+            text_store: TextStore to write the text to and load it from
+        """
+        self._text_store = text_store
+        if self._full_text is not None:
+            self.full_text_ref = text_store.put(self._full_text)
+            self._full_text = None
+    
+    def use_text_store(self, text_store):
+        """Load ``full_text_ref`` from this text store (e.g. for papers read back from JSON)"""
+        self._text_store = text_store
+    
+    def to_dict(self, include_full_text: bool = True) -> Dict[str, Any]:
+        """
+        Convert paper object to dictionary for serialization.
+        
+        Full texts moved to a text store are referenced by ``full_text_ref``
+        rather than inlined.
+        
+        Args:
+            include_full_text: Whether to include a full text held in memory
+        """
+        data = {
+            "paper_id": self.paper_id,
             "title": self.title,
             "authors": self.authors,
             "abstract": self.abstract,
             "url": self.url,
             "year": self.year,
-            "venue": self.venue,
+            "venue": self._venue,
             "citations": self.citations,
             "keywords": self.keywords,
-            "full_text": self.full_text,
+            "full_text_ref": self.full_text_ref,
             "relevance_score": self.relevance_score
         }
+        if include_full_text:
+            data["full_text"] = self._full_text
+        return data
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], text_store=None) -> "Paper":
+        """
+        Create a paper from a dictionary written by ``to_dict``, ignoring unknown keys.
+        
+        The author and keyword lists of ``data`` are taken over, with their
+        strings interned in place, rather than copied.
+        
+        Args:
+            data: Paper fields; missing ones get their defaults
+            text_store: TextStore holding the text referenced by ``full_text_ref``
+        
+        Returns:
+            Paper object
+        """
+        paper = cls.__new__(cls)
+        paper.title = data.get("title") or ""
+        paper.authors = _intern_all(data.get("authors"), in_place=True)
+        paper.abstract = data.get("abstract") or ""
+        paper.url = data.get("url") or ""
+        paper.year = data.get("year")
+        paper.venue = data.get("venue")
+        paper.citations = data.get("citations")
+        paper.keywords = _intern_all(data.get("keywords"), in_place=True)
+        paper._full_text = data.get("full_text")
+        paper._text_store = text_store
+        paper.relevance_score = data.get("relevance_score", 0.0)
+        paper.full_text_ref = data.get("full_text_ref")
+        paper._paper_id = data.get("paper_id") or None
+        return paper
+    
+    def _values(self) -> tuple:
+        return (self.paper_id, self.title, self.authors, self.abstract, self.url, self.year, self._venue,
+                self.citations, self.keywords, self.full_text_ref, self.relevance_score, self._full_text)
+    
+    def __eq__(self, other) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return self._values() == other._values()
+    
+    __hash__ = None
+    
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{name}={value!r}" for name, value in zip(self.FIELDS, self._values()))
+        return f"Paper({fields})"
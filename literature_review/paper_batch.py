@@ -0,0 +1,217 @@
+"""
+Columnar batches of papers for vectorized ranking, filtering and top-k selection.
+"""
+
+import datetime
+import math
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from literature_review.models import Paper
+
+@dataclass
+class RankingWeights:
+    """
+    Weights of the signals mixed into a paper's ranking score.
+    
+    Each signal is scaled to 0-1 and the score is their weighted mean. The
+    defaults rank by relevance alone.
+    
+    Attributes:
+        relevance: Weight of the relevance score
+        citations: Weight of the citation count, on a log scale that reaches 1
+            at ``citation_saturation`` citations
+        recency: Weight of recency, halving every ``recency_half_life`` years
+        venue: Weight of the venue's score in ``venue_scores``
+        citation_saturation: Citation count that gets the full citation signal
+        recency_half_life: Years after which the recency signal halves
+        venue_scores: Score (0-1) of each venue, matched case-insensitively;
+            other venues score 0
+        current_year: Year recency is measured from (defaults to this year)
+    """
+    relevance: float = 1.0
+    citations: float = 0.0
+    recency: float = 0.0
+    venue: float = 0.0
+    citation_saturation: float = 1000.0
+    recency_half_life: float = 5.0
+    venue_scores: Dict[str, float] = field(default_factory=dict)
+    current_year: Optional[int] = None
+
+def _number(value) -> float:
+    """A numeric field as a float, or NaN if it is missing or not a number"""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return math.nan
+
+def _column(values: List) -> np.ndarray:
+    """Numeric field values as a float64 column, with NaN for missing or malformed values"""
+    try:
+        # Converts the whole column at C speed; None becomes NaN
+        return np.array(values, dtype=np.float64)
+    except (TypeError, ValueError):
+        return np.fromiter(map(_number, values), np.float64, len(values))
+
+class PaperBatch:
+    """
+    Papers held as NumPy columns, so scoring and selection over large
+    candidate pools need no Python loop per paper.
+    
+    Columns are ``relevance_score``, ``year`` and ``citations`` (float64, NaN
+    where unknown), ``venue_codes`` (int32 indices into ``venues``, -1 where
+    unknown) and ``positions`` (int64, the papers' input order, used to break
+    ties). ``papers`` keeps the Paper objects themselves, so a batch converts
+    back to papers without copying their text.
+    """
+    def __init__(self,
+                 papers: np.ndarray,
+                 relevance_score: np.ndarray,
+                 year: np.ndarray,
+                 citations: np.ndarray,
+                 venue_codes: np.ndarray,
+                 venues: List[str],
+                 positions: np.ndarray):
+        self.papers = papers
+        self.relevance_score = relevance_score
+        self.year = year
+        self.citations = citations
+        self.venue_codes = venue_codes
+        self.venues = venues
+        self.positions = positions
+    
+    @classmethod
+    def from_papers(cls, papers: Sequence[Paper], positions: Optional[Sequence[int]] = None) -> "PaperBatch":
+        """
+        Build a batch from Paper objects.
+        
+        Args:
+            papers: Papers to hold
+            positions: Order of each paper for breaking ties (defaults to list order)
+        
+        Returns:
+            PaperBatch with one row per paper
+        """
+        count = len(papers)
+        # fromiter stores the objects as they are; np.array would probe each one as a sequence
+        objects = np.fromiter(papers, dtype=object, count=count)
+        venue_index: Dict[str, int] = {}
+        codes = [venue_index.setdefault(venue, len(venue_index)) if venue else -1
+                 for venue in [paper.venue for paper in papers]]
+        return cls(
+            papers=objects,
+            relevance_score=_column([paper.relevance_score for paper in papers]),
+            year=_column([paper.year for paper in papers]),
+            citations=_column([paper.citations for paper in papers]),
+            venue_codes=np.array(codes, dtype=np.int32),
+            venues=list(venue_index),
+            positions=np.arange(count) if positions is None else np.asarray(positions, dtype=np.int64),
+        )
+    
+    def __len__(self) -> int:
+        return len(self.papers)
+    
+    def __getitem__(self, index) -> "PaperBatch":
+        """Rows selected by a boolean mask, index array or slice, in that order"""
+        return PaperBatch(
+            papers=self.papers[index],
+            relevance_score=self.relevance_score[index],
+            year=self.year[index],
+            citations=self.citations[index],
+            venue_codes=self.venue_codes[index],
+            venues=self.venues,
+            positions=self.positions[index],
+        )
+    
+    def to_papers(self) -> List[Paper]:
+        """
+        The batch's Paper objects in row order, with their relevance scores
+        updated from the ``relevance_score`` column.
+        """
+        papers = self.papers.tolist()
+        for paper, relevance_score in zip(papers, self.relevance_score.tolist()):
+            paper.relevance_score = relevance_score
+        return papers
+    
+    def scores(self, weights: Optional[RankingWeights] = None) -> np.ndarray:
+        """
+        Weighted ranking score of every paper.
+        
+        Args:
+            weights: Signal weights (defaults to relevance alone)
+        
+        Returns:
+            Array of scores between 0 and 1, one per paper
+        """
+        weights = weights or RankingWeights()
+        total = np.zeros(len(self))
+        weight_sum = 0.0
+        if weights.relevance:
+            total += weights.relevance * np.nan_to_num(np.clip(self.relevance_score, 0.0, 1.0))
+            weight_sum += weights.relevance
+        if weights.citations:
+            citations = np.nan_to_num(np.maximum(self.citations, 0.0))
+            signal = np.log1p(citations) / math.log1p(max(weights.citation_saturation, 1.0))
+            total += weights.citations * np.minimum(signal, 1.0)
+            weight_sum += weights.citations
+        if weights.recency:
+            current_year = weights.current_year or datetime.date.today().year
+            age = np.maximum(current_year - self.year, 0.0)
+            total += weights.recency * np.nan_to_num(0.5 ** (age / weights.recency_half_life))
+            weight_sum += weights.recency
+        if weights.venue:
+            venue_scores = {venue.lower(): score for venue, score in weights.venue_scores.items()}
+            lookup = np.array([venue_scores.get(venue.lower(), 0.0) for venue in self.venues] + [0.0])
+            # Unknown venues (code -1) index the trailing 0
+            total += weights.venue * lookup[self.venue_codes]
+            weight_sum += weights.venue
+        return total / weight_sum if weight_sum else total
+    
+    def mask(self, relevance_threshold: float) -> np.ndarray:
+        """Boolean mask of the papers whose relevance score reaches the threshold"""
+        return self.relevance_score >= relevance_threshold
+    
+    def top_k(self, scores: np.ndarray, k: Optional[int] = None) -> np.ndarray:
+        """
+        Indices of the ``k`` best-scoring papers, best first.
+        
+        ``argpartition`` finds the k-th best score without sorting the whole
+        batch; only the papers reaching it are sorted, breaking ties by
+        position.
+        
+        Args:
+            scores: Score of every paper, as returned by ``scores``
+            k: Number of papers to select (None for all of them)
+        
+        Returns:
+            Array of row indices
+        """
+        if k is None or k >= len(scores):
+            candidates = np.arange(len(scores))
+        elif k <= 0:
+            return np.arange(0)
+        else:
+            kth_score = scores[np.argpartition(-scores, k - 1)[k - 1]]
+            candidates = np.flatnonzero(scores >= kth_score)
+        order = np.lexsort((self.positions[candidates], -scores[candidates]))
+        return candidates[order][:k]
+    
+    def select(self,
+               relevance_threshold: Optional[float] = None,
+               k: Optional[int] = None,
+               weights: Optional[RankingWeights] = None) -> "PaperBatch":
+        """
+        Keep the papers that reach the relevance threshold, ranked by weighted score.
+        
+        Args:
+            relevance_threshold: Minimum relevance score to keep a paper (None keeps all)
+            k: Maximum number of papers to keep (None keeps all)
+            weights: Ranking signal weights (defaults to relevance alone)
+        
+        Returns:
+            PaperBatch of the selected papers, best first
+        """
+        batch = self if relevance_threshold is None else self[self.mask(relevance_threshold)]
+        return batch[batch.top_k(batch.scores(weights), k)]
@@ -3,31 +3,114 @@ Orchestrator module for coordinating the literature review process.
 """
 
 import asyncio
-from typing import List, Dict, Any, Optional
+import contextlib
+from typing import List, Dict, Any, AsyncIterator, Optional, Tuple, Union
 import os
 
 from literature_review.models import Paper
+from literature_review.browser_pool import BrowserPool
+from literature_review.host_scheduler import HostScheduler
+from literature_review.text_store import TextStore
 from literature_review.search_agent import SearchAgent
 from literature_review.content_agent import ContentRetrievalAgent
-from literature_review.filter_agent import FilterAgent
+from literature_review.filter_agent import FilterAgent, TopKStopper
+from literature_review.paper_batch import PaperBatch, RankingWeights
+from literature_review.lexical import LexicalPrefilter
+from literature_review.embeddings import EmbeddingScorer
+from literature_review.cache import RelevanceCache, SummaryCache, SearchCache
+from literature_review.dedup import PaperDeduplicator
 from literature_review.summary_agent import SummaryAgent
 from literature_review.utils import save_review_data
 
 class LiteratureReviewOrchestrator:
     """Coordinates the entire literature review process"""
     
-    def __init__(self, llm):
+    def __init__(self, 
+                 llm, 
+                 filter_batch_size: int = 1,
+                 filter_batch_wait: float = 0.5,
+                 filter_backend: str = "direct",
+                 summary_backend: str = "direct",
+                 prefilter: Optional[LexicalPrefilter] = None,
+                 embedding_scorer: Optional[EmbeddingScorer] = None,
+                 relevance_cache: Optional[RelevanceCache] = None,
+                 summary_timeout: Optional[float] = None,
+                 summary_cache: Optional[SummaryCache] = None,
+                 synthesis: str = "hierarchical",
+                 synthesis_token_budget: int = 6000,
+                 search_sources: Optional[List[Any]] = None,
+                 search_fan_out: bool = False,
+                 search_timeout: Optional[float] = None,
+                 dedup_threshold: Optional[float] = 0.6,
+                 search_cache: Optional[SearchCache] = None,
+                 content_fast_path: bool = True,
+                 browser_pool: Optional[BrowserPool] = None,
+                 host_scheduler: Optional[HostScheduler] = None,
+                 text_store: Optional[TextStore] = None,
+                 ranking: Optional[RankingWeights] = None):
         """
         Initialize the orchestrator with agent instances.
         
         Args:
             llm: Language model instance to use for all agents
+            filter_batch_size: Number of papers to score per relevance LLM call
+            filter_batch_wait: Seconds the pipeline waits for a relevance batch to fill
+                before scoring the papers it has
+            filter_backend: Execution backend for relevance scoring ("direct" or "browser")
+            summary_backend: Execution backend for summaries ("direct" or "browser")
+            prefilter: Optional lexical stage that decides clear-cut papers before LLM scoring
+            embedding_scorer: Optional embedding similarity scorer used instead of LLM relevance calls
+            relevance_cache: Optional persistent cache of LLM relevance scores
+            summary_timeout: Seconds allowed per paper summary before falling back to its abstract
+            summary_cache: Optional content-addressed cache of paper summaries
+            synthesis: Review synthesis mode, "single" or "hierarchical"
+            synthesis_token_budget: Approximate maximum number of tokens per synthesis prompt
+            search_sources: Optional search sources to query concurrently instead of a single search agent
+            search_fan_out: Whether to search the default sources concurrently when none are given
+            search_timeout: Seconds allowed per search source in fan-out mode
+            dedup_threshold: Estimated title+abstract similarity at which search results
+                are merged as near-duplicates, or None to disable deduplication
+            search_cache: Optional persistent cache of search results shared across runs
+            content_fast_path: Whether to fetch paper URLs over HTTP before falling back to a browser agent
+            browser_pool: Optional pool of browsers shared by the search and content agents;
+                the caller closes it when done
+            host_scheduler: Per-host concurrency caps, rate limits and backoff for content retrieval
+            text_store: Optional compressed store for full texts; papers then keep only a
+                reference to their text, and saved papers JSON holds metadata only
+            ranking: Weights of relevance, citations, recency and venue used to order
+                the relevant papers (defaults to relevance alone)
         """
         self.llm = llm
-        self.search_agent = SearchAgent(llm)
-        self.content_agent = ContentRetrievalAgent(llm)
-        self.filter_agent = FilterAgent(llm)
-        self.summary_agent = SummaryAgent(llm)
+        self.search_agent = SearchAgent(
+            llm,
+            sources=search_sources,
+            fan_out=search_fan_out,
+            source_timeout=search_timeout,
+            cache=search_cache,
+            browser_pool=browser_pool,
+        )
+        self.dedup_threshold = dedup_threshold
+        self.filter_batch_wait = filter_batch_wait
+        self.content_agent = ContentRetrievalAgent(llm, fast_path=content_fast_path, browser_pool=browser_pool,
+                                                   scheduler=host_scheduler, text_store=text_store)
+        self.browser_pool = browser_pool
+        self.filter_agent = FilterAgent(
+            llm,
+            batch_size=filter_batch_size,
+            backend=filter_backend,
+            prefilter=prefilter,
+            embedding_scorer=embedding_scorer,
+            cache=relevance_cache,
+            ranking=ranking,
+        )
+        self.summary_agent = SummaryAgent(
+            llm,
+            backend=summary_backend,
+            summary_timeout=summary_timeout,
+            cache=summary_cache,
+            synthesis=synthesis,
+            token_budget=synthesis_token_budget,
+        )
     
     async def run_review(self, 
                         topic: str, 
@@ -35,7 +118,11 @@ class LiteratureReviewOrchestrator:
                         max_full_text_papers: int = 10,
                         relevance_threshold: float = 0.7,
                         save_results: bool = True,
-                        output_dir: str = 'output') -> Dict[str, Any]:
+                        output_dir: str = 'output',
+                        max_concurrency: int = 3,
+                        target_count: Optional[int] = None,
+                        priority: str = "lexical",
+                        stream_search: bool = False) -> Dict[str, Any]:
         """
         Run the complete literature review process.
         
@@ -46,48 +133,423 @@ class LiteratureReviewOrchestrator:
             relevance_threshold: Minimum relevance score (0.0-1.0) to keep a paper
             save_results: Whether to save results to files
             output_dir: Directory to save output files
-            
+            max_concurrency: Maximum number of papers in flight per pipeline stage
+            target_count: Number of relevant papers needed; enables early termination
+            priority: Candidate order for early termination, "lexical", "approximate" or "rank"
+                (see FilterAgent.prioritize)
+            stream_search: Start retrieving and scoring papers as the search finds
+                them, and stop the search once ``target_count`` relevant papers
+                are confirmed
+        
         Returns:
             Dictionary with papers and literature review
         """
-        print(f"🔍 Searching for papers on: {topic}")
-        papers = await self.search_agent.search(topic, max_papers)
-        print(f"📚 Found {len(papers)} papers")
-        
-        # Retrieve full text for papers (limit to max_full_text_papers)
-        print(f"📄 Retrieving full text for up to {max_full_text_papers} papers")
-        papers_with_content = []
-        for i, paper in enumerate(papers[:max_full_text_papers]):
-            print(f"  📝 Retrieving content for paper {i+1}/{min(len(papers), max_full_text_papers)}: {paper.title}")
-            paper_with_content = await self.content_agent.retrieve_content(paper)
-            papers_with_content.append(paper_with_content)
-        
-        # Filter papers by relevance
-        print(f"🔍 Filtering papers by relevance (threshold: {relevance_threshold})")
-        filtered_papers = await self.filter_agent.filter_papers(
-            papers_with_content, topic, relevance_threshold
-        )
-        print(f"✅ Filtered to {len(filtered_papers)} relevant papers")
+        try:
+            self.filter_agent.reset_stats()
+            self.content_agent.reset_stats()
+            self.search_agent.reset_stats()
+            
+            print(f"🔍 Searching for papers on: {topic}")
+            if stream_search:
+                # Retrieve, filter and summarize papers while the search is still running
+                print(f"📄 Processing up to {max_full_text_papers} papers as they are found "
+                      f"(relevance threshold: {relevance_threshold}, {max_concurrency} at a time)")
+                paper_stream = self.search_agent.iter_search(topic, max_papers, self.dedup_threshold)
+                async with contextlib.aclosing(paper_stream):
+                    filtered_papers, paper_summaries = await self.process_papers(
+                        paper_stream, topic, relevance_threshold, max_concurrency,
+                        target_count=target_count, max_papers=max_full_text_papers
+                    )
+            else:
+                papers = await self.search_agent.search(topic, max_papers)
+                print(f"📚 Found {len(papers)} papers")
+                if self.dedup_threshold is not None:
+                    deduplicator = PaperDeduplicator(threshold=self.dedup_threshold)
+                    papers = deduplicator.deduplicate(papers)
+                    if deduplicator.duplicates:
+                        print(f"🧹 Merged {deduplicator.duplicates} duplicate papers, {len(papers)} remain")
+                
+                # Retrieve, filter and summarize papers as a streaming pipeline
+                # (limit to max_full_text_papers)
+                print(f"📄 Processing up to {max_full_text_papers} papers "
+                      f"(relevance threshold: {relevance_threshold}, {max_concurrency} at a time)")
+                filtered_papers, paper_summaries = await self.process_papers(
+                    papers[:max_full_text_papers], topic, relevance_threshold, max_concurrency,
+                    target_count=target_count, priority=priority
+                )
+            print(f"✅ Filtered to {len(filtered_papers)} relevant papers")
+            content_stats = self.content_agent.path_stats()
+            for path, path_stats in content_stats.items():
+                if path_stats["attempts"]:
+                    print(f"⚡ Content via {path}: {path_stats['hits']}/{path_stats['attempts']} hits, "
+                          f"{path_stats['mean_seconds']:.2f}s average")
+            agent_stats = {"search": dict(self.search_agent.agent_stats),
+                           "content": dict(self.content_agent.agent_stats)}
+            for stage, stage_stats in agent_stats.items():
+                if stage_stats["agent_runs"]:
+                    print(f"⚡ {stage.capitalize()} agents: kept {stage_stats['result_chars']:,} of "
+                          f"~{stage_stats['trace_chars']:,} trace characters over {stage_stats['agent_runs']} runs")
+            scheduler = getattr(self.content_agent, "scheduler", None)
+            host_stats = {host: dict(stats) for host, stats in scheduler.stats.items()} if scheduler is not None else {}
+            throttled = sorted(host for host, stats in host_stats.items() if stats["retries"])
+            if throttled:
+                retries = sum(host_stats[host]["retries"] for host in throttled)
+                print(f"⏳ Retried {retries} requests after 429/5xx responses from {', '.join(throttled)}")
+            if self.browser_pool:
+                pool_stats = self.browser_pool.stats
+                print(f"⚡ Browser pool: {pool_stats['launched']} launched, {pool_stats['reused']} reused, "
+                      f"{pool_stats['recycled']} recycled")
+            filter_stats = dict(self.filter_agent.stats)
+            if self.filter_agent.prefilter:
+                print(f"⚡ Lexical prefilter accepted {filter_stats['prefilter_accepted']} and rejected "
+                      f"{filter_stats['prefilter_rejected']} papers, saving {filter_stats['llm_calls_saved']} LLM calls")
+            if self.filter_agent.cache:
+                print(f"⚡ Relevance cache: {filter_stats['cache_hits']} hits, {filter_stats['cache_misses']} misses")
+            if target_count:
+                print(f"⚡ Early termination skipped {filter_stats['early_stop_skipped']} papers")
+                if filter_stats["early_stop_approximate"]:
+                    print(f"⚠️ {filter_stats['early_stop_approximate']} of them were skipped by the approximate "
+                          f"lexical bound and may include top-ranked papers")
+            
+            # Generate literature review once every summary is ready
+            print(f"📝 Generating literature review from {len(filtered_papers)} papers")
+            literature_review = await self.summary_agent.write_review(paper_summaries, topic)
+            
+            # Save results if requested
+            saved_files = {}
+            if save_results:
+                print(f"💾 Saving results to {output_dir}")
+                saved_files = save_review_data(
+                    filtered_papers, literature_review, topic, output_dir
+                )
+                print(f"📂 Saved papers to: {saved_files.get('papers_file')}")
+                print(f"📄 Saved review to: {saved_files.get('review_file')}")
+            
+            return {
+                "topic": topic,
+                "papers": filtered_papers,
+                "literature_review": literature_review,
+                "saved_files": saved_files,
+                "stats": {"filter": filter_stats, "content": content_stats, "hosts": host_stats,
+                          "agents": agent_stats}
+            }
+        finally:
+            # Close pooled HTTP connections while this event loop is still running
+            await self.content_agent.aclose()
+    
+    async def retrieve_contents(self, papers: List[Paper], max_concurrency: int = 3) -> List[Paper]:
+        """
+        Retrieve content for several papers concurrently.
         
-        # Generate literature review
-        print(f"📝 Generating literature review from {len(filtered_papers)} papers")
-        literature_review = await self.summary_agent.generate_literature_review(
-            filtered_papers, topic
-        )
+        At most ``max_concurrency`` retrievals run at the same time. The returned
+        list keeps the input order, and a paper whose retrieval fails is kept
+        with the metadata it already had instead of being dropped.
+        
+        Args:
+            papers: Papers to retrieve content for
+            max_concurrency: Maximum number of retrievals running at once
         
-        # Save results if requested
-        saved_files = {}
-        if save_results:
-            print(f"💾 Saving results to {output_dir}")
-            saved_files = save_review_data(
-                filtered_papers, literature_review, topic, output_dir
-            )
-            print(f"📂 Saved papers to: {saved_files.get('papers_file')}")
-            print(f"📄 Saved review to: {saved_files.get('review_file')}")
-        
-        return {
-            "topic": topic,
-            "papers": filtered_papers,
-            "literature_review": literature_review,
-            "saved_files": saved_files
-        }
+        Returns:
+            List of Paper objects in the same order as ``papers``
+        """
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+        total = len(papers)
+        
+        async def retrieve(i: int, paper: Paper) -> Paper:
+            await self._acquire_for_host(semaphore, paper)
+            try:
+                return await self._retrieve_one(i, total, paper)
+            finally:
+                semaphore.release()
+        
+        return list(await asyncio.gather(
+            *(retrieve(i, paper) for i, paper in enumerate(papers))
+        ))
+    
+    async def process_papers(self,
+                             papers: Union[List[Paper], AsyncIterator[Paper]],
+                             topic: str,
+                             relevance_threshold: float = 0.7,
+                             max_concurrency: int = 3,
+                             target_count: Optional[int] = None,
+                             priority: str = "lexical",
+                             max_papers: Optional[int] = None) -> Tuple[List[Paper], List[Dict[str, Any]]]:
+        """
+        Retrieve, filter and summarize papers as a streaming pipeline.
+        
+        The stages are connected with asyncio queues: a paper is scored as soon
+        as its content arrives, and a relevant paper is summarized as soon as it
+        is scored, so one slow paper does not hold up the others. Each stage
+        runs up to ``max_concurrency`` papers (or relevance batches) at once.
+        When the filter agent scores in batches, papers arriving within
+        ``filter_batch_wait`` seconds of each other are scored together.
+        
+        With ``target_count`` set, papers enter the pipeline in the filter
+        agent's priority order, and papers that can no longer make the top
+        ``target_count`` by the filter agent's ranking weights are skipped
+        before retrieval or scoring. A relevant paper whose ranking score falls
+        below the k-th best is not summarized, and its summary is cancelled if
+        it is already in progress.
+        
+        ``papers`` may also be an async iterator such as
+        ``SearchAgent.iter_search``. Papers then enter the pipeline in the
+        order they arrive, and no more are taken from the iterator once
+        ``target_count`` relevant papers have been confirmed.
+        
+        Args:
+            papers: Papers to process, as a list or an async iterator
+            topic: Research topic to assess relevance against
+            relevance_threshold: Minimum relevance score (0.0-1.0) to keep a paper
+            max_concurrency: Maximum number of papers in flight per stage
+            target_count: Number of relevant papers needed; enables early termination
+            priority: Candidate order for early termination, "lexical", "approximate" or "rank"
+                (see FilterAgent.prioritize)
+            max_papers: Maximum number of papers to take from ``papers``
+        
+        Returns:
+            Tuple of the relevant papers ranked by the filter agent's weights and their summaries
+            in the same order
+        """
+        workers = max(1, max_concurrency)
+        streaming = not isinstance(papers, list)
+        if not streaming and max_papers is not None:
+            papers = papers[:max_papers]
+        total = max_papers if streaming else len(papers)
+        content_queue: asyncio.Queue = asyncio.Queue()
+        summary_queue: asyncio.Queue = asyncio.Queue()
+        summarized: List[Tuple[int, Paper, Dict[str, Any]]] = []
+        # Summaries in progress, by paper index, with the paper's ranking score
+        summarizing: Dict[int, Tuple[float, asyncio.Task]] = {}
+        
+        # Early termination: order candidates by priority and track the top k.
+        # Streamed papers arrive in search order with no score bound.
+        bounds: Dict[int, Optional[float]] = {}
+        stopper: Optional[TopKStopper] = None
+        skipped = 0
+        dropped = 0
+        if target_count:
+            if not streaming:
+                ranked = self.filter_agent.prioritize(papers, topic, priority)
+                papers = [paper for paper, _ in ranked]
+                bounds = {i: bound for i, (_, bound) in enumerate(ranked)}
+            stopper = TopKStopper(target_count, relevance_threshold)
+        
+        # Early termination and the final ranking both use the filter agent's weights
+        weights = getattr(self.filter_agent, "ranking", None)
+        
+        def ranking_scores(scored: List[Paper], relevance_scores: List[float]) -> List[float]:
+            batch = PaperBatch.from_papers(scored)
+            batch.relevance_score[:] = relevance_scores
+            return batch.scores(weights).tolist()
+        
+        def can_skip(i: int) -> bool:
+            nonlocal skipped
+            if stopper is not None and stopper.can_skip(bounds.get(i)):
+                skipped += 1
+                return True
+            return False
+        
+        # Set once a streamed search has produced enough relevant papers
+        enough = asyncio.Event()
+        
+        async def paper_source():
+            if streaming:
+                async for paper in papers:
+                    yield paper
+            else:
+                for paper in papers:
+                    yield paper
+        
+        async def take_next(source) -> Optional[Paper]:
+            """Next paper from the source, or None once it is exhausted or enough papers are relevant"""
+            pull = asyncio.ensure_future(anext(source, None))
+            stop = asyncio.ensure_future(enough.wait())
+            await asyncio.wait({pull, stop}, return_when=asyncio.FIRST_COMPLETED)
+            stop.cancel()
+            if pull.done():
+                return pull.result()
+            pull.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await pull
+            return None
+        
+        async def retrieve_stage():
+            semaphore = asyncio.Semaphore(workers)
+            tasks = []
+            
+            async def retrieve(i: int, paper: Paper):
+                holding = True
+                try:
+                    if can_skip(i):
+                        return
+                    if not self._host_ready(paper):
+                        # Let papers from other hosts use the slot meanwhile
+                        semaphore.release()
+                        holding = False
+                        await self._acquire_for_host(semaphore, paper)
+                        holding = True
+                    paper = await self._retrieve_one(i, total, paper)
+                finally:
+                    if holding:
+                        semaphore.release()
+                await content_queue.put((i, paper))
+            
+            # Take the next paper only once a retrieval slot is free, so a
+            # streamed search can stop as soon as enough papers are relevant
+            async with contextlib.aclosing(paper_source()) as source:
+                while max_papers is None or len(tasks) < max_papers:
+                    await semaphore.acquire()
+                    paper = await take_next(source)
+                    if paper is None:
+                        semaphore.release()
+                        break
+                    tasks.append(asyncio.create_task(retrieve(len(tasks), paper)))
+            
+            await asyncio.gather(*tasks)
+            if streaming:
+                print(f"📚 Took {len(tasks)} papers from the search")
+            await content_queue.put(None)
+        
+        async def next_batch() -> Tuple[List[Tuple[int, Paper]], bool]:
+            """
+            Papers for one scoring call and whether retrieval has finished.
+            
+            Waits for one paper, then up to ``filter_batch_wait`` seconds for
+            the batch to reach the filter agent's batch size.
+            """
+            batch_size = self.filter_agent.batch_size
+            batch = []
+            item = await content_queue.get()
+            deadline = asyncio.get_running_loop().time() + self.filter_batch_wait
+            while item is not None:
+                batch.append(item)
+                if len(batch) >= batch_size:
+                    break
+                try:
+                    async with asyncio.timeout_at(deadline):
+                        item = await content_queue.get()
+                except TimeoutError:
+                    break
+            return batch, item is None
+        
+        async def score_batch(batch: List[Tuple[int, Paper]]):
+            scores = await self.filter_agent.score_papers([paper for _, paper in batch], topic)
+            rank_scores = ranking_scores([paper for _, paper in batch], scores)
+            for (i, paper), relevance_score, rank_score in zip(batch, scores, rank_scores):
+                if stopper is not None:
+                    stopper.add(relevance_score, rank_score)
+                    if streaming and stopper.kth_score is not None:
+                        enough.set()
+                    cancel_outranked()
+                if relevance_score >= relevance_threshold:
+                    print(f"  ✅ Paper '{paper.title}' is relevant (score: {relevance_score:.2f})")
+                    await summary_queue.put((i, paper, rank_score))
+                else:
+                    print(f"  ❌ Paper '{paper.title}' is not relevant enough (score: {relevance_score:.2f})")
+        
+        async def filter_stage():
+            # A single consumer forms the batches, so papers arriving close
+            # together share an LLM call; up to ``workers`` calls run at once
+            semaphore = asyncio.Semaphore(workers)
+            tasks = []
+            
+            async def score(batch: List[Tuple[int, Paper]]):
+                try:
+                    await score_batch(batch)
+                finally:
+                    semaphore.release()
+            
+            done = False
+            while not done:
+                # Wait for a free slot first, so papers keep queueing meanwhile
+                await semaphore.acquire()
+                batch, done = await next_batch()
+                batch = [(i, paper) for i, paper in batch if not can_skip(i)]
+                if not batch:
+                    semaphore.release()
+                    continue
+                tasks.append(asyncio.create_task(score(batch)))
+            
+            await asyncio.gather(*tasks)
+            for _ in range(workers):
+                await summary_queue.put(None)
+        
+        def outranked(rank_score: float) -> bool:
+            """Whether a relevant paper has fallen out of the top ``target_count``"""
+            nonlocal dropped
+            if stopper is not None and stopper.excludes(rank_score):
+                dropped += 1
+                return True
+            return False
+        
+        def cancel_outranked():
+            for rank_score, task in list(summarizing.values()):
+                if not task.done() and not task.cancelling() and outranked(rank_score):
+                    task.cancel()
+        
+        async def summary_worker():
+            while (item := await summary_queue.get()) is not None:
+                i, paper, rank_score = item
+                if outranked(rank_score):
+                    continue
+                print(f"  📝 Summarizing paper: {paper.title}")
+                task = asyncio.create_task(self.summary_agent.summarize_paper(paper))
+                summarizing[i] = (rank_score, task)
+                try:
+                    # wait() leaves the worker running when only the summary is cancelled
+                    await asyncio.wait({task})
+                finally:
+                    task.cancel()
+                    del summarizing[i]
+                if not task.cancelled():
+                    summarized.append((i, paper, task.result()))
+        
+        async with asyncio.TaskGroup() as group:
+            group.create_task(retrieve_stage())
+            group.create_task(filter_stage())
+            for _ in range(workers):
+                group.create_task(summary_worker())
+        
+        # Rank by the filter agent's weights, breaking ties by input (or priority) order
+        batch = PaperBatch.from_papers([paper for _, paper, _ in summarized],
+                                       positions=[i for i, _, _ in summarized])
+        if stopper is not None:
+            self.filter_agent.record_skipped(skipped, priority=priority if not streaming else "rank")
+            if dropped:
+                print(f"✂️ Skipped or cancelled {dropped} summaries of papers outside the top {target_count}")
+        scores = batch.scores(weights)
+        ranked = batch.top_k(scores, target_count if stopper is not None else None)
+        summarized = [summarized[j] for j in ranked]
+        filtered_papers = [paper for _, paper, _ in summarized]
+        paper_summaries = [summary for _, _, summary in summarized]
+        return filtered_papers, paper_summaries
+    
+    def _host_ready(self, paper: Paper) -> bool:
+        """Whether the content agent could start retrieving from the paper's host now"""
+        scheduler = getattr(self.content_agent, "scheduler", None)
+        return scheduler is None or not paper.url or scheduler.ready(paper.url)
+    
+    async def _acquire_for_host(self, semaphore: asyncio.Semaphore, paper: Paper):
+        """
+        Take a retrieval slot once the paper's host can take another retrieval.
+        
+        Waiting for a busy or backed-off host does not hold a slot, so papers
+        from other hosts keep being retrieved.
+        """
+        scheduler = getattr(self.content_agent, "scheduler", None)
+        while True:
+            if scheduler is not None and paper.url:
+                await scheduler.wait_ready(paper.url)
+            await semaphore.acquire()
+            if self._host_ready(paper):
+                return
+            semaphore.release()
+    
+    async def _retrieve_one(self, i: int, total: int, paper: Paper) -> Paper:
+        """Retrieve content for one paper, keeping the paper unchanged on failure"""
+        print(f"  📝 Retrieving content for paper {i+1}/{total}: {paper.title}")
+        try:
+            return await self.content_agent.retrieve_content(paper)
+        except Exception as e:
+            print(f"  ⚠️ Content retrieval failed for '{paper.title}': {e}")
+            return paper
@@ -2,54 +2,397 @@
 Search agent module for finding academic papers across various sources.
 """
 
+import asyncio
+import hashlib
 import json
 import re
-from typing import List, Dict, Any
+import time
+from typing import List, Dict, Any, AsyncIterator, Callable, Optional, Union
 from browser_use import Agent
 
 from literature_review.models import Paper
-from literature_review.utils_browser import convert_agent_result_to_string
+from literature_review.browser_pool import BrowserPool, browser_session
+from literature_review.llm_backend import create_backend
+from literature_review.cache import SearchCache
+from literature_review.dedup import PaperDeduplicator
+from literature_review.utils import extract_json_records
+from literature_review.utils_browser import extract_agent_result, record_agent_result
+
+# Academic databases searched in fan-out mode, by name and site
+DEFAULT_SOURCES = {
+    "Google Scholar": "scholar.google.com",
+    "arXiv": "arxiv.org",
+    "Semantic Scholar": "www.semanticscholar.org",
+    "ResearchGate": "www.researchgate.net",
+}
+
+# Reciprocal rank fusion constant; larger values flatten the rank weighting
+RRF_K = 60
+
+def is_paper_record(data: Dict[str, Any]) -> bool:
+    """Whether a JSON object looks like a paper, i.e. has a non-empty title"""
+    return isinstance(data.get("title"), str) and bool(data["title"].strip())
+
+class AgentSearchSource:
+    """Searches a single academic database with its own agent"""
+    def __init__(self,
+                 llm,
+                 name: str,
+                 site: str,
+                 max_steps: int = 6,
+                 timeout: Optional[float] = None,
+                 backend: str = "browser",
+                 browser_pool: Optional[BrowserPool] = None):
+        """
+        Initialize the search source.
+        
+        Args:
+            llm: Language model instance to use for the agent
+            name: Display name of the database, e.g. "arXiv"
+            site: Site the agent should search, e.g. "arxiv.org"
+            max_steps: Maximum number of agent steps for one search
+            timeout: Seconds allowed for one search, or None to use the SearchAgent's default
+            backend: Execution backend, "browser" or "direct"
+            browser_pool: Optional pool of browsers for the browser backend
+        """
+        self.name = name
+        self.site = site
+        self.max_steps = max_steps
+        self.timeout = timeout
+        self.backend = create_backend(llm, backend, browser_pool=browser_pool)
+    
+    @property
+    def fingerprint(self) -> str:
+        """Description of what this source searches and how, for cache keys"""
+        return f"{self.name} ({self.site}) via {self.backend.name}, {self.max_steps} steps"
+    
+    async def search(self, topic: str, max_papers: int = 15) -> str:
+        """
+        Search the database for papers on a topic.
+        
+        Args:
+            topic: The research topic to search for
+            max_papers: Maximum number of papers to return
+            
+        Returns:
+            The agent's answer, expected to contain a JSON list of papers
+        """
+        task = f"""Find the most relevant and recent academic papers about '{topic}' on {self.name} ({self.site}).
+        For each paper, extract the title, authors, abstract, publication year, venue/journal, and URL.
+        Focus on papers published in the last 5 years if possible.
+        Format the results as a JSON list where each paper is an object with keys: 
+        title, authors (as a list), abstract, year, venue, and url.
+        Return up to {max_papers} papers, most relevant first."""
+        return await self.backend.run(task, max_steps=self.max_steps, max_actions_per_step=5)
+
+def default_sources(llm,
+                    max_steps: int = 6,
+                    timeout: Optional[float] = None,
+                    browser_pool: Optional[BrowserPool] = None) -> List[AgentSearchSource]:
+    """
+    Create one browser search source per database in DEFAULT_SOURCES.
+    
+    Args:
+        llm: Language model instance to use for the agents
+        max_steps: Maximum number of agent steps per source
+        timeout: Seconds allowed per source
+        browser_pool: Optional pool of browsers shared by the sources
+        
+    Returns:
+        List of AgentSearchSource objects
+    """
+    return [AgentSearchSource(llm, name, site, max_steps=max_steps, timeout=timeout, browser_pool=browser_pool)
+            for name, site in DEFAULT_SOURCES.items()]
 
 class SearchAgent:
     """Agent responsible for searching papers across multiple sources"""
-    def __init__(self, llm):
+    def __init__(self, 
+                 llm,
+                 sources: Optional[List[Any]] = None,
+                 fan_out: bool = False,
+                 source_timeout: Optional[float] = None,
+                 source_max_steps: int = 6,
+                 cache: Optional[SearchCache] = None,
+                 browser_pool: Optional[BrowserPool] = None):
+        """
+        Initialize the search agent.
+        
+        By default one browser agent visits every database in a single
+        session. In fan-out mode each source is searched by its own agent
+        concurrently, and the results are merged into one ranked list.
+        
+        Args:
+            llm: Language model instance to use for searching
+            sources: Search sources for fan-out mode; any object with a ``name``
+                and an async ``search(topic, max_papers)`` returning text or a
+                list of paper dicts or Paper objects. Implies fan-out mode.
+            fan_out: Whether to search DEFAULT_SOURCES concurrently when no
+                sources are given
+            source_timeout: Default seconds allowed per source in fan-out mode
+            source_max_steps: Agent steps per default source in fan-out mode
+            cache: Optional persistent cache of search results
+            browser_pool: Optional pool of browsers for the search agents
+        """
         self.llm = llm
+        self.model_name = getattr(llm, "model", None) or type(llm).__name__
+        self.browser_pool = browser_pool
+        if sources is None and fan_out:
+            sources = default_sources(llm, max_steps=source_max_steps, browser_pool=browser_pool)
+        self.sources = sources
+        self.source_timeout = source_timeout
+        self.source_stats: Dict[str, Dict[str, Any]] = {}
+        self.cache = cache
+        self.reset_stats()
+    
+    def reset_stats(self):
+        """Reset the single search agent's trace size counters"""
+        # Size of the agent's step traces against the text parsed from them
+        self.agent_stats: Dict[str, int] = {"agent_runs": 0, "trace_chars": 0, "result_chars": 0}
+    
+    def source_fingerprint(self) -> str:
+        """
+        Fingerprint of the search configuration, for keying cached results.
+        
+        Cached results are only reused by searches that would query the same
+        sources with the same model. Sources may describe themselves with a ``fingerprint`` attribute;
+        otherwise their ``name`` is used.
+        
+        Returns:
+            Short hash of the model and the sources (or single-agent mode)
+        """
+        if self.sources:
+            sources = sorted(str(getattr(source, "fingerprint", None) or source.name) for source in self.sources)
+        else:
+            sources = ["single agent: " + ", ".join(f"{name} ({site})" for name, site in DEFAULT_SOURCES.items())]
+        description = json.dumps([str(self.model_name), sources])
+        return hashlib.sha256(description.encode("utf-8")).hexdigest()[:16]
         
-    async def search(self, topic: str, max_papers: int = 15) -> List[Paper]:
+    async def search(self, 
+                     topic: str, 
+                     max_papers: int = 15,
+                     on_papers: Optional[Callable[[List[Paper]], None]] = None) -> List[Paper]:
         """
         Search for academic papers on a given topic.
         
         Args:
             topic: The research topic to search for
             max_papers: Maximum number of papers to return
+            on_papers: Optional callback receiving papers as soon as a source
+                or agent step produces them, before the search finishes
+            
+        Returns:
+            List of Paper objects with basic metadata
+        """
+        sources = self.source_fingerprint()
+        if self.cache is not None:
+            cached = self.cache.get_results(topic, max_papers, sources)
+            if cached is not None:
+                print(f"  ⚡ Reusing cached search results ({len(cached)} papers)")
+                if on_papers is not None:
+                    on_papers(cached)
+                return cached
+        
+        if self.sources:
+            papers = await self.search_sources(topic, max_papers, on_papers)
+        else:
+            papers = await self.search_single_agent(topic, max_papers, on_papers)
+        
+        if self.cache is not None and papers:
+            self.cache.set_results(topic, max_papers, papers, sources)
+        return papers
+    
+    async def iter_search(self, 
+                          topic: str, 
+                          max_papers: int = 15,
+                          dedup_threshold: Optional[float] = 0.6) -> AsyncIterator[Paper]:
+        """
+        Search for papers, yielding each one as soon as it is found.
+        
+        The search runs in a background task, so it keeps going while the
+        caller processes the papers already yielded. Closing the generator
+        early (e.g. with ``contextlib.aclosing``) cancels the search.
+        
+        Args:
+            topic: The research topic to search for
+            max_papers: Maximum number of papers to yield
+            dedup_threshold: Similarity at which near-duplicates of papers
+                already yielded are merged into them instead of being yielded,
+                or None to only drop exact repeats
+            
+        Yields:
+            Paper objects in the order they are found
+        """
+        queue: asyncio.Queue = asyncio.Queue()
+        deduplicator = PaperDeduplicator(threshold=dedup_threshold if dedup_threshold is not None else 1.0)
+        search_task = asyncio.create_task(self.search(topic, max_papers, on_papers=queue.put_nowait))
+        search_task.add_done_callback(lambda _: queue.put_nowait(None))
+        
+        yielded = 0
+        try:
+            while yielded < max_papers and (papers := await queue.get()) is not None:
+                for paper in papers:
+                    known = len(deduplicator.papers)
+                    deduplicator.add(paper)
+                    if len(deduplicator.papers) == known:
+                        continue
+                    yield paper
+                    yielded += 1
+                    if yielded >= max_papers:
+                        break
+            if yielded < max_papers:
+                # Surface any exception raised by the search
+                await search_task
+        finally:
+            if not search_task.done():
+                search_task.cancel()
+                try:
+                    await search_task
+                except asyncio.CancelledError:
+                    pass
+    
+    async def search_single_agent(self, 
+                                  topic: str, 
+                                  max_papers: int = 15,
+                                  on_papers: Optional[Callable[[List[Paper]], None]] = None) -> List[Paper]:
+        """
+        Search for papers with one browser agent that visits every database in turn.
+        
+        Args:
+            topic: The research topic to search for
+            max_papers: Maximum number of papers to return
+            on_papers: Optional callback receiving paper records the agent
+                extracts in earlier steps, before its final answer
             
         Returns:
             List of Paper objects with basic metadata
         """
+        scanned_steps = 0
+        
+        def report_extracted_papers(state, model_output, step: int):
+            # Called before each step's actions run, so the history holds
+            # every earlier step's results
+            nonlocal scanned_steps
+            history = agent.state.history.history
+            for item in history[scanned_steps:]:
+                for action_result in item.result:
+                    if action_result.extracted_content:
+                        records = extract_json_records(action_result.extracted_content, is_paper_record)
+                        if records:
+                            on_papers(self._to_papers(records))
+            scanned_steps = len(history)
+        
         # Create a browser agent to search across multiple academic databases
-        agent = Agent(
-            task=f"""Find the most relevant and recent academic papers about '{topic}'. 
+        task = f"""Find the most relevant and recent academic papers about '{topic}'. 
             Search across Google Scholar, arXiv, ResearchGate, and other academic databases.
             For each paper, extract the title, authors, abstract, publication year, venue/journal, and URL.
             Focus on papers published in the last 5 years if possible.
             Format the results as a JSON list where each paper is an object with keys: 
             title, authors (as a list), abstract, year, venue, and url.
-            Return at least {max_papers} papers if available.""",
-            llm=self.llm,
-            max_actions_per_step=5,
-        )
-        
-        result = await agent.run(max_steps=15)
+            Return at least {max_papers} papers if available."""
+        async with browser_session(self.browser_pool) as browser_kwargs:
+            agent = Agent(
+                task=task,
+                llm=self.llm,
+                max_actions_per_step=5,
+                register_new_step_callback=report_extracted_papers if on_papers is not None else None,
+                **browser_kwargs,
+            )
+            
+            result = await agent.run(max_steps=15)
         
-        # Convert result to string using our utility function
-        result_text = convert_agent_result_to_string(result)
+        # Parse the agent's final answer rather than its whole step trace
+        agent_result = extract_agent_result(result)
+        record_agent_result(self.agent_stats, agent_result)
             
         # Extract paper information from the result
-        papers_data = self._extract_paper_data(result_text)
+        papers_data = self._extract_paper_data(agent_result.text)
+        if not papers_data and agent_result.source in ("final_result", "extracted_content"):
+            # The answer had no recognizable papers; fall back to the full trace
+            papers_data = self._extract_paper_data(str(result))
         
         # Convert to Paper objects
+        papers = self._to_papers(papers_data)
+        if on_papers is not None:
+            on_papers(papers)
+        return papers
+    
+    async def search_sources(self, 
+                             topic: str, 
+                             max_papers: int = 15,
+                             on_papers: Optional[Callable[[List[Paper]], None]] = None) -> List[Paper]:
+        """
+        Search every source concurrently and merge the results.
+        
+        Each source runs within its own time budget; a source that fails or
+        runs out of time contributes nothing instead of failing the search.
+        Results are merged as each source finishes. Papers found by several
+        sources, including near-duplicates such as preprint and journal
+        versions, are merged into one, and the list is ranked by reciprocal
+        rank fusion, so papers ranked highly by more sources come first.
+        
+        Args:
+            topic: The research topic to search for
+            max_papers: Maximum number of papers to return
+            on_papers: Optional callback receiving each source's papers as it finishes
+            
+        Returns:
+            Deduplicated list of Paper objects, best ranked first
+        """
+        deduplicator = PaperDeduplicator()
+        scores: List[float] = []
+        self.source_stats = {}
+        
+        async def run_source(source) -> tuple:
+            timeout = getattr(source, "timeout", None) or self.source_timeout
+            start = time.perf_counter()
+            error = None
+            try:
+                result = await asyncio.wait_for(source.search(topic, max_papers), timeout=timeout)
+                papers = self._to_papers(result)
+            except asyncio.TimeoutError:
+                papers, error = [], f"timed out after {timeout}s"
+            except Exception as e:
+                papers, error = [], str(e)
+            return source, papers, error, time.perf_counter() - start
+        
+        print(f"  🔎 Searching {len(self.sources)} sources in parallel")
+        tasks = [asyncio.create_task(run_source(source)) for source in self.sources]
+        try:
+            for next_result in asyncio.as_completed(tasks):
+                source, papers, error, seconds = await next_result
+                self.source_stats[source.name] = {"papers": len(papers), "seconds": seconds, "error": error}
+                if error:
+                    print(f"  ⚠️ Search source {source.name} failed: {error}")
+                    continue
+                print(f"  📚 {source.name}: {len(papers)} papers in {seconds:.1f}s")
+                if on_papers is not None:
+                    on_papers(papers)
+                for rank, paper in enumerate(papers):
+                    cluster = deduplicator.add(paper)
+                    if cluster == len(scores):
+                        scores.append(0.0)
+                    scores[cluster] += 1.0 / (RRF_K + rank + 1)
+        finally:
+            # Stop the remaining sources if the search is cancelled
+            for task in tasks:
+                task.cancel()
+        
+        # Rank by fused score, breaking ties by arrival order
+        ranked = sorted(range(len(scores)), key=lambda cluster: (-scores[cluster], cluster))
+        return [deduplicator.papers[cluster] for cluster in ranked[:max_papers]]
+    
+    def _to_papers(self, results: Union[str, List[Any]]) -> List[Paper]:
+        """Convert a source's text answer or list of paper dicts to Paper objects"""
+        if isinstance(results, str):
+            results = self._extract_paper_data(results)
+        
         papers = []
-        for paper_data in papers_data:
+        for paper_data in results:
+            if isinstance(paper_data, Paper):
+                papers.append(paper_data)
+                continue
+            if not isinstance(paper_data, dict):
+                continue
             papers.append(Paper(
                 title=paper_data.get("title", "Unknown Title"),
                 authors=paper_data.get("authors", []),
@@ -63,25 +406,10 @@ class SearchAgent:
     
     def _extract_paper_data(self, text: str) -> List[Dict[str, Any]]:
         """Extract paper data from the agent's response"""
-        # Try to find a JSON structure in the text
-        json_match = re.search(r'```(?:json)?\s*([\s\S]*?)\s*```', text)
-        if json_match:
-            try:
-                papers_data = json.loads(json_match.group(1))
-                if isinstance(papers_data, list):
-                    return papers_data
-            except json.JSONDecodeError:
-                pass
-        
-        # Try to find any JSON-like structure
-        papers_data_match = re.search(r'\[\s*\{[\s\S]*\}\s*\]', text)
-        if papers_data_match:
-            try:
-                papers_data = json.loads(papers_data_match.group(0))
-                if isinstance(papers_data, list):
-                    return papers_data
-            except json.JSONDecodeError:
-                pass
+        # Recover every well-formed paper object, wherever it appears
+        papers_data = extract_json_records(text, is_paper_record)
+        if papers_data:
+            return papers_data
         
         # Fallback to manual extraction
         return self._manual_extraction(text)
@@ -2,18 +2,69 @@
 Summary agent module for generating paper summaries and literature reviews.
 """
 
+import asyncio
 import re
-from typing import List, Dict, Any
-from browser_use import Agent
+from typing import List, Dict, Any, Optional
+
+import numpy as np
 
 from literature_review.models import Paper
-from literature_review.utils_browser import convert_agent_result_to_string
+from literature_review.llm_backend import create_backend
+from literature_review.cache import SummaryCache
+from literature_review.embeddings import HashingEmbedder
+from literature_review.extractive import build_excerpt
+
+# Bump when the summary prompt changes so cached summaries are not reused
+SUMMARY_PROMPT_VERSION = "2"
+
+# Tokens reserved for the instructions around the sources in a synthesis prompt
+SYNTHESIS_PROMPT_OVERHEAD_TOKENS = 600
+
+# Maximum number of map-reduce rounds before partial syntheses are cut to fit
+MAX_SYNTHESIS_ROUNDS = 8
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count for English text (about four characters per token)"""
+    return len(text) // 4 + 1
 
 class SummaryAgent:
     """Agent responsible for summarizing papers and generating a literature review"""
-    def __init__(self, llm):
-        self.llm = llm
+    def __init__(self, 
+                 llm, 
+                 backend: str = "direct",
+                 max_concurrency: int = 3,
+                 summary_timeout: Optional[float] = None,
+                 cache: Optional[SummaryCache] = None,
+                 synthesis: str = "hierarchical",
+                 token_budget: int = 6000,
+                 excerpt_chars: int = 3000):
+        """
+        Initialize the summary agent.
         
+        Args:
+            llm: Language model instance to use for summaries
+            backend: Execution backend, "direct" for plain LLM calls or "browser" for a browser_use Agent
+            max_concurrency: Maximum number of papers summarized at once
+            summary_timeout: Seconds allowed per paper summary (None waits indefinitely)
+            cache: Optional content-addressed cache of paper summaries
+            synthesis: "single" puts every summary into one review prompt; "hierarchical"
+                does so only while it fits token_budget and otherwise synthesizes
+                groups of summaries first, then reduces them into the review
+            token_budget: Approximate maximum number of tokens per synthesis prompt
+            excerpt_chars: Length of the extractive excerpt of a paper's content sent for summary
+        """
+        if synthesis not in ("single", "hierarchical"):
+            raise ValueError(f"Unknown synthesis mode '{synthesis}', expected 'single' or 'hierarchical'")
+        self.llm = llm
+        self.backend = create_backend(llm, backend)
+        self.max_concurrency = max(1, max_concurrency)
+        self.summary_timeout = summary_timeout
+        self.cache = cache
+        self.synthesis = synthesis
+        self.token_budget = token_budget
+        self.excerpt_chars = excerpt_chars
+        self.model_name = getattr(llm, "model", None) or type(llm).__name__
+    
     async def generate_literature_review(self, papers: List[Paper], topic: str) -> str:
         """
         Generate a comprehensive literature review from the papers.
@@ -21,65 +72,135 @@ class SummaryAgent:
         Args:
             papers: List of Paper objects to include in review
             topic: The research topic of the literature review
-            
+        
         Returns:
             String containing formatted literature review
         """
-        # Prepare paper summaries
-        paper_summaries = []
-        
-        for i, paper in enumerate(papers):
-            print(f"Summarizing paper {i+1}/{len(papers)}: {paper.title}")
-            
-            # Determine content to use for summary
-            content = paper.full_text if paper.full_text else paper.abstract
-            
-            # Create an agent to summarize the paper
-            agent = Agent(
-                task=f"""
-                Summarize the following paper:
-                
-                Title: {paper.title}
-                Authors: {', '.join(paper.authors)}
-                Year: {paper.year if paper.year else 'Unknown'}
-                Venue: {paper.venue if paper.venue else 'Unknown'}
-                
-                Content:
-                {content[:5000]}  # Limit content length
-                
-                Provide a concise summary (200-300 words) that covers:
-                1. Main research question/objective
-                2. Methodology/approach
-                3. Key findings/results
-                4. Implications/conclusions
-                """,
-                llm=self.llm,
-                max_actions_per_step=3,
-            )
+        # Prepare paper summaries, then write the review once all are done
+        paper_summaries = await self.summarize_papers(papers)
+        return await self.write_review(paper_summaries, topic)
+    
+    async def summarize_papers(self, papers: List[Paper], max_concurrency: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Summarize several papers concurrently.
+        
+        Args:
+            papers: Paper objects to summarize
+            max_concurrency: Maximum number of papers summarized at once
+                (defaults to the agent's max_concurrency)
+        
+        Returns:
+            Summaries in the same order as ``papers``
+        """
+        semaphore = asyncio.Semaphore(max(1, max_concurrency or self.max_concurrency))
+        
+        async def summarize(i: int, paper: Paper) -> Dict[str, Any]:
+            async with semaphore:
+                print(f"Summarizing paper {i+1}/{len(papers)}: {paper.title}")
+                return await self.summarize_paper(paper)
+        
+        return list(await asyncio.gather(
+            *(summarize(i, paper) for i, paper in enumerate(papers))
+        ))
+    
+    async def summarize_paper(self, paper: Paper) -> Dict[str, Any]:
+        """
+        Summarize a single paper.
+        
+        If the summary takes longer than the agent's summary_timeout, the
+        paper's abstract is used as its summary instead.
+        
+        Args:
+            paper: Paper object to summarize
+        
+        Returns:
+            Dictionary with the paper's metadata and its summary
+        """
+        try:
+            summary = await asyncio.wait_for(self._summarize(paper), self.summary_timeout)
+            timed_out = False
+        except asyncio.TimeoutError:
+            print(f"Summary for '{paper.title}' timed out after {self.summary_timeout}s, using its abstract")
+            summary = paper.abstract or "No summary available."
+            timed_out = True
+        
+        return {
+            "title": paper.title,
+            "authors": paper.authors,
+            "year": paper.year,
+            "venue": paper.venue,
+            "summary": summary,
+            "relevance_score": paper.relevance_score,
+            "timed_out": timed_out
+        }
+    
+    async def _summarize(self, paper: Paper) -> str:
+        """Ask the backend for a summary of one paper, using the cache when configured"""
+        prompt = self._summary_prompt(paper)
+        if not self.cache:
+            return await self._run_summary(prompt)
+        
+        key = SummaryCache.summary_key(SUMMARY_PROMPT_VERSION, self.model_name, prompt)
+        summary = self.cache.get(key)
+        if summary is None:
+            summary = await self._run_summary(prompt)
+            self.cache.set(key, summary)
+        return summary
+    
+    async def _run_summary(self, prompt: str) -> str:
+        """Summarize the paper with the configured backend"""
+        return await self.backend.run(prompt, max_steps=5, max_actions_per_step=3)
+    
+    def _summary_prompt(self, paper: Paper) -> str:
+        """Build the summary prompt for one paper"""
+        # Determine content to use for summary, reduced to a section-aware excerpt
+        content = build_excerpt(paper.full_text or paper.abstract or "", self.excerpt_chars)
+        
+        return f"""
+            Summarize the following paper:
             
-            result = await agent.run(max_steps=5)
+            Title: {paper.title}
+            Authors: {', '.join(paper.authors)}
+            Year: {paper.year if paper.year else 'Unknown'}
+            Venue: {paper.venue if paper.venue else 'Unknown'}
             
-            # Convert result to string using our utility function
-            summary = convert_agent_result_to_string(result)
+            Content:
+            {content}
             
-            # Add to list of paper summaries
-            paper_summaries.append({
-                "title": paper.title,
-                "authors": paper.authors,
-                "year": paper.year,
-                "venue": paper.venue,
-                "summary": summary,
-                "relevance_score": paper.relevance_score
-            })
+            Provide a concise summary (200-300 words) that covers:
+            1. Main research question/objective
+            2. Methodology/approach
+            3. Key findings/results
+            4. Implications/conclusions
+            """
+    
+    async def write_review(self, paper_summaries: List[Dict[str, Any]], topic: str) -> str:
+        """
+        Synthesize a literature review from per-paper summaries.
+        
+        In hierarchical mode, summaries that do not fit the token budget in one
+        prompt are reduced with write_hierarchical_review instead.
+        
+        Args:
+            paper_summaries: Summaries as returned by summarize_paper
+            topic: The research topic of the literature review
+        
+        Returns:
+            String containing formatted literature review
+        """
+        formatted_papers = self._format_papers_for_review(paper_summaries)
+        if (self.synthesis == "hierarchical" 
+                and estimate_tokens(formatted_papers) + SYNTHESIS_PROMPT_OVERHEAD_TOKENS > self.token_budget):
+            return await self.write_hierarchical_review(paper_summaries, topic)
         
         # Generate literature review from paper summaries
-        review_agent = Agent(
-            task=f"""
+        literature_review = await self.backend.run(
+            f"""
             Generate a comprehensive literature review on the topic: '{topic}'
             
             Use the following {len(paper_summaries)} papers as sources:
             
-            {self._format_papers_for_review(paper_summaries)}
+            {formatted_papers}
             
             The literature review should include:
             
@@ -94,23 +215,194 @@ class SummaryAgent:
             Use in-text citations in the format (Author et al., Year) when referring to specific papers.
             Include a references section at the end listing all the papers.
             """,
-            llm=self.llm,
+            max_steps=10,
             max_actions_per_step=5,
         )
         
-        result = await review_agent.run(max_steps=10)
+        return literature_review
+    
+    async def write_hierarchical_review(self, paper_summaries: List[Dict[str, Any]], topic: str) -> str:
+        """
+        Synthesize a literature review in map-reduce rounds that each fit the token budget.
         
-        # Convert result to string using our utility function
-        literature_review = convert_agent_result_to_string(result)
+        Summaries are grouped into clusters of similar papers that fit the
+        budget, each cluster is condensed into a partial synthesis (clusters run
+        concurrently), and the partial syntheses are grouped and condensed again
+        until they fit a single final prompt together with the reference list.
+        Partial syntheses too long to be grouped in pairs are cut to half the
+        budget, and after MAX_SYNTHESIS_ROUNDS rounds whatever remains is cut to
+        fit, so the number of LLM calls is bounded whatever the LLM returns.
         
-        return literature_review
+        Args:
+            paper_summaries: Summaries as returned by summarize_paper
+            topic: The research topic of the literature review
+        
+        Returns:
+            String containing formatted literature review
+        """
+        group_budget = max(self.token_budget - SYNTHESIS_PROMPT_OVERHEAD_TOKENS, 500)
+        references = self._fit_references(paper_summaries, group_budget // 3)
+        final_budget = group_budget - estimate_tokens(references)
+        items = [self._format_paper(i, paper) for i, paper in enumerate(paper_summaries)]
+        
+        level = 1
+        while level <= MAX_SYNTHESIS_ROUNDS and sum(estimate_tokens(item) for item in items) > final_budget:
+            groups = await self._cluster_by_budget(items, group_budget)
+            if len(groups) >= len(items):
+                # The partial syntheses are too long to group, so this round would
+                # not reduce their number; cut them so that pairs fit the budget
+                halved = [self._truncate(item, group_budget // 2) for item in items]
+                if halved == items:
+                    break
+                items = halved
+                continue
+            print(f"Synthesis round {level}: condensing {len(items)} sources into {len(groups)} partial syntheses")
+            
+            semaphore = asyncio.Semaphore(self.max_concurrency)
+            
+            async def synthesize(group: List[str]) -> str:
+                async with semaphore:
+                    return await self._write_partial_synthesis(group, topic)
+            
+            partials = await asyncio.gather(*(synthesize(group) for group in groups))
+            items = [f"Partial synthesis {j+1}:\n{partial}" for j, partial in enumerate(partials)]
+            level += 1
+        
+        # Cut whatever still does not fit after the last round
+        if sum(estimate_tokens(item) for item in items) > final_budget:
+            items = [self._truncate(item, final_budget // len(items)) for item in items]
+        partial_syntheses = "\n\n".join(items)
+        return await self.backend.run(
+            f"""
+            Generate a comprehensive literature review on the topic: '{topic}'
+            
+            The {len(paper_summaries)} source papers have been condensed into the following 
+            {len(items)} partial syntheses, each covering a group of related papers:
+            
+            {partial_syntheses}
+            
+            Source papers:
+            {references}
+            
+            The literature review should include:
+            
+            1. Introduction to the topic and its importance
+            2. Overview of major themes and findings in the literature
+            3. Analysis of research methodologies used
+            4. Synthesis of key findings and their implications
+            5. Identification of research gaps and future directions
+            6. Conclusion
+            
+            Format the literature review in a scholarly manner with proper sections and citations.
+            Use in-text citations in the format (Author et al., Year) when referring to specific papers.
+            Include a references section at the end listing all the source papers.
+            """,
+            max_steps=10,
+            max_actions_per_step=5,
+        )
+    
+    async def _write_partial_synthesis(self, sources: List[str], topic: str) -> str:
+        """Condense a group of paper summaries or partial syntheses into one partial synthesis"""
+        formatted_sources = "\n\n".join(sources)
+        return await self.backend.run(
+            f"""
+            The following sources are part of a literature review on the topic: '{topic}'
+            
+            {formatted_sources}
+            
+            Write a condensed synthesis of these sources (at most 400 words) covering their 
+            shared themes, methodologies, key findings and disagreements. Keep in-text citations 
+            in the format (Author et al., Year) for every claim taken from a specific paper.
+            """,
+            max_steps=5,
+            max_actions_per_step=3,
+        )
+    
+    async def _cluster_by_budget(self, items: List[str], budget: int) -> List[List[str]]:
+        """
+        Group items into clusters of similar items that each fit the token budget.
+        
+        Clusters are grown greedily: each starts from the first unassigned item
+        and adds the most similar remaining items (by hashed bag-of-words
+        cosine similarity) while they fit. Items larger than the budget are
+        truncated to fit on their own.
+        """
+        items = [self._truncate(item, budget) for item in items]
+        sizes = np.array([estimate_tokens(item) for item in items])
+        
+        vectors = await HashingEmbedder().embed(items)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        vectors = vectors / np.where(norms == 0, 1.0, norms)
+        similarity = vectors @ vectors.T
+        
+        unassigned = np.ones(len(items), dtype=bool)
+        groups = []
+        for seed in range(len(items)):
+            if not unassigned[seed]:
+                continue
+            unassigned[seed] = False
+            members, used = [seed], sizes[seed]
+            for candidate in np.argsort(-similarity[seed], kind="stable"):
+                if unassigned[candidate] and used + sizes[candidate] <= budget:
+                    unassigned[candidate] = False
+                    members.append(int(candidate))
+                    used += sizes[candidate]
+            groups.append([items[i] for i in sorted(members)])
+        return groups
+    
+    @staticmethod
+    def _truncate(text: str, max_tokens: int) -> str:
+        """Cut text to at most about ``max_tokens`` tokens"""
+        if estimate_tokens(text) <= max_tokens:
+            return text
+        return text[:max(max_tokens - 1, 0) * 4]
+    
+    def _fit_references(self, paper_summaries: List[Dict[str, Any]], max_tokens: int) -> str:
+        """
+        Reference list that fits ``max_tokens``: full entries if they fit, else
+        compact ones, else as many compact entries as fit followed by a count of
+        the papers left out.
+        """
+        references = self._format_references(paper_summaries)
+        if estimate_tokens(references) <= max_tokens:
+            return references
+        references = self._format_references(paper_summaries, compact=True)
+        if estimate_tokens(references) <= max_tokens:
+            return references
+        
+        lines = references.split("\n")
+        # Leave room for the line counting the omitted papers
+        max_chars = max(max_tokens - 20, 0) * 4
+        kept, used = [], 0
+        for line in lines:
+            if used + len(line) + 1 > max_chars:
+                break
+            kept.append(line)
+            used += len(line) + 1
+        kept.append(f"- ... and {len(lines) - len(kept)} more papers cited in the partial syntheses")
+        return "\n".join(kept)
+    
+    def _format_references(self, paper_summaries: List[Dict[str, Any]], compact: bool = False) -> str:
+        """One line per paper with its authors, year and title (first author and short title if compact)"""
+        if compact:
+            return "\n".join(
+                f"- {paper['authors'][0] if paper['authors'] else 'Unknown'} et al. "
+                f"({paper['year'] if paper['year'] else 'n.d.'}). {paper['title'][:60]}"
+                for paper in paper_summaries
+            )
+        return "\n".join(
+            f"- {', '.join(paper['authors'][:3])}{' et al.' if len(paper['authors']) > 3 else ''} "
+            f"({paper['year'] if paper['year'] else 'n.d.'}). {paper['title']}"
+            for paper in paper_summaries
+        )
     
     def _format_papers_for_review(self, paper_summaries: List[Dict[str, Any]]) -> str:
         """Format paper summaries for input to the review generation prompt"""
-        formatted_papers = []
-        
-        for i, paper in enumerate(paper_summaries):
-            formatted_paper = f"""
+        return "\n\n".join(self._format_paper(i, paper) for i, paper in enumerate(paper_summaries))
+    
+    def _format_paper(self, i: int, paper: Dict[str, Any]) -> str:
+        """Format one paper summary for a synthesis prompt"""
+        formatted_paper = f"""
             Paper {i+1}:
             Title: {paper['title']}
             Authors: {', '.join(paper['authors'])}
@@ -121,6 +413,4 @@ class SummaryAgent:
             Summary:
             {paper['summary']}
             """
-            formatted_papers.append(formatted_paper)
-        
-        return "\n\n".join(formatted_papers)
+        return formatted_paper
@@ -0,0 +1,107 @@
+"""
+Local text extraction from fetched HTML pages and PDF files.
+"""
+
+import io
+import re
+from html.parser import HTMLParser
+from typing import Dict, List, Optional, Tuple
+
+# Elements whose text is page chrome rather than paper content
+_SKIPPED_TAGS = frozenset({"script", "style", "noscript", "template", "svg", "nav", "header",
+                           "footer", "aside", "form", "button", "select"})
+_BLOCK_TAGS = frozenset({"p", "div", "br", "li", "ul", "ol", "section", "article", "main", "blockquote",
+                         "h1", "h2", "h3", "h4", "h5", "h6", "tr", "table", "pre", "figcaption", "dd", "dt"})
+
+class _HTMLTextExtractor(HTMLParser):
+    """Collects visible text and <meta> tags from an HTML document"""
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts: List[str] = []
+        self.meta: Dict[str, List[str]] = {}
+        self._skip_depth = 0
+    
+    def handle_starttag(self, tag, attrs):
+        if tag == "meta":
+            attributes = dict(attrs)
+            name = (attributes.get("name") or attributes.get("property") or "").lower()
+            if name and attributes.get("content"):
+                self.meta.setdefault(name, []).append(attributes["content"].strip())
+        elif tag in _SKIPPED_TAGS:
+            self._skip_depth += 1
+        elif tag in _BLOCK_TAGS:
+            self.parts.append("\n")
+    
+    def handle_endtag(self, tag):
+        if tag in _SKIPPED_TAGS and self._skip_depth:
+            self._skip_depth -= 1
+        elif tag in _BLOCK_TAGS:
+            self.parts.append("\n")
+    
+    def handle_data(self, data):
+        if not self._skip_depth:
+            self.parts.append(data)
+
+def _clean_lines(text: str) -> str:
+    """Collapse whitespace within lines and drop empty lines"""
+    lines = (" ".join(line.split()) for line in text.splitlines())
+    return "\n".join(line for line in lines if line)
+
+def html_to_text(html: str) -> Tuple[str, Dict[str, List[str]]]:
+    """
+    Extract the readable text of an HTML page.
+    
+    Scripts, styles and navigation chrome are dropped. The abstract from
+    ``citation_abstract`` or description meta tags is put first when the page
+    body does not already contain it, as on many publisher landing pages.
+    
+    Args:
+        html: HTML document
+    
+    Returns:
+        Tuple of the page text and its <meta> tags (lowercased name to contents)
+    """
+    parser = _HTMLTextExtractor()
+    parser.feed(html)
+    parser.close()
+    
+    text = _clean_lines("".join(parser.parts))
+    abstract = next((parser.meta[name][0] for name in ("citation_abstract", "dc.description",
+                                                       "og:description", "description")
+                     if name in parser.meta), "")
+    if abstract and abstract[:200] not in text:
+        text = f"Abstract: {abstract}\n{text}"
+    return text, parser.meta
+
+def html_keywords(meta: Dict[str, List[str]]) -> List[str]:
+    """Keywords from citation_keywords or keywords meta tags"""
+    values = meta.get("citation_keywords") or meta.get("keywords") or []
+    keywords = []
+    for value in values:
+        keywords.extend(keyword.strip() for keyword in re.split(r'[;,]', value) if keyword.strip())
+    return list(dict.fromkeys(keywords))
+
+def pdf_to_text(data: bytes, max_pages: int = 50) -> Optional[str]:
+    """
+    Extract the text of a PDF file.
+    
+    Requires the optional ``pypdf`` package.
+    
+    Args:
+        data: PDF file contents
+        max_pages: Maximum number of pages to read
+    
+    Returns:
+        The extracted text, or None if pypdf is not installed or the file cannot be read
+    """
+    try:
+        from pypdf import PdfReader
+    except ImportError:
+        return None
+    
+    try:
+        reader = PdfReader(io.BytesIO(data))
+        pages = [page.extract_text() or "" for page in reader.pages[:max_pages]]
+    except Exception:
+        return None
+    return _clean_lines("\n".join(pages))
@@ -0,0 +1,96 @@
+"""
+Compressed, content-addressed storage for paper full texts.
+"""
+
+import hashlib
+import mmap
+import os
+import tempfile
+import zlib
+from pathlib import Path
+from typing import Dict
+
+class TextStore:
+    """
+    Stores texts on disk, compressed and addressed by their SHA-256 hash.
+    
+    A text is stored once however many papers hold it, and papers keep only
+    its hash (see ``Paper.full_text_ref``), so full texts do not stay in
+    memory between pipeline stages. Files are written atomically, so several
+    processes can share a store.
+    """
+    def __init__(self, path: str = "output/texts", level: int = 6):
+        """
+        Initialize the store.
+        
+        Args:
+            path: Directory holding the compressed texts
+            level: zlib compression level (1 fastest, 9 smallest)
+        """
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.level = level
+        self.stats: Dict[str, int] = {"stored": 0, "deduplicated": 0, "raw_bytes": 0, "stored_bytes": 0}
+    
+    @staticmethod
+    def digest(text: str) -> str:
+        """Content address of a text"""
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+    
+    def _file(self, digest: str) -> Path:
+        return self.path / digest[:2] / f"{digest[2:]}.z"
+    
+    def __contains__(self, digest: str) -> bool:
+        return self._file(digest).exists()
+    
+    def put(self, text: str) -> str:
+        """
+        Store a text.
+        
+        Args:
+            text: Text to store
+        
+        Returns:
+            The text's digest, to pass to ``get``
+        """
+        data = text.encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+        file = self._file(digest)
+        if file.exists():
+            self.stats["deduplicated"] += 1
+            return digest
+        
+        compressed = zlib.compress(data, self.level)
+        file.parent.mkdir(exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=file.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(compressed)
+            os.replace(tmp_path, file)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        self.stats["stored"] += 1
+        self.stats["raw_bytes"] += len(data)
+        self.stats["stored_bytes"] += len(compressed)
+        return digest
+    
+    def get(self, digest: str) -> str:
+        """
+        Load a text, decompressing straight from a memory map of its file.
+        
+        Args:
+            digest: Digest returned by ``put``
+        
+        Returns:
+            The stored text
+        
+        Raises:
+            KeyError: If no text with this digest is stored
+        """
+        try:
+            with open(self._file(digest), "rb") as f, \
+                    mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                return zlib.decompress(mapped).decode("utf-8")
+        except FileNotFoundError:
+            raise KeyError(digest) from None
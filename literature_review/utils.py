@@ -3,13 +3,128 @@ Utility functions for the literature review system.
 """
 
 import os
+import re
 import json
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Callable
 from pathlib import Path
 import datetime
 
 from literature_review.models import Paper
 
+_JSON_TOKEN_PATTERN = re.compile(r'[{}\[\]"\\\n]')
+
+def paper_identity(paper: Paper) -> str:
+    """
+    Return a stable identity string for a paper.
+    
+    This is the paper's ``paper_id`` (see ``models.make_paper_id``): a DOI or
+    arXiv ID found in the URL, the normalized URL, or a hash of the
+    normalized title.
+    
+    Args:
+        paper: Paper to identify
+        
+    Returns:
+        Identity string such as "doi:10.1000/xyz" or "url:example.com/paper"
+    """
+    return paper.paper_id
+
+def merge_paper_metadata(paper: Paper, other: Paper) -> Paper:
+    """
+    Fill in missing or less complete metadata on a paper from a duplicate of it.
+    
+    Args:
+        paper: Paper to update in place
+        other: Another record of the same paper
+        
+    Returns:
+        The updated ``paper``
+    """
+    # Fix the ID from the metadata the paper was found with before filling in a URL
+    paper.paper_id = paper.paper_id
+    if len(other.abstract or "") > len(paper.abstract or ""):
+        paper.abstract = other.abstract
+    if len(other.authors or []) > len(paper.authors or []):
+        paper.authors = other.authors
+    paper.url = paper.url or other.url
+    paper.year = paper.year or other.year
+    paper.venue = paper.venue or other.venue
+    if other.citations is not None:
+        paper.citations = max(paper.citations or 0, other.citations)
+    paper.keywords = paper.keywords + [kw for kw in other.keywords if kw not in paper.keywords]
+    if len(other.full_text or "") > len(paper.full_text or ""):
+        paper.full_text = other.full_text
+    return paper
+
+def extract_json_records(text: str, is_record: Callable[[Dict[str, Any]], bool]) -> List[Dict[str, Any]]:
+    """
+    Find JSON objects embedded in free text in a single pass.
+    
+    The text is scanned once, jumping between brackets and quotes while
+    tracking string state, so it runs in linear time on long agent
+    transcripts. Each object is parsed on its own when it closes, which
+    recovers the well-formed records of a list even when neighboring ones are
+    malformed. An object is returned when ``is_record`` accepts it; objects
+    that contain an accepted record are not parsed again, and identical
+    records are returned once.
+    
+    Args:
+        text: Text that may contain JSON, e.g. an agent transcript
+        is_record: Predicate selecting the objects to return
+        
+    Returns:
+        Accepted objects in the order they close in the text
+    """
+    records = []
+    seen = set()
+    # Stack of [opening bracket, start offset, contains an accepted record]
+    stack: List[list] = []
+    in_string = False
+    escaped_at = -1
+    
+    for match in _JSON_TOKEN_PATTERN.finditer(text):
+        char, pos = match.group(), match.start()
+        if pos == escaped_at:
+            continue
+        if in_string:
+            if char == '\\':
+                escaped_at = pos + 1
+            elif char == '"' or char == '\n':
+                # JSON strings cannot span lines, so a newline ends a broken string
+                in_string = False
+            continue
+        
+        if char == '"':
+            in_string = True
+        elif char == '{' or char == '[':
+            stack.append([char, pos, False])
+        elif char == '}' or char == ']':
+            opening = '{' if char == '}' else '['
+            # Discard unclosed brackets left behind by malformed JSON
+            while stack and stack[-1][0] != opening:
+                stack.pop()
+            if not stack:
+                continue
+            _, start, contains_record = stack.pop()
+            if char == ']' or contains_record:
+                if contains_record and stack:
+                    stack[-1][2] = True
+                continue
+            
+            try:
+                data = json.loads(text[start:pos + 1])
+            except json.JSONDecodeError:
+                continue
+            if isinstance(data, dict) and is_record(data):
+                key = json.dumps(data, sort_keys=True)
+                if key not in seen:
+                    seen.add(key)
+                    records.append(data)
+                if stack:
+                    stack[-1][2] = True
+    
+    return records
+
 def save_review_data(papers: List[Paper], literature_review: str, topic: str, output_dir: str = 'output') -> Dict[str, str]:
     """
     Save literature review results to files.
@@ -51,12 +166,13 @@ def save_review_data(papers: List[Paper], literature_review: str, topic: str, ou
         "review_file": str(review_file)
     }
 
-def load_papers(file_path: str) -> List[Paper]:
+def load_papers(file_path: str, text_store=None) -> List[Paper]:
     """
     Load papers from a JSON file.
     
     Args:
         file_path: Path to JSON file containing paper data
+        text_store: TextStore holding the full texts referenced by ``full_text_ref``
         
     Returns:
         List of Paper objects
@@ -67,20 +183,4 @@ def load_papers(file_path: str) -> List[Paper]:
     with open(file_path, 'r', encoding='utf-8') as f:
         papers_data = json.load(f)
     
-    papers = []
-    for paper_data in papers_data:
-        paper = Paper(
-            title=paper_data.get("title", "Unknown Title"),
-            authors=paper_data.get("authors", []),
-            abstract=paper_data.get("abstract", ""),
-            url=paper_data.get("url", ""),
-            year=paper_data.get("year"),
-            venue=paper_data.get("venue"),
-            citations=paper_data.get("citations"),
-            keywords=paper_data.get("keywords", []),
-            full_text=paper_data.get("full_text"),
-            relevance_score=paper_data.get("relevance_score", 0.0)
-        )
-        papers.append(paper)
-    
-    return papers
+    return [Paper.from_dict({"title": "Unknown Title", **paper_data}, text_store) for paper_data in papers_data]
@@ -2,33 +2,112 @@
 Utility functions for working with browser-use Agent results.
 """
 
+from dataclasses import dataclass
+from typing import Dict
+
+# Length of the field names and default values in the repr of an empty browser_use ActionResult
+_ACTION_RESULT_REPR_CHARS = 100
+
+@dataclass
+class AgentResult:
+    """Text extracted from an agent run, with where it came from and how large the full trace was."""
+    text: str
+    source: str
+    trace_chars: int
+
+def extract_agent_result(result) -> AgentResult:
+    """
+    Extract the useful text from the result of browser-use Agent.run().
+
+    For an AgentHistoryList this is the agent's final answer if it finished,
+    or else the content it extracted along the way. ``final_result`` alone is
+    not enough: for an agent that ran out of steps it is just the last
+    action's message (e.g. "Navigated to ..."). The full step trace (every
+    action and model output) is only used when the agent produced neither.
+
+    Args:
+        result: Result from agent.run(), which could be a string or AgentHistoryList
+
+    Returns:
+        AgentResult whose ``source`` is "final_result", "extracted_content",
+        "trace" or "text", and whose ``trace_chars`` is the size of the full trace
+        (estimated without rendering it, unless the trace itself is returned)
+    """
+    # Check if the result is an instance of AgentHistoryList from browser-use
+    if result.__class__.__name__ == 'AgentHistoryList':
+        done = result.is_done() if hasattr(result, 'is_done') else False
+        final_result = result.final_result() if done and hasattr(result, 'final_result') else None
+        if final_result and final_result.strip():
+            return AgentResult(final_result.strip(), "final_result", _trace_size(result))
+
+        extracted = result.extracted_content() if hasattr(result, 'extracted_content') else []
+        extracted = [content.strip() for content in extracted if content and content.strip()]
+        if extracted:
+            return AgentResult("\n\n".join(extracted), "extracted_content", _trace_size(result))
+
+        trace = _history_to_string(result)
+        return AgentResult(trace, "trace", len(trace))
+
+    # Default fallback - convert to string
+    text = str(result)
+    return AgentResult(text, "text", len(text))
+
+def _trace_size(result) -> int:
+    """
+    Approximate length of ``str(history)`` without rendering it.
+
+    Counts the text of every action result and the parameters of every model
+    action, which make up nearly all of the trace; histories of another shape
+    are rendered and measured.
+    """
+    try:
+        size = 0
+        for item in result.history:
+            for action_result in item.result:
+                size += (_ACTION_RESULT_REPR_CHARS + len(action_result.extracted_content or "")
+                         + len(action_result.error or ""))
+            if item.model_output:
+                size += sum(len(str(action.model_dump(exclude_none=True))) for action in item.model_output.action)
+        return size
+    except AttributeError:
+        return len(_history_to_string(result))
+
+def record_agent_result(stats: Dict[str, int], agent_result: AgentResult):
+    """Add an agent run's trace size and extracted text size to run stats"""
+    stats["agent_runs"] = stats.get("agent_runs", 0) + 1
+    stats["trace_chars"] = stats.get("trace_chars", 0) + agent_result.trace_chars
+    stats["result_chars"] = stats.get("result_chars", 0) + len(agent_result.text)
+
+def _history_to_string(result) -> str:
+    """Render a whole AgentHistoryList as a string"""
+    # Try different methods to extract the content as string
+    if hasattr(result, '__str__'):
+        return str(result)
+    elif hasattr(result, 'to_string'):
+        return result.to_string()
+    elif hasattr(result, 'text'):
+        return result.text
+    elif hasattr(result, 'content'):
+        return result.content
+    elif hasattr(result, '__iter__'):
+        # If it's iterable, try to join the contents
+        try:
+            return "\n".join(str(item) for item in result)
+        except Exception:
+            pass
+    return repr(result)
+
 def convert_agent_result_to_string(result):
     """
     Convert the result from browser-use Agent.run() to a string, regardless of its type.
-    
+
+    Only the agent's final answer or extracted content is returned; see
+    extract_agent_result.
+
     Args:
         result: Result from agent.run(), which could be a string or AgentHistoryList
-        
+
     Returns:
         String representation of the result
     """
-    # Check if the result is an instance of AgentHistoryList from browser-use
-    if hasattr(result, '__class__') and hasattr(result.__class__, '__name__') and result.__class__.__name__ == 'AgentHistoryList':
-        # Try different methods to extract the content as string
-        if hasattr(result, '__str__'):
-            return str(result)
-        elif hasattr(result, 'to_string'):
-            return result.to_string()
-        elif hasattr(result, 'text'):
-            return result.text
-        elif hasattr(result, 'content'):
-            return result.content
-        elif hasattr(result, '__iter__'):
-            # If it's iterable, try to join the contents
-            try:
-                return "\n".join(str(item) for item in result)
-            except Exception:
-                pass
-    
-    # Default fallback - convert to string
-    return str(result)
\ No newline at end of file
+    return extract_agent_result(result).text
@@ -5,33 +5,47 @@ This module exposes the Flask app instance for Gunicorn to use.
 It can also be run directly as a command-line tool for generating a literature review.
 
 Usage:
-    python main.py           # Run Flask app directly
-    python main.py [topic]   # Run as CLI tool with the given topic
+    python main.py                              # Run Flask app directly
+    python main.py [topic]                      # Run as CLI tool with the given topic
+    python main.py [topic] --max-concurrency N  # Retrieve up to N papers at once
+    python main.py [topic] --local-index DIR    # Search a local corpus index instead of the web
 """
 
 import os
-import sys
+import argparse
 import asyncio
 from langchain_ollama import ChatOllama
 
 from literature_review import LiteratureReviewOrchestrator
+from literature_review.browser_pool import BrowserPool
+from literature_review.local_index import LocalCorpusIndex, LocalCorpusSource
+from literature_review.text_store import TextStore
 
 # Import and expose the Flask app
 from app import app
 
-async def run_cli(topic):
+async def run_cli(topic, max_concurrency=3, local_index=None, filter_batch_size=1):
     """Run as a command-line tool"""
     print(f"🔍 Starting literature review on topic: {topic}")
     
+    # Browsers are shared by the search and content agents of this review
+    browser_pool = BrowserPool(size=max_concurrency)
+    
     try:
+        # Open the local corpus index first, so a wrong path is an error rather than demo mode
+        search_sources = [LocalCorpusSource(LocalCorpusIndex(local_index))] if local_index else None
+        
         # Try to use real orchestrator first
         try:
             # Initialize language model
             model_name = os.environ.get("LLM_MODEL", "llama2")
             llm = ChatOllama(model=model_name)
             
-            # Create orchestrator
-            orchestrator = LiteratureReviewOrchestrator(llm)
+            # Create orchestrator, searching the local corpus index if one is given
+            orchestrator = LiteratureReviewOrchestrator(llm, search_sources=search_sources,
+                                                        browser_pool=browser_pool,
+                                                        text_store=TextStore("output/texts"),
+                                                        filter_batch_size=filter_batch_size)
             demo_mode = False
             print("✅ Using real Ollama-based orchestrator")
         except Exception as e:
@@ -48,7 +62,8 @@ async def run_cli(topic):
             max_full_text_papers=10,    # Maximum papers to retrieve full text for
             relevance_threshold=0.7,    # Minimum relevance score (0.0-1.0)
             save_results=True,          # Save results to files
-            output_dir='output'         # Directory to save output files
+            output_dir='output',        # Directory to save output files
+            max_concurrency=max_concurrency  # Papers to retrieve content for at once
         )
         
         # Print summary
@@ -57,7 +72,7 @@ async def run_cli(topic):
             print(f"📚 Literature Review on '{topic}' completed! (DEMO MODE)")
         else:
             print(f"📚 Literature Review on '{topic}' completed!")
-            
+        
         print(f"📊 Found {len(results['papers'])} relevant papers")
         print(f"📄 Generated a literature review of {len(results['literature_review'].split())} words")
         
@@ -73,16 +88,27 @@ async def run_cli(topic):
         print("-"*80)
         
         return results
-        
+    
     except Exception as e:
         print(f"An error occurred: {e}")
         return None
+    finally:
+        await browser_pool.close()
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Automated Literature Review System")
+    parser.add_argument("topic", nargs="?", help="Research topic to review (omit to start the web app)")
+    parser.add_argument("--max-concurrency", type=int, default=3,
+                        help="Maximum number of papers to retrieve content for at once (default: 3)")
+    parser.add_argument("--local-index", metavar="DIR",
+                        help="Search a local corpus index (see literature_review.local_index) instead of the web")
+    parser.add_argument("--filter-batch-size", type=int, default=1,
+                        help="Number of papers to score per relevance LLM call (default: 1)")
+    args = parser.parse_args()
+    
     # If a topic is provided as a command-line argument, run in CLI mode
-    if len(sys.argv) > 1:
-        topic = sys.argv[1]
-        asyncio.run(run_cli(topic))
+    if args.topic:
+        asyncio.run(run_cli(args.topic, args.max_concurrency, args.local_index, args.filter_batch_size))
     else:
         # Otherwise, run as a Flask web app directly
         print("🚀 Starting Flask web application...")
@@ -0,0 +1,13 @@
+"""
+Shared fixtures.
+"""
+
+import pytest
+
+from stand_in import serve
+
+@pytest.fixture(scope="session")
+def stand_in_url():
+    """Base URL of a local server of stand-in paper pages (see stand_in.py)"""
+    with serve() as base_url:
+        yield base_url
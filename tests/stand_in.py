@@ -0,0 +1,92 @@
+"""
+Stand-in paper pages served from a local HTTP server, for tests and benchmarks of content retrieval.
+
+URLs are routed by their first path segment: /article/... is a full-text HTML
+article, /abs/... an arXiv-style abstract page whose meta tags link a PDF at
+/pdf/....pdf, /short/... a page too short to use, and anything else is a 404.
+"""
+
+import contextlib
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Iterator
+
+PARAGRAPH = ("We study retrieval-augmented language models and evaluate them on question answering "
+             "benchmarks, finding that retrieval improves factual accuracy at modest cost. ")
+
+def make_pdf(lines):
+    """Build a minimal single-page PDF showing the given lines of text"""
+    text = " T* ".join(f"({line})Tj" for line in lines)
+    stream = f"BT /F1 10 Tf 14 TL 40 760 Td {text} ET".encode("latin-1")
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents 4 0 R "
+        b"/Resources << /Font << /F1 5 0 R >> >> >>",
+        b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream",
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    pdf = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(pdf))
+        pdf += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref = len(pdf)
+    pdf += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    pdf += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    pdf += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return bytes(pdf)
+
+def article_page():
+    """Full-text HTML article with scripts and navigation chrome around it"""
+    return ("<html><head><title>Article</title><meta name='citation_keywords' content='retrieval; QA'>"
+            "<script>var tracking = 1;</script></head><body><nav>Home | About</nav><article>"
+            + "".join(f"<p>{PARAGRAPH}</p>" for _ in range(12)) + "</article></body></html>")
+
+def abstract_page(pdf_url):
+    """arXiv-style abstract page giving the abstract and PDF link in meta tags"""
+    return (f"<html><head><meta name='citation_abstract' content='{PARAGRAPH}'>"
+            f"<meta name='citation_pdf_url' content='{pdf_url}'></head>"
+            f"<body><h1>Abstract page</h1></body></html>")
+
+def paper_pdf():
+    """PDF showing the paragraph ten times, wrapped at 90 characters"""
+    return make_pdf([PARAGRAPH[i:i + 90] for i in range(0, len(PARAGRAPH), 90)] * 10)
+
+SHORT_PAGE = "<html><body>Please enable JavaScript.</body></html>"
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Serves stand-in paper pages by URL prefix"""
+    def do_GET(self):
+        kind = self.path.strip("/").split("/")[0]
+        if kind == "article":
+            self._send(200, "text/html; charset=utf-8", article_page().encode("utf-8"))
+        elif kind == "abs":
+            self._send(200, "text/html", abstract_page(f"/pdf{self.path[4:]}.pdf").encode("utf-8"))
+        elif kind == "pdf":
+            self._send(200, "application/pdf", paper_pdf())
+        elif kind == "short":
+            self._send(200, "text/html", SHORT_PAGE.encode("utf-8"))
+        else:
+            self._send(404, "text/plain", b"not found")
+    
+    def _send(self, status, content_type, body):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def log_message(self, format, *args):
+        pass
+
+@contextlib.contextmanager
+def serve() -> Iterator[str]:
+    """Serve the stand-in pages on a free local port, yielding the base URL"""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
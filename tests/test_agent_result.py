@@ -0,0 +1,42 @@
+"""
+Tests for extracting answers from browser_use agent histories.
+"""
+
+from browser_use.agent.views import ActionResult, AgentHistory, AgentHistoryList
+from browser_use.browser.views import BrowserStateHistory
+
+from literature_review.utils_browser import extract_agent_result, record_agent_result
+
+def make_history(*results: ActionResult) -> AgentHistoryList:
+    state = BrowserStateHistory(url="https://example.com/", title="Page", tabs=[], interacted_element=[None])
+    return AgentHistoryList(history=[AgentHistory(model_output=None, result=[result], state=state)
+                                     for result in results])
+
+PAGE_TEXT = "Full text of the paper: we study retrieval-augmented language models."
+
+def test_finished_agent_gives_its_final_answer():
+    history = make_history(ActionResult(extracted_content=PAGE_TEXT),
+                           ActionResult(is_done=True, extracted_content="The answer"))
+    result = extract_agent_result(history)
+    assert (result.text, result.source) == ("The answer", "final_result")
+    assert abs(result.trace_chars - len(str(history))) < 0.2 * len(str(history))
+
+def test_unfinished_agent_gives_its_extracted_content():
+    history = make_history(ActionResult(extracted_content=PAGE_TEXT),
+                           ActionResult(extracted_content="🔗  Navigated to https://x/next"))
+    result = extract_agent_result(history)
+    assert result.source == "extracted_content"
+    assert result.text == f"{PAGE_TEXT}\n\n🔗  Navigated to https://x/next"
+
+def test_history_without_content_gives_the_trace():
+    history = make_history(ActionResult(error="Element not found"))
+    result = extract_agent_result(history)
+    assert (result.text, result.source, result.trace_chars) == (str(history), "trace", len(str(history)))
+
+def test_record_agent_result():
+    stats = {"agent_runs": 0, "trace_chars": 0, "result_chars": 0}
+    history = make_history(ActionResult(is_done=True, extracted_content="The answer"))
+    record_agent_result(stats, extract_agent_result(history))
+    record_agent_result(stats, extract_agent_result("plain text"))
+    assert stats["agent_runs"] == 2
+    assert stats["result_chars"] == len("The answer") + len("plain text")
@@ -0,0 +1,47 @@
+"""
+Tests for closing idle browsers in BrowserPool.
+"""
+
+import asyncio
+
+from literature_review.browser_pool import BrowserPool
+
+class StandInBrowser:
+    """Browser with browser_use's interface that is never launched"""
+    def __init__(self):
+        self.playwright_browser = None
+        self.closed = False
+    
+    async def close(self):
+        self.closed = True
+
+def test_idle_browser_is_closed_without_another_checkout():
+    async def run():
+        pool = BrowserPool(size=2, idle_timeout=0.05, browser_factory=StandInBrowser)
+        entry = await pool.acquire()
+        await pool.release(entry)
+        assert not entry.browser.closed
+        
+        await asyncio.sleep(0.2)
+        assert entry.browser.closed
+        assert pool.stats["idle_closed"] == 1
+        assert pool._idle == []
+        await pool.close()
+    
+    asyncio.run(run())
+
+def test_close_cancels_the_idle_reaper():
+    async def run():
+        pool = BrowserPool(size=2, idle_timeout=60.0, browser_factory=StandInBrowser)
+        entry = await pool.acquire()
+        await pool.release(entry)
+        reaper = pool._reaper
+        assert reaper is not None and not reaper.done()
+        
+        await pool.close()
+        await asyncio.sleep(0)
+        assert reaper.cancelled()
+        assert entry.browser.closed
+        assert pool.stats["idle_closed"] == 0
+    
+    asyncio.run(run())
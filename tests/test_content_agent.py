@@ -0,0 +1,98 @@
+"""
+Tests for ContentRetrievalAgent's HTTP fast path and browser fallback against the stand-in server.
+"""
+
+import asyncio
+
+import pytest
+from browser_use.agent.views import ActionResult, AgentHistory, AgentHistoryList
+from browser_use.browser.views import BrowserStateHistory
+
+from literature_review import content_agent
+from literature_review.content_agent import ContentRetrievalAgent
+from literature_review.models import Paper
+from stand_in import PARAGRAPH
+
+BROWSER_TEXT = "Full text read by the browser agent.\nKeywords: retrieval, agents\nCitations: 12"
+
+class FakeBrowserAgent:
+    """Stands in for browser_use.Agent, finishing with BROWSER_TEXT"""
+    tasks = []
+    
+    def __init__(self, task, llm, max_actions_per_step, **browser_kwargs):
+        self.task = task
+    
+    async def run(self, max_steps):
+        FakeBrowserAgent.tasks.append(self.task)
+        state = BrowserStateHistory(url="https://example.com/", title="Paper", tabs=[], interacted_element=[None])
+        done = ActionResult(is_done=True, extracted_content=BROWSER_TEXT)
+        return AgentHistoryList(history=[AgentHistory(model_output=None, result=[done], state=state)])
+
+@pytest.fixture
+def fake_browser(monkeypatch):
+    FakeBrowserAgent.tasks = []
+    monkeypatch.setattr(content_agent, "Agent", FakeBrowserAgent)
+    return FakeBrowserAgent
+
+def retrieve(url: str, fast_path: bool = True):
+    """Retrieve one paper with a fresh agent, returning the paper and the agent"""
+    agent = ContentRetrievalAgent(llm=None, fast_path=fast_path)
+    paper = Paper(title="A paper", authors=[], abstract="", url=url)
+    
+    async def run():
+        try:
+            return await agent.retrieve_content(paper)
+        finally:
+            await agent.aclose()
+    
+    return asyncio.run(run()), agent
+
+def counts(agent):
+    return {path: (stats["attempts"], stats["hits"]) for path, stats in agent.path_stats().items()}
+
+def test_html_article_uses_the_fast_path(stand_in_url, fake_browser):
+    paper, agent = retrieve(f"{stand_in_url}/article/1")
+    assert paper.full_text.splitlines()[1:] == [PARAGRAPH.strip()] * 12
+    assert paper.keywords == ["retrieval", "QA"]
+    assert counts(agent) == {"html": (1, 1), "pdf": (0, 0), "browser": (0, 0)}
+    assert agent.path_stats()["html"]["mean_seconds"] > 0
+    assert fake_browser.tasks == []
+
+def test_abstract_page_follows_its_pdf_link(stand_in_url, fake_browser):
+    pytest.importorskip("pypdf")
+    paper, agent = retrieve(f"{stand_in_url}/abs/2")
+    assert PARAGRAPH[:90].strip() in paper.full_text
+    assert counts(agent) == {"html": (1, 0), "pdf": (1, 1), "browser": (0, 0)}
+    assert fake_browser.tasks == []
+
+@pytest.mark.parametrize("kind", ["short", "missing"])
+def test_unusable_pages_fall_back_to_the_browser(stand_in_url, fake_browser, kind):
+    url = f"{stand_in_url}/{kind}/3"
+    paper, agent = retrieve(url)
+    assert paper.full_text == BROWSER_TEXT
+    assert paper.citations == 12
+    assert counts(agent) == {"html": (1, 0), "pdf": (0, 0), "browser": (1, 1)}
+    assert agent.agent_stats["agent_runs"] == 1
+    assert agent.agent_stats["result_chars"] == len(BROWSER_TEXT)
+    assert len(fake_browser.tasks) == 1 and url in fake_browser.tasks[0]
+
+def test_without_fast_path_only_the_browser_is_used(stand_in_url, fake_browser):
+    paper, agent = retrieve(f"{stand_in_url}/article/4", fast_path=False)
+    assert paper.full_text == BROWSER_TEXT
+    assert counts(agent) == {"html": (0, 0), "pdf": (0, 0), "browser": (1, 1)}
+
+def test_fetcher_replaces_its_client_on_a_new_loop(stand_in_url):
+    fetcher = content_agent.HTTPFetcher()
+    
+    async def fetch(close: bool = False):
+        content_type, body = await fetcher.fetch(f"{stand_in_url}/article/5")
+        client = fetcher._client
+        if close:
+            await fetcher.aclose()
+        return content_type, body, client
+    
+    content_type, body, first = asyncio.run(fetch())
+    assert content_type.startswith("text/html") and PARAGRAPH.encode() in body
+    _, _, second = asyncio.run(fetch(close=True))
+    assert second is not first
+    assert first.is_closed and second.is_closed and fetcher._client is None
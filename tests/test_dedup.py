@@ -0,0 +1,44 @@
+"""
+Tests for matching duplicate papers in PaperDeduplicator.
+"""
+
+import pytest
+
+from literature_review.dedup import PaperDeduplicator
+from literature_review.models import Paper
+
+ABSTRACT = "We propose the Transformer, a model architecture based solely on attention mechanisms."
+
+def make_paper(title: str, url: str = "", abstract: str = "") -> Paper:
+    return Paper(title=title, authors=[], abstract=abstract, url=url)
+
+@pytest.mark.parametrize("title", ["Unknown Title", "Introduction", "Editorial"])
+def test_placeholder_titles_with_different_ids_stay_apart(title):
+    papers = [make_paper(title, "https://doi.org/10.1000/first"),
+              make_paper(title, "https://arxiv.org/abs/2101.00001"),
+              make_paper(title)]
+    
+    assert len(PaperDeduplicator().deduplicate(papers)) == 3
+
+def test_shared_title_does_not_merge_different_ids():
+    papers = [make_paper("Attention Is All You Need", "https://doi.org/10.1000/first", ABSTRACT),
+              make_paper("Attention Is All You Need", "https://doi.org/10.1000/second",
+                         "A survey of attention in computer vision, from spatial transformers to vision transformers.")]
+    
+    assert len(PaperDeduplicator().deduplicate(papers)) == 2
+
+def test_title_matches_papers_without_ids():
+    papers = [make_paper("Attention Is All You Need"),
+              make_paper("Attention is all you need!")]
+    
+    assert len(PaperDeduplicator().deduplicate(papers)) == 1
+
+def test_same_id_and_near_duplicates_still_merge():
+    papers = [make_paper("Attention Is All You Need", "https://arxiv.org/abs/1706.03762v1"),
+              make_paper("Attention Is All You Need", "https://doi.org/10.48550/arXiv.1706.03762"),
+              make_paper("Attention Is All You Need", "https://example.com/transformer", ABSTRACT),
+              make_paper("Attention is all you need", "https://example.org/mirror", ABSTRACT)]
+    
+    deduplicator = PaperDeduplicator()
+    assert len(deduplicator.deduplicate(papers)) == 2
+    assert deduplicator.duplicates == 2
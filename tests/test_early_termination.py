@@ -0,0 +1,100 @@
+"""
+Tests for early termination of relevance scoring under weighted rankings.
+"""
+
+import asyncio
+import random
+
+import pytest
+
+from literature_review.filter_agent import FilterAgent, TopKStopper
+from literature_review.lexical import bm25_scores, paper_text
+from literature_review.models import Paper
+from literature_review.paper_batch import RankingWeights
+from literature_review.review_orchestrator import LiteratureReviewOrchestrator
+
+TOPIC = "graph neural networks"
+
+def make_papers(count: int = 60):
+    rng = random.Random(7)
+    papers = []
+    for i in range(count):
+        words = " ".join(rng.choice(["graph", "neural", "networks", "protein", "soil", "markets"]) for _ in range(8))
+        papers.append(Paper(title=f"Paper {i}", authors=[], abstract=words, url=f"https://example.com/{i}",
+                            citations=rng.choice([0, 5, 50, 500, 5000]), year=rng.randint(2000, 2024)))
+    # Relevance stays within the "approximate" bound of the lexical score plus 0.5
+    lexical = bm25_scores(TOPIC, [paper_text(paper) for paper in papers])
+    return papers, {paper.paper_id: min(1.0, 0.6 * float(score) + rng.uniform(0.0, 0.5))
+                    for paper, score in zip(papers, lexical)}
+
+class PassThroughContentAgent:
+    async def retrieve_content(self, paper):
+        return paper
+
+class TitleSummaryAgent:
+    async def summarize_paper(self, paper):
+        return {"title": paper.title, "summary": ""}
+
+def make_agent(relevance, ranking):
+    agent = FilterAgent(llm=None, ranking=ranking)
+    
+    async def score_papers(papers, topic, batch_size=None):
+        for paper in papers:
+            paper.relevance_score = relevance[paper.paper_id]
+        agent.stats["papers_scored"] += len(papers)
+        return [paper.relevance_score for paper in papers]
+    
+    agent.score_papers = score_papers
+    return agent
+
+def test_early_termination_matches_full_ranking_with_weights():
+    ranking = RankingWeights(relevance=0.5, citations=0.3, recency=0.2, current_year=2025)
+    papers, relevance = make_papers()
+    full = asyncio.run(make_agent(relevance, ranking).filter_papers(papers, TOPIC, 0.7))
+    
+    agent = make_agent(relevance, ranking)
+    top = asyncio.run(agent.filter_papers(papers, TOPIC, 0.7, target_count=5, priority="lexical"))
+    assert [paper.paper_id for paper in top] == [paper.paper_id for paper in full[:5]]
+    assert agent.stats["papers_scored"] < len(papers)
+
+def test_approximate_priority_counts_its_skips():
+    ranking = RankingWeights(relevance=0.5, citations=0.3, recency=0.2, current_year=2025)
+    papers, relevance = make_papers()
+    full = asyncio.run(make_agent(relevance, ranking).filter_papers(papers, TOPIC, 0.7))
+    
+    agent = make_agent(relevance, ranking)
+    top = asyncio.run(agent.filter_papers(papers, TOPIC, 0.7, target_count=5, priority="approximate"))
+    assert [paper.paper_id for paper in top] == [paper.paper_id for paper in full[:5]]
+    assert agent.stats["early_stop_approximate"] == agent.stats["early_stop_skipped"] > 0
+
+@pytest.mark.parametrize("ranking", [RankingWeights(),
+                                     RankingWeights(relevance=0.5, citations=0.3, recency=0.2, current_year=2025)])
+def test_paper_without_lexical_overlap_reaches_the_top_k(ranking):
+    papers, relevance = make_papers()
+    # Relevant, but described without any of the topic's words
+    hidden = Paper(title="Message passing on relational structures", authors=[], abstract="",
+                   url="https://example.com/hidden", citations=5000, year=2024)
+    relevance[hidden.paper_id] = 1.0
+    candidates = papers + [hidden]
+    full = asyncio.run(make_agent(relevance, ranking).filter_papers(candidates, TOPIC, 0.7))
+    assert hidden in full[:5]
+    
+    top = asyncio.run(make_agent(relevance, ranking).filter_papers(candidates, TOPIC, 0.7, target_count=5))
+    assert [paper.paper_id for paper in top] == [paper.paper_id for paper in full[:5]]
+    
+    orchestrator = LiteratureReviewOrchestrator(llm=None)
+    orchestrator.filter_agent = make_agent(relevance, ranking)
+    orchestrator.content_agent = PassThroughContentAgent()
+    orchestrator.summary_agent = TitleSummaryAgent()
+    pipeline, _ = asyncio.run(orchestrator.process_papers(candidates, TOPIC, 0.7, target_count=5))
+    assert [paper.paper_id for paper in pipeline] == [paper.paper_id for paper in full[:5]]
+
+def test_stopper_ranks_by_rank_score_and_thresholds_relevance():
+    stopper = TopKStopper(target_count=2, relevance_threshold=0.7)
+    stopper.add(0.9, 0.3)
+    stopper.add(0.6, 0.95)
+    assert stopper.kth_score is None
+    stopper.add(0.8, 0.5)
+    assert stopper.kth_score == 0.3
+    assert stopper.can_skip(0.3) and not stopper.can_skip(0.4)
+    assert stopper.excludes(0.2) and not stopper.excludes(0.3)
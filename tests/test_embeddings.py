@@ -0,0 +1,78 @@
+"""
+Tests for embedding-based relevance scoring with the deterministic hashing embedder.
+"""
+
+import asyncio
+
+import numpy as np
+import pytest
+
+from literature_review.embeddings import EmbeddingCache, EmbeddingScorer, HashingEmbedder
+from literature_review.filter_agent import FilterAgent
+from literature_review.mock_data import MOCK_PAPERS
+from literature_review.models import Paper
+
+TOPIC = "transformer models for machine translation"
+
+def make_papers():
+    relevant = Paper(
+        title="Attention Is All You Need",
+        authors=["Vaswani, A."],
+        abstract="The dominant sequence transduction models are based on complex recurrent or convolutional "
+                 "neural networks. We propose a new simple network architecture, the Transformer, based "
+                 "solely on attention mechanisms. Experiments on two machine translation tasks show these "
+                 "models to be superior in quality.",
+        url="https://arxiv.org/abs/1706.03762",
+    )
+    unrelated = Paper(
+        title="Soil microbial communities in alpine grasslands",
+        authors=["Doe, J."],
+        abstract="We survey bacterial and fungal diversity in alpine soils across elevation gradients "
+                 "and relate it to nitrogen cycling.",
+        url="https://example.com/soil",
+    )
+    return relevant, unrelated
+
+def test_hashing_embedder_is_deterministic():
+    texts = ["attention based translation", "soil bacteria"]
+    first = asyncio.run(HashingEmbedder().embed(texts))
+    second = asyncio.run(HashingEmbedder().embed(texts))
+    assert first.shape == (2, 512)
+    np.testing.assert_array_equal(first, second)
+
+def test_scores_are_calibrated_to_the_relevance_threshold():
+    relevant, unrelated = make_papers()
+    others = [Paper(**paper) for paper in MOCK_PAPERS]
+    scores = asyncio.run(EmbeddingScorer().score([relevant, unrelated] + others, TOPIC))
+    
+    assert scores[0] >= 0.7
+    assert scores[1] < 0.7
+    assert all(score < 0.7 for score in scores[2:])
+    assert ((scores >= 0.0) & (scores <= 1.0)).all()
+
+def test_score_rescales_raw_similarities():
+    relevant, unrelated = make_papers()
+    scorer = EmbeddingScorer(similarity_range=(0.0, 1.0))
+    raw = asyncio.run(scorer.similarities([relevant, unrelated], TOPIC))
+    np.testing.assert_allclose(asyncio.run(scorer.score([relevant, unrelated], TOPIC)), np.clip(raw, 0.0, 1.0))
+    with pytest.raises(ValueError):
+        EmbeddingScorer(similarity_range=(0.5, 0.5))
+
+def test_cache_reuses_embeddings(tmp_path):
+    relevant, unrelated = make_papers()
+    cache = EmbeddingCache(str(tmp_path))
+    scorer = EmbeddingScorer(cache=cache)
+    first = asyncio.run(scorer.score([relevant, unrelated], TOPIC))
+    assert (cache.hits, cache.misses) == (0, 3)
+    
+    reopened = EmbeddingCache(str(tmp_path))
+    second = asyncio.run(EmbeddingScorer(cache=reopened).score([relevant, unrelated], TOPIC))
+    np.testing.assert_allclose(first, second)
+    assert (reopened.hits, reopened.misses) == (3, 0)
+
+def test_filter_agent_keeps_relevant_papers_at_the_default_threshold():
+    relevant, unrelated = make_papers()
+    agent = FilterAgent(llm=None, embedding_scorer=EmbeddingScorer())
+    kept = asyncio.run(agent.filter_papers([unrelated, relevant], TOPIC))
+    assert kept == [relevant]
+    assert agent.stats["llm_calls"] == 0
@@ -0,0 +1,34 @@
+"""
+Tests for opening and building a LocalCorpusIndex.
+"""
+
+import pytest
+
+from literature_review.local_index import LocalCorpusIndex
+
+RECORDS = [
+    {"title": "Attention Is All You Need", "abstract": "We propose the Transformer, based on attention.",
+     "authors": "Vaswani, A.", "id": "1706.03762"},
+    {"title": "Deep Residual Learning for Image Recognition", "abstract": "Residual networks ease training.",
+     "authors": "He, K.", "id": "1512.03385"},
+]
+
+def test_opening_a_missing_index_fails_without_creating_it(tmp_path):
+    index_dir = tmp_path / "missing"
+    
+    with pytest.raises(FileNotFoundError, match="local_index build"):
+        LocalCorpusIndex(str(index_dir))
+    assert not index_dir.exists()
+
+def test_index_directory_is_created_when_building(tmp_path):
+    index_dir = tmp_path / "nested" / "index"
+    index = LocalCorpusIndex(str(index_dir), create=True)
+    assert not index_dir.exists()
+    
+    assert index.add_records(RECORDS) == 2
+    index.close()
+    
+    index = LocalCorpusIndex(str(index_dir))
+    results = index.search("transformer attention", k=1)
+    index.close()
+    assert [document["title"] for _, document in results] == ["Attention Is All You Need"]
@@ -0,0 +1,57 @@
+"""
+Tests for caching LLM relevance scores in FilterAgent.
+"""
+
+import asyncio
+
+from literature_review.cache import RelevanceCache
+from literature_review.filter_agent import FALLBACK_RELEVANCE_SCORE, FilterAgent
+from literature_review.models import Paper
+
+TOPIC = "transformer models for machine translation"
+
+class FakeBackend:
+    """Backend answering every prompt with a fixed response"""
+    def __init__(self, response: str):
+        self.response = response
+        self.calls = 0
+    
+    async def run(self, task: str, max_steps: int = 3, max_actions_per_step: int = 2) -> str:
+        self.calls += 1
+        return self.response
+
+def make_agent(cache: RelevanceCache, response: str, excerpt_chars: int = 0) -> FilterAgent:
+    agent = FilterAgent(llm=None, cache=cache, excerpt_chars=excerpt_chars)
+    agent.backend = FakeBackend(response)
+    return agent
+
+def make_paper() -> Paper:
+    return Paper(title="Attention Is All You Need", authors=["Vaswani, A."],
+                 abstract="We propose the Transformer.", url="https://arxiv.org/abs/1706.03762")
+
+def test_unparsable_score_is_not_cached(tmp_path):
+    cache = RelevanceCache(str(tmp_path / "relevance.sqlite3"))
+    agent = make_agent(cache, "I cannot tell.")
+    paper = make_paper()
+    
+    assert asyncio.run(agent.score_papers([paper], TOPIC)) == [FALLBACK_RELEVANCE_SCORE]
+    assert paper.relevance_score == FALLBACK_RELEVANCE_SCORE
+    assert cache.get_relevance(TOPIC, paper, agent.model_name, agent.prompt_version) is None
+    
+    # The next run asks the LLM again and caches the real score
+    agent.backend = FakeBackend("Closely related.\nRELEVANCE_SCORE: 0.9")
+    assert asyncio.run(agent.score_papers([paper], TOPIC)) == [0.9]
+    assert cache.get_relevance(TOPIC, paper, agent.model_name, agent.prompt_version)["score"] == 0.9
+
+def test_cache_key_depends_on_the_prompt(tmp_path):
+    cache = RelevanceCache(str(tmp_path / "relevance.sqlite3"))
+    paper = make_paper()
+    asyncio.run(make_agent(cache, "RELEVANCE_SCORE: 0.9").score_papers([paper], TOPIC))
+    
+    same_prompt = make_agent(cache, "RELEVANCE_SCORE: 0.1")
+    assert asyncio.run(same_prompt.score_papers([paper], TOPIC)) == [0.9]
+    assert same_prompt.backend.calls == 0
+    
+    with_excerpt = make_agent(cache, "RELEVANCE_SCORE: 0.1", excerpt_chars=2000)
+    assert asyncio.run(with_excerpt.score_papers([paper], TOPIC)) == [0.1]
+    assert with_excerpt.backend.calls == 1
@@ -0,0 +1,40 @@
+"""
+Tests for keying cached search results on the sources searched.
+"""
+
+import asyncio
+
+from literature_review.cache import SearchCache
+from literature_review.search_agent import SearchAgent
+
+TOPIC = "transformer models for machine translation"
+
+class FakeSource:
+    """Search source returning one paper named after the source"""
+    def __init__(self, name: str):
+        self.name = name
+        self.calls = 0
+    
+    async def search(self, topic: str, max_papers: int = 15):
+        self.calls += 1
+        return [{"title": f"A paper from {self.name}", "url": f"https://example.com/{self.name}"}]
+
+def search(agent: SearchAgent) -> list:
+    return [paper.title for paper in asyncio.run(agent.search(TOPIC, max_papers=5))]
+
+def test_results_are_not_reused_across_sources(tmp_path):
+    cache = SearchCache(str(tmp_path / "search.sqlite3"), similarity_threshold=0.5)
+    local, web = FakeSource("local"), FakeSource("web")
+    
+    assert search(SearchAgent(llm=None, sources=[local], cache=cache)) == ["A paper from local"]
+    assert search(SearchAgent(llm=None, sources=[web], cache=cache)) == ["A paper from web"]
+    assert search(SearchAgent(llm=None, sources=[local], cache=cache)) == ["A paper from local"]
+    assert (local.calls, web.calls) == (1, 1)
+
+def test_fingerprint_follows_sources_and_model():
+    first = SearchAgent(llm=None, sources=[FakeSource("a"), FakeSource("b")])
+    
+    assert first.source_fingerprint() == SearchAgent(llm=None, sources=[FakeSource("b"), FakeSource("a")]).source_fingerprint()
+    assert first.source_fingerprint() != SearchAgent(llm=None, sources=[FakeSource("a")]).source_fingerprint()
+    assert first.source_fingerprint() != SearchAgent(llm="other", sources=[FakeSource("a"), FakeSource("b")]).source_fingerprint()
+    assert first.source_fingerprint() != SearchAgent(llm=None).source_fingerprint()
@@ -0,0 +1,33 @@
+"""
+Tests for local HTML and PDF text extraction, using the stand-in pages.
+"""
+
+import pytest
+
+from literature_review.text_extraction import html_keywords, html_to_text, pdf_to_text
+from stand_in import PARAGRAPH, SHORT_PAGE, abstract_page, article_page, make_pdf, paper_pdf
+
+def test_article_text_drops_page_chrome():
+    text, meta = html_to_text(article_page())
+    assert text.splitlines() == ["Article"] + [PARAGRAPH.strip()] * 12
+    assert "tracking" not in text and "Home | About" not in text
+    assert html_keywords(meta) == ["retrieval", "QA"]
+
+def test_abstract_page_puts_the_meta_abstract_first():
+    text, meta = html_to_text(abstract_page("/pdf/1234.pdf"))
+    assert text == f"Abstract: {PARAGRAPH.strip()}\nAbstract page"
+    assert meta["citation_pdf_url"] == ["/pdf/1234.pdf"]
+
+def test_short_page_yields_little_text():
+    text, meta = html_to_text(SHORT_PAGE)
+    assert text == "Please enable JavaScript."
+    assert meta == {}
+
+def test_pdf_text():
+    pytest.importorskip("pypdf")
+    lines = [PARAGRAPH[i:i + 90].strip() for i in range(0, len(PARAGRAPH), 90)]
+    assert pdf_to_text(paper_pdf()).splitlines() == lines * 10
+    assert pdf_to_text(make_pdf(["first page line"]), max_pages=1) == "first page line"
+
+def test_unreadable_pdf_gives_none():
+    assert pdf_to_text(b"<html>not a pdf</html>") is None